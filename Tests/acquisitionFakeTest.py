@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Prüft die Sensorerfassung im Kindprozess (acquisition.py) ohne Pi:
+
+1. Seqlock: ein Prozess schreibt ohne Pause Datensätze, deren Felder alle
+   aus demselben Zähler stammen; der Leser darf nie gemischte sehen.
+2. Erfassung: ESP32-Pins und zwei HC-SR04 (Echos auf der virtuellen Uhr
+   von fakegpio) werden im Kindprozess gelesen und im Hauptprozess
+   abgeholt; die Entfernungen sind exakt.
+
+Das Kind wird hier mit fork gestartet, damit es das installierte fakegpio,
+die Echo-Simulation und die virtuelle Uhr erbt (auf dem Pi: spawn). Die
+Uhr läuft nur im Kind weiter; Alterswerte im Hauptprozess sind deshalb
+nicht aussagekräftig.
+
+    python Tests/acquisitionFakeTest.py
+"""
+import sys
+import os
+import time
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakegpio
+fakegpio.install()
+
+import acquisition
+import sensor
+
+sensor._clock_ns = fakegpio.clock_ns
+sensor._wait = fakegpio.wait
+
+def hammer(name, stop):
+    state = acquisition.SharedState(name)
+    n = 0
+    while not stop.is_set():
+        n += 1
+        f = float(n)
+        state.write(n, n & 1, n & 1, n & 1, 1, n & 0xFFFFFFFF, f, f, n, f, f, f, f, f, f, n)
+    state.close()
+
+def seqlock_test(seconds=1.0):
+    ctx = multiprocessing.get_context("fork")
+    state = acquisition.SharedState()
+    stop = ctx.Event()
+    p = ctx.Process(target=hammer, args=(state.name, stop))
+    p.start()
+    reads = torn = 0
+    t_end = time.perf_counter() + seconds
+    while time.perf_counter() < t_end:
+        r = state.read()
+        if r is None:
+            continue
+        reads += 1
+        n = r[0]
+        if r[1] != n & 1 or r[6] != n or r[8] != n or r[-2] != n or r[-1] != n:
+            torn += 1
+    stop.set()
+    p.join()
+    print(f"Seqlock: {reads} Lesevorgänge | Wiederholungen: {state.retries} | zerrissen: {torn}")
+    state.close()
+    assert torn == 0
+
+def acquisition_test():
+    pins = (5, 6, 22)
+    fakegpio.set_input(5, fakegpio.HIGH)
+    fakegpio.set_input(22, fakegpio.HIGH)
+    fakegpio.attach_hcsr04_scheduled(sensor.US1_TRIG, sensor.US1_ECHO, 50.0)
+    fakegpio.attach_hcsr04_scheduled(sensor.US2_TRIG, sensor.US2_ECHO, 80.0)
+
+    acq = acquisition.Acquisition(pins, context="fork").start()
+    try:
+        time.sleep(0.3)
+        left, right, gruen = acq.line()
+        d1, d2, _ = acq.ultrasonics()
+        print(f"Linie: {left} {right} {gruen} | Vorne: {d1} | Rechts: {d2}")
+        assert (left, right, gruen) == (1, 0, 1)
+        assert abs(d1 - 50.0) < 0.01 and abs(d2 - 80.0) < 0.01
+
+        n = 20000
+        t = time.perf_counter()
+        for _ in range(n):
+            acq.line()
+        dt = (time.perf_counter() - t) / n
+        print(f"line(): {dt * 1e6:.2f} us | {acq.stats()}")
+    finally:
+        acq.stop()
+
+def main():
+    seqlock_test()
+    acquisition_test()
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,22 @@
-import serial
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import FrameParser, open_serial
 
 # UART auf dem Pi Zero
-ser = serial.Serial(
-    port='/dev/serial0',
-    baudrate=115200,
-    timeout=1
-)
+ser = open_serial('/dev/serial0')
+parser = FrameParser()
 
 print("Warte auf Daten vom ESP32...")
 
 while True:
-    line = ser.readline().decode('utf-8').strip()
-    if not line:
+    data = ser.read(ser.in_waiting or 1)
+    if not data:
         continue
 
-    try:
-        b1, b2 = map(int, line.split())
-        print(f"Sensor1: {b1}, Sensor2: {b2}")
-
-    except ValueError:
-        pass  # ungültige Zeile ignorieren
\ No newline at end of file
+    if parser.feed(data):
+        f = parser.frame
+        print(f"#{f.seq:3d} L: {f.left} R: {f.right} Gruen: {f.green} | "
+              f"Refl: {f.reflect[0]:4d}/{f.reflect[1]:4d} | {parser.stats()}")
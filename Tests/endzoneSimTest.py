@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Prüft die Endzone in der Simulation: Strecke ohne Linie, Wand voraus.
+
+Nach ENDZONE_TIME auf Weiß fährt main die Endzone; vor der Wand muss es
+links drehen (ENDZONE_WALL_CM), nicht das Hindernis-Manöver starten.
+
+    python Tests/endzoneSimTest.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim.track import Track
+from sim.world import Simulator
+
+def main():
+    track = Track(400, 400)
+    track.start = (200.0, 200.0, 0.0)
+    track.add_wall((260, 100), (260, 300))   # 60 cm voraus, quer zur Fahrtrichtung
+    sim = Simulator(track).install()
+    m = sim.attach()
+    result = sim.run(laps=1, timeout=20.0)
+
+    rec = m.telemetry
+    n = min(rec.count, rec.capacity)
+    state, motor_l = rec.columns["state"], rec.columns["motor_l"]
+    endzone = sum(1 for i in range(n) if state[i] == m._ENDZONE)
+    turns = sum(1 for i in range(n) if state[i] == m._ENDZONE and motor_l[i] == -m.ENDZONE_TURN_SPEED)
+    print(f"Endzone-Ticks: {endzone} | davon Drehung: {turns} | Manöver: {result['maneuvers']} | "
+          f"x: {sim.robot.x:.1f} cm")
+    assert result["maneuvers"] == 0 and "Hindernis" not in result["log"]
+    assert endzone > 0 and turns > 0
+    assert sim.robot.x < 260.0
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Prüft den TriggerScheduler aus sensor.py ohne Pi. Die HC-SR04 werden mit
+fakegpio auf der virtuellen Uhr simuliert (vorgemerkte Echo-Flanken), so
+dass sich Messungen überlappen und jeder Wert exakt ist.
+
+1. Vergleich mit der alten seriellen Messung (Messrate, Entfernungen).
+2. Übersprech-Regeln: Sensoren mit Blickrichtung < SONAR_MIN_SEPARATION
+   messen nie gleichzeitig und warten SONAR_GUARD nach dem Echo-Ende des
+   Nachbarn; alle anderen überlappen, um SONAR_STAGGER versetzt.
+
+    python Tests/sonarSchedulerFakeTest.py [vorne_cm] [rechts_cm|None]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakegpio
+fakegpio.install()
+
+import sensor
+
+sensor._clock_ns = fakegpio.clock_ns
+sensor._wait = fakegpio.wait
+
+LATENCY_NS = 450_000
+
+def echo_end(t_trigger, cm):
+    return t_trigger + LATENCY_NS * 1e-9 + cm * 2.0 / sensor.SPEED_OF_SOUND
+
+def serial():
+    """Alter Ablauf: vorne messen, 10 ms warten, rechts messen."""
+    d1 = sensor._measure_distance(sensor.US1_TRIG, sensor.US1_ECHO)
+    fakegpio.advance_ns(10_000_000)
+    d2 = sensor._measure_distance(sensor.US2_TRIG, sensor.US2_ECHO)
+    return d1, d2
+
+def compare(vorne, rechts):
+    fakegpio.attach_hcsr04_scheduled(sensor.US1_TRIG, sensor.US1_ECHO, vorne, LATENCY_NS)
+    fakegpio.attach_hcsr04_scheduled(sensor.US2_TRIG, sensor.US2_ECHO, rechts, LATENCY_NS)
+
+    n = 100
+    for name, fn in (("seriell", serial), ("TriggerScheduler", sensor.read_ultrasonics)):
+        t = fakegpio.clock_ns()
+        for _ in range(n):
+            d1, d2 = fn()
+            assert abs(d1 - vorne) < 0.01
+            assert (d2 is None) if rechts is None else abs(d2 - rechts) < 0.01
+        dt = (fakegpio.clock_ns() - t) * 1e-9 / n
+        print(f"{name:17s} {dt * 1e3:6.2f} ms/Runde -> {1 / dt:6.1f} Hz | Vorne: {d1:.2f} | Rechts: {d2}")
+
+    for name, r in sensor.ultrasonic_rates().items():
+        print(f"  {name:7s} {r['hz']:6.1f} Hz | Messungen: {r['samples']} | Timeouts: {r['timeouts']}")
+
+def separation_test():
+    """vorne (0°) und schraeg (30°) stehen im Konflikt, rechts (-90°) nicht."""
+    table = [
+        {"name": "vorne", "trig": 12, "echo": 13, "heading": 0, "cm": 50.0},
+        {"name": "schraeg", "trig": 16, "echo": 19, "heading": 30, "cm": 40.0},
+        {"name": "rechts", "trig": 20, "echo": 21, "heading": -90, "cm": 80.0},
+    ]
+    triggers = []
+    for s in table:
+        fakegpio.setup(s["trig"], fakegpio.OUT, initial=fakegpio.LOW)
+        fakegpio.setup(s["echo"], fakegpio.IN)
+        fakegpio.attach_hcsr04_scheduled(s["trig"], s["echo"], s["cm"], LATENCY_NS)
+        fakegpio.on_output(s["trig"], lambda ch, level, name=s["name"]:
+                           level or triggers.append((name, fakegpio.clock_ns() * 1e-9)))
+
+    sched = sensor.TriggerScheduler(table)
+    stagger, guard = sched.stagger, sched.guard
+    for _ in range(3):
+        triggers.clear()
+        fakegpio.advance_ns(50_000_000)     # Nachschwingzeit der letzten Runde vorbei
+        result = sched.read()
+        t = dict(triggers)
+        print("Trigger: " + " | ".join(f"{name} {(tt - triggers[0][1]) * 1e3:.3f} ms" for name, tt in triggers)
+              + f" | {result}")
+        for s in table:
+            assert abs(result[s["name"]] - s["cm"]) < 0.01
+        assert [name for name, _ in triggers] == ["vorne", "rechts", "schraeg"]
+        end_vorne = echo_end(t["vorne"], 50.0)
+        # ohne Konflikt: überlappend, um stagger versetzt
+        assert abs(t["rechts"] - t["vorne"] - stagger) < 1e-8
+        assert t["rechts"] < end_vorne
+        # Konflikt: erst nach Echo-Ende des Nachbarn + guard
+        assert abs(t["schraeg"] - end_vorne - guard) < 1e-8
+
+def main():
+    vorne = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    rechts = sys.argv[2] if len(sys.argv) > 2 else "80"
+    rechts = None if rechts == "None" else float(rechts)
+    fakegpio.advance_ns(1_000_000_000)
+    compare(vorne, rechts)
+    separation_test()
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Prüft die Interrupt-basierte Ultraschall-Messung aus sensor.py ohne Pi.
+Der HC-SR04 wird von fakegpio mit virtueller Uhr simuliert.
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakegpio
+fakegpio.install()
+
+import sensor
+
+sensor._clock_ns = fakegpio.clock_ns
+sensor._wait = fakegpio.wait
+
+def main():
+    # zusätzlicher Tabelleneintrag, nur über read_distances()/latest_distances()
+    sensor.SONARS.append({"name": "hinten", "trig": 12, "echo": 13, "heading": 180})
+    vorne = {"cm": 5.0}
+    fakegpio.attach_hcsr04(sensor.US1_TRIG, sensor.US1_ECHO, lambda: vorne["cm"])
+    fakegpio.attach_hcsr04(sensor.US2_TRIG, sensor.US2_ECHO, None)  # kein Echo
+    fakegpio.attach_hcsr04(12, 13, 30.0)
+
+    for cm in (2.0, 5.0, 10.0, 50.0, 200.0):
+        vorne["cm"] = cm
+        d1, d2 = sensor.read_ultrasonics()
+        print(f"Soll: {cm:6.1f} cm | Vorne: {d1:6.2f} cm | Rechts: {d2}")
+        assert abs(d1 - cm) < 0.01
+        assert d2 is None
+
+    # Echo länger als Timeout (> ~343 cm) -> None
+    vorne["cm"] = 400.0
+    d1, _ = sensor.read_ultrasonics()
+    assert d1 is None
+
+    # Sampler veröffentlicht alle Einträge der Tabelle
+    vorne["cm"] = 50.0
+    sampler = sensor.start_sampler(max_age=1.0)
+    while not sampler.cycles:
+        time.sleep(0.001)
+    distances, age = sensor.latest_distances()
+    sensor.stop_sampler()
+    print(f"Sampler: {distances} | Alter: {age}")
+    assert set(distances) == {"vorne", "rechts", "hinten"}
+    assert abs(distances["vorne"] - 50.0) < 0.01 and distances["rechts"] is None
+    assert abs(distances["hinten"] - 30.0) < 0.01
+    print("OK")
+
+if __name__ == "__main__":
+    main()
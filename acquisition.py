@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Sensorerfassung in einem eigenen Prozess.
+
+Flanken-Callbacks (Farbzählung, Echos), PWM-Threads und die Regelschleife
+teilen sich sonst ein GIL. Hier läuft die Erfassung (ESP32-Eingänge,
+Ultraschall über den TriggerScheduler, optional Farbkanäle über den
+FilterScheduler) in einem Kindprozess und veröffentlicht den letzten
+Stand in einem `multiprocessing.shared_memory`-Block. Die Regelschleife
+liest ihn ohne Lock.
+
+Der Block ist ein Seqlock: vor dem Schreiben wird die Sequenznummer
+ungerade, danach wieder gerade. Ein Leser liest Sequenz, Datensatz,
+Sequenz; ist sie ungerade oder hat sie sich geändert, liest er neu. Es
+gibt genau einen Schreiber (die Schleife des Kindprozesses), Sonar- und
+Farbthreads im Kind liefern ihm nur zu.
+
+    acq = Acquisition((5, 6, 22), color_rates={"c": 1, "g": 2}).start()
+    left, right, gruen = acq.line()
+    vorne, rechts, alter = acq.ultrasonics()
+    acq.stop()
+
+Zeitstempel sind CLOCK_MONOTONIC (time.monotonic_ns bzw.
+sensor._clock_ns) und damit zwischen den Prozessen vergleichbar.
+"""
+import os
+import struct
+import threading
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+import gpiobank
+import sensor
+
+# RPi.GPIO startet seinen Flanken-Thread einmal pro Prozess; nach fork()
+# fehlt er im Kind, obwohl das Modul ihn für laufend hält. Deshalb spawn.
+START_METHOD = "spawn"
+
+COLORS = ("c", "g", "r")
+NAN = float("nan")
+
+_SEQ = struct.Struct("<Q")
+# t_ns, links, rechts, grün, gültig, Schleifen, vorne, rechts, us_t_ns,
+# (links, rechts) je Farbe in COLORS, farbe_t_ns
+_RECORD = struct.Struct("<qBBBBIddq" + "dd" * len(COLORS) + "q")
+_OFFSET = _SEQ.size
+SIZE = _OFFSET + _RECORD.size
+
+
+def _num(value):
+    return NAN if value is None else value
+
+
+def _opt(value):
+    return None if value != value else value   # NaN -> None
+
+
+class SharedState:
+    """Seqlock-Datensatz in einem Shared-Memory-Block.
+
+    Ohne `name` wird ein neuer Block angelegt (Besitzer, gibt ihn in
+    `close()` frei), sonst ein bestehender geöffnet.
+    """
+
+    def __init__(self, name=None, read_retries=100):
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=SIZE)
+        self.name = self.shm.name
+        self._buf = self.shm.buf
+        self._seq = 0
+        self.read_retries = read_retries
+        self.retries = 0          # verworfene Leseversuche (Schreiber war dazwischen)
+        self.seq = 0              # Sequenz des zuletzt gelesenen Datensatzes
+        self._last = None
+        if self.owner:
+            self._buf[:SIZE] = bytes(SIZE)
+
+    def write(self, *values):
+        """Schreibt einen Datensatz (nur aus einem Thread aufrufen)."""
+        buf = self._buf
+        seq = self._seq + 1
+        _SEQ.pack_into(buf, 0, seq)            # ungerade: Schreiben läuft
+        _RECORD.pack_into(buf, _OFFSET, *values)
+        self._seq = seq + 1
+        _SEQ.pack_into(buf, 0, seq + 1)
+
+    def read(self):
+        """Letzter vollständiger Datensatz als Tupel, None vor dem ersten.
+
+        Gelingt nach `read_retries` Versuchen kein sauberer Lesevorgang
+        (Schreiber hängt mitten im Schreiben), kommt der letzte gute
+        Datensatz zurück; sein Alter zeigt das an.
+        """
+        buf = self._buf
+        for _ in range(self.read_retries):
+            seq = _SEQ.unpack_from(buf, 0)[0]
+            if not seq & 1:
+                values = _RECORD.unpack_from(buf, _OFFSET)
+                if _SEQ.unpack_from(buf, 0)[0] == seq:
+                    if seq == 0:
+                        return None
+                    self.seq = seq
+                    self._last = values
+                    return values
+            self.retries += 1
+        return self._last
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _color_loop(colors, stop):
+    while not stop.is_set():
+        colors.tick()
+
+
+def _acquire(name, stop, line_pins, period, sonar, sonar_period, color_rates, cpu):
+    """Hauptfunktion des Kindprozesses; einziger Schreiber von `name`."""
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    import RPi.GPIO as GPIO
+
+    state = SharedState(name)
+    GPIO.setmode(GPIO.BCM)
+    for pin in line_pins:
+        GPIO.setup(pin, GPIO.IN)
+    sampler = None
+    if sonar:
+        sensor.init(color=False, sonar=True)
+        sampler = sensor.start_sampler(sonar_period)
+    colors = None
+    if color_rates:
+        sensor.init(color=True, sonar=False)
+        colors = sensor.FilterScheduler(color_rates)
+        threading.Thread(target=_color_loop, args=(colors, stop), name="color", daemon=True).start()
+
+    read = gpiobank.open_bank(line_pins, GPIO).read
+    clock = sensor._clock_ns
+    loops = 0
+    no_color = (NAN, NAN) * len(COLORS) + (0,)
+    try:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                (left, right, gruen), valid = read(), 1
+            except ValueError:
+                left = right = gruen = valid = 0
+            t_ns = clock()
+            d1, d2, us_t = sampler.snapshot() if sampler is not None else (None, None, None)
+            if colors is not None:
+                cache = colors.cache
+                color = []
+                color_t = 0
+                for c in COLORS:
+                    entry = cache.get(c)
+                    if entry is None:
+                        color += (NAN, NAN)
+                    else:
+                        color += (entry[0], entry[1])
+                        color_t = max(color_t, entry[2])
+                color.append(color_t)
+            else:
+                color = no_color
+            loops = (loops + 1) & 0xFFFFFFFF
+            state.write(t_ns, left, right, gruen, valid, loops,
+                        _num(d1), _num(d2), us_t or 0, *color)
+            rest = period - (time.perf_counter() - t0)
+            if rest > 0:
+                time.sleep(rest)
+    finally:
+        sensor.shutdown()
+        state.close()
+
+
+class Acquisition:
+    """Startet und liest die Sensorerfassung im Kindprozess.
+
+    Args:
+        line_pins: (links, rechts, grün) der ESP32-Eingänge (BCM)
+        period: Zykluszeit des Schreibers in s (ESP32-Eingänge)
+        sonar: Ultraschall messen (UltrasonicSampler im Kind)
+        sonar_period: Periode des Ultraschall-Samplers
+        color_rates: FilterScheduler-Raten, None = keine Farbsensoren
+        cpu: Kern, auf den das Kind gepinnt wird (None = frei)
+        max_age: ältere Ultraschallwerte gelten als veraltet (-> None)
+        line_max_age: ältere ESP32-Werte -> (None, None, None)
+        context: Start-Methode von multiprocessing (Standard START_METHOD)
+    """
+
+    def __init__(self, line_pins, period=0.001, sonar=True, sonar_period=0.01,
+                 color_rates=None, cpu=None, max_age=0.15, line_max_age=0.05, context=None):
+        self.line_pins = tuple(line_pins)
+        self.period = period
+        self.sonar = sonar
+        self.sonar_period = sonar_period
+        self.color_rates = dict(color_rates) if color_rates else None
+        self.cpu = cpu
+        self.max_age = max_age
+        self.line_max_age = line_max_age
+        self._ctx = multiprocessing.get_context(context or START_METHOD)
+        self.state = None
+        self._stop = None
+        self._process = None
+
+    def start(self, timeout=5.0):
+        """Startet den Kindprozess und wartet auf den ersten Datensatz."""
+        if self.running:
+            return self
+        self.state = SharedState()
+        self._stop = self._ctx.Event()
+        self._process = self._ctx.Process(
+            target=_acquire, name="acquisition", daemon=True,
+            args=(self.state.name, self._stop, self.line_pins, self.period, self.sonar,
+                  self.sonar_period, self.color_rates, self.cpu))
+        self._process.start()
+        deadline = time.monotonic() + timeout
+        while self.state.read() is None:
+            if not self._process.is_alive() or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError("Erfassungsprozess liefert keine Daten")
+            time.sleep(0.001)
+        return self
+
+    def stop(self, timeout=1.0):
+        if self._process is not None:
+            self._stop.set()
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+        if self.state is not None:
+            self.state.close()
+            self.state = None
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _age(self, t_ns):
+        return (sensor._clock_ns() - t_ns) * 1e-9
+
+    def line(self):
+        """(links, rechts, grün) wie main.read_sensors; (None, None, None)
+        bei Lesefehler oder wenn der Wert älter als `line_max_age` ist."""
+        r = self.state.read()
+        if r is None or not r[4] or self._age(r[0]) > self.line_max_age:
+            return None, None, None
+        return r[1], r[2], r[3]
+
+    def ultrasonics(self):
+        """(vorne, rechts, alter_s) wie sensor.latest_ultrasonics()."""
+        r = self.state.read()
+        if r is None or not r[8]:
+            return None, None, None
+        age = self._age(r[8])
+        if age > self.max_age:
+            return None, None, age
+        return _opt(r[6]), _opt(r[7]), age
+
+    def color(self, color, max_age=None):
+        """(freq_links, freq_rechts) wie FilterScheduler.latest()."""
+        r = self.state.read()
+        i = 9 + 2 * COLORS.index(color)
+        if r is None or r[i] != r[i]:
+            return None
+        if max_age is not None and self._age(r[-1]) > max_age:
+            return None
+        return r[i], r[i + 1]
+
+    def stats(self):
+        r = self.state.read() if self.state is not None else None
+        return {
+            "running": self.running,
+            "loops": r[5] if r else 0,
+            "seq": self.state.seq if self.state else 0,
+            "retries": self.state.retries if self.state else 0,
+            "line_age_ms": self._age(r[0]) * 1e3 if r else None,
+        }
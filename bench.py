@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Benchmarks für die Hot-Paths von Sensorik, Motoren und Regelschleife.
+
+Misst pro Aufruf die Latenz (p50/p90/p99/max), die CPU-Auslastung
+(process_time / Wandzeit) und die erreichte Frequenz der Regelschleife.
+
+    python bench.py                       # gegen fakegpio (ohne Pi)
+    python bench.py --robot               # auf dem Roboter
+    python bench.py --save base.json      # Ergebnis speichern
+    python bench.py --baseline base.json  # vergleichen, Exit-Code 1 bei Regression
+
+Ohne --robot wird nur der Python-Overhead gemessen: Ultraschall-Echos kommen
+sofort (fakegpio.attach_hcsr04) und die Farbmessung läuft im Fenster-Modus
+mit WINDOW=0, weil keine echten Flanken anliegen.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS = ("read_sensors", "read_ultrasonics", "read_all_colors", "set_wheel", "apply",
+              "line_step", "control_loop")
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(fn, n, warmup=None):
+    """Ruft `fn()` n-mal auf; Latenzen in µs plus CPU-Anteil."""
+    for _ in range(warmup if warmup is not None else max(1, n // 10)):
+        fn()
+    samples = []
+    clock = time.perf_counter_ns
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    for _ in range(n):
+        t0 = clock()
+        fn()
+        samples.append(clock() - t0)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    samples.sort()
+    return {
+        "n": n,
+        "mean_us": sum(samples) / n / 1e3,
+        "p50_us": _percentile(samples, 0.50) / 1e3,
+        "p90_us": _percentile(samples, 0.90) / 1e3,
+        "p99_us": _percentile(samples, 0.99) / 1e3,
+        "max_us": samples[-1] / 1e3,
+        "cpu": cpu / wall if wall > 0 else 0.0,
+    }
+
+
+def _setup_fake():
+    import fakegpio
+    fakegpio.install()
+    os.environ.setdefault("MOTOR_BACKEND", "rpi")
+    import sensor
+    sensor._clock_ns = fakegpio.clock_ns
+    sensor._wait = fakegpio.wait
+    fakegpio.attach_hcsr04(sensor.US1_TRIG, sensor.US1_ECHO, 50.0)
+    fakegpio.attach_hcsr04(sensor.US2_TRIG, sensor.US2_ECHO, 80.0)
+    sensor.set_measure_mode("window")
+    sensor.WINDOW = 0.0
+    import main
+    main.init()
+    fakegpio.set_input(main.SWITCH_PIN, fakegpio.LOW)
+    fakegpio.set_input(main.SENSOR_LEFT_PIN, fakegpio.HIGH)
+    fakegpio.set_input(main.SENSOR_RIGHT_PIN, fakegpio.HIGH)
+
+
+def run(n=2000, robot=False, loop_seconds=2.0, only=None):
+    if not robot:
+        _setup_fake()
+    import main
+    import motor
+    import sensor
+    from scheduler import RateScheduler
+
+    main.init()
+    ctrl = motor.controller
+    speeds = [15, -30, 20, 0]
+    i = [0]
+
+    def set_wheel():
+        i[0] += 1
+        ctrl.set_wheel("VL", speeds[i[0] & 3])
+
+    def apply():
+        i[0] += 1
+        s = speeds[i[0] & 3]
+        ctrl.apply(s, s, -s, -s)
+
+    line_sched = RateScheduler(main.CONTROL_HZ)
+    line_sched._last_mark = time.perf_counter()
+
+    def line_step():
+        line_sched._last_mark = time.perf_counter()
+        main._line_step(line_sched)
+
+    cases = {
+        "read_sensors": (main.read_sensors, n),
+        "read_ultrasonics": (sensor.read_ultrasonics, max(10, n // 100)),
+        "read_all_colors": (sensor.read_all_colors, max(10, n // 10)),
+        "set_wheel": (set_wheel, n),
+        "apply": (apply, n),
+        "line_step": (line_step, n),
+    }
+    results = {}
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    sensor.start_sampler(max_age=main.US_MAX_AGE)
+    try:
+        for name, (fn, count) in cases.items():
+            if only and name not in only:
+                continue
+            with quiet:
+                results[name] = measure(fn, count)
+            main.maneuvers.cancel()
+
+        if not only or "control_loop" in only:
+            sched = RateScheduler(main.CONTROL_HZ)
+            deadline = time.perf_counter() + loop_seconds
+            cpu0 = time.process_time()
+            with quiet:
+                sched.run(main._line_step, lambda: time.perf_counter() < deadline)
+            cpu = time.process_time() - cpu0
+            r = sched.report()
+            results["control_loop"] = {
+                "target_hz": main.CONTROL_HZ,
+                "achieved_hz": sched.ticks / loop_seconds,
+                "overruns": sched.overruns,
+                "jitter_max_ms": r["jitter_max_ms"],
+                "cpu": cpu / loop_seconds,
+            }
+    finally:
+        sensor.stop_sampler()
+        motor.stop()
+
+    return {
+        "meta": {
+            "mode": "robot" if robot else "fake",
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "node": platform.node(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_abs_us=2.0):
+    """Vergleicht p50 (und p90 mit doppelter Toleranz, da rauschiger) mit
+    der Baseline; gibt die Liste der Regressionen zurück."""
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if name == "control_loop":
+            if cur["achieved_hz"] < base["achieved_hz"] * (1.0 - tolerance):
+                regressions.append(f"{name}: {cur['achieved_hz']:.0f} Hz < {base['achieved_hz']:.0f} Hz")
+            continue
+        for key, tol in (("p50_us", tolerance), ("p90_us", 2 * tolerance)):
+            limit = base[key] * (1.0 + tol)
+            if cur[key] > limit and cur[key] - base[key] > min_abs_us:
+                regressions.append(f"{name} {key}: {cur[key]:.1f} us > {base[key]:.1f} us (+{(cur[key] / base[key] - 1) * 100:.0f} %)")
+    return regressions
+
+
+def print_report(report):
+    print(f"Modus: {report['meta']['mode']} | Python {report['meta']['python']} | {report['meta']['machine']}")
+    for name, r in report["results"].items():
+        if name == "control_loop":
+            print(f"  {name:17s} {r['achieved_hz']:8.1f} Hz (Ziel {r['target_hz']}) | "
+                  f"Overruns {r['overruns']} | Jitter max {r['jitter_max_ms']:.3f} ms | CPU {r['cpu'] * 100:.0f} %")
+        else:
+            print(f"  {name:17s} p50 {r['p50_us']:9.1f} us | p90 {r['p90_us']:9.1f} us | "
+                  f"p99 {r['p99_us']:9.1f} us | max {r['max_us']:9.1f} us | CPU {r['cpu'] * 100:3.0f} %")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--robot", action="store_true", help="echte Hardware statt fakegpio")
+    ap.add_argument("-n", type=int, default=2000, help="Aufrufe pro Benchmark")
+    ap.add_argument("--loop-seconds", type=float, default=2.0)
+    ap.add_argument("--only", nargs="*", choices=BENCHMARKS)
+    ap.add_argument("--save", metavar="JSON")
+    ap.add_argument("--baseline", metavar="JSON")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="erlaubte Verschlechterung (0.25 = 25 %%)")
+    args = ap.parse_args()
+
+    report = run(args.n, args.robot, args.loop_seconds, args.only)
+    print_report(report)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"gespeichert: {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSION gegenüber " + args.baseline + ":")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"\nkeine Regression gegenüber {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Farbklassifikation für die beiden TCS3200-Sensoren.
+
+Kalibrierung: Für jede Referenzfläche (weiß, schwarz, grün, rot, silber)
+werden pro Sensor mehrere `read_all_colors`-Messungen gemittelt und als
+JSON gespeichert.
+
+Klassifikation: Aus (r, g, b, c) wird ein Merkmalsvektor gebildet
+(normierte Chromatizität r/g/b + Helligkeit zwischen Schwarz und Weiß)
+und per Nearest-Centroid gegen die Referenzen verglichen. Beide Sensoren
+werden in einem vektorisierten NumPy-Aufruf klassifiziert.
+
+Beispiel:
+    clf = ColorClassifier.load()
+    labels, conf = clf.classify(sensor.read_all_colors())
+    # labels = ("white", "green"), conf = array([0.93, 0.71])
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+LABELS = ("white", "black", "green", "red", "silver")
+CHANNELS = ("r", "g", "b", "c")
+SENSORS = ("links", "rechts")
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration.json")
+
+# Gewicht der Helligkeit gegenüber der Chromatizität im Abstandsmaß
+BRIGHTNESS_WEIGHT = 1.0
+
+
+def frames_to_array(frames):
+    """read_all_colors-Dict {"r": (l, r), ...} -> Array (2, 4) in Hz."""
+    return np.array([[frames[ch][s] for ch in CHANNELS] for s in range(len(SENSORS))], dtype=np.float64)
+
+
+def record_reference(read_all_colors, samples=20, pause=0.01):
+    """Mittelwert aus `samples` Messungen als Array (2, 4)."""
+    acc = np.zeros((len(SENSORS), len(CHANNELS)))
+    for _ in range(samples):
+        acc += frames_to_array(read_all_colors(CHANNELS))
+        time.sleep(pause)
+    return acc / samples
+
+
+def calibrate(read_all_colors=None, labels=LABELS, samples=20, path=CALIBRATION_FILE):
+    """Interaktive Kalibrierung: Roboter nacheinander auf jede Fläche stellen.
+
+    Speichert die Referenzen nach `path` und gibt den Klassifikator zurück.
+    """
+    if read_all_colors is None:
+        import sensor
+        read_all_colors = sensor.read_all_colors
+    refs = {}
+    for label in labels:
+        input(f"Beide Sensoren auf '{label}' stellen und Enter drücken...")
+        refs[label] = record_reference(read_all_colors, samples)
+        print(f"  {label}: " + " | ".join(
+            f"{SENSORS[s]} " + "/".join(f"{v:.0f}" for v in refs[label][s])
+            for s in range(len(SENSORS))))
+    clf = ColorClassifier(refs)
+    clf.save(path)
+    print(f"Kalibrierung gespeichert: {path}")
+    return clf
+
+
+class ColorClassifier:
+    """Nearest-Centroid-Klassifikator auf normiertem RGB + Helligkeit.
+
+    Args:
+        refs: {label: Array (2, 4)} mit gemittelten (r, g, b, c) in Hz pro
+            Sensor; "white" und "black" werden für die Helligkeit benötigt.
+    """
+
+    def __init__(self, refs):
+        if "white" not in refs or "black" not in refs:
+            raise ValueError("Kalibrierung braucht mindestens 'white' und 'black'")
+        self.labels = tuple(refs)
+        self.refs = {k: np.asarray(v, dtype=np.float64) for k, v in refs.items()}
+        c = CHANNELS.index("c")
+        self._c_black = self.refs["black"][:, c]
+        span = self.refs["white"][:, c] - self._c_black
+        self._c_span = np.where(np.abs(span) < 1e-9, 1.0, span)
+        # Zentroiden im Merkmalsraum: (L, 2, 4) -> (2, L, 4)
+        raw = np.stack([self.refs[k] for k in self.labels])
+        self._centroids = self._features(raw).swapaxes(0, 1)
+
+    def _features(self, x):
+        """(..., 2, 4) Hz -> (..., 2, 4) Merkmale (r_n, g_n, b_n, helligkeit)."""
+        rgb = x[..., :3]
+        total = rgb.sum(axis=-1, keepdims=True)
+        chroma = rgb / np.where(total <= 0, 1.0, total)
+        bright = (x[..., 3] - self._c_black) / self._c_span
+        return np.concatenate([chroma, BRIGHTNESS_WEIGHT * bright[..., np.newaxis]], axis=-1)
+
+    def classify_batch(self, x):
+        """Klassifiziert Messungen (N, 2, 4) auf einmal.
+
+        Returns:
+            (indices (N, 2), confidence (N, 2)); confidence = 1 - d1/d2 mit
+            d1/d2 Abstand zum nächsten/zweitnächsten Zentroid.
+        """
+        f = self._features(np.asarray(x, dtype=np.float64))
+        # (N, 2, 1, 4) - (2, L, 4) -> (N, 2, L)
+        d = np.sqrt(((f[:, :, np.newaxis, :] - self._centroids) ** 2).sum(axis=-1))
+        order = np.argsort(d, axis=-1)
+        idx = order[..., 0]
+        d1 = np.take_along_axis(d, order[..., :1], axis=-1)[..., 0]
+        if d.shape[-1] > 1:
+            d2 = np.take_along_axis(d, order[..., 1:2], axis=-1)[..., 0]
+            conf = 1.0 - d1 / np.where(d2 <= 0, 1.0, d2)
+        else:
+            conf = np.ones_like(d1)
+        return idx, conf
+
+    def classify(self, frames):
+        """Klassifiziert beide Sensoren einer Messung.
+
+        Args:
+            frames: read_all_colors-Dict oder Array (2, 4)
+
+        Returns:
+            tuple: ((label_links, label_rechts), confidence Array (2,))
+        """
+        x = frames_to_array(frames) if isinstance(frames, dict) else np.asarray(frames)
+        idx, conf = self.classify_batch(x[np.newaxis])
+        return tuple(self.labels[i] for i in idx[0]), conf[0]
+
+    def save(self, path=CALIBRATION_FILE):
+        data = {k: v.tolist() for k, v in self.refs.items()}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    @classmethod
+    def load(cls, path=CALIBRATION_FILE):
+        with open(path) as f:
+            data = json.load(f)
+        return cls({k: np.array(v) for k, v in data.items()})
+
+
+if __name__ == "__main__":
+    import sensor
+    sensor.set_scaling("auto")
+    if os.path.exists(CALIBRATION_FILE) and input("Vorhandene Kalibrierung nutzen? [J/n] ").strip().lower() != "n":
+        clf = ColorClassifier.load()
+    else:
+        clf = calibrate(sensor.read_all_colors)
+    try:
+        while True:
+            labels, conf = clf.classify(sensor.read_all_colors(CHANNELS))
+            print(f"Links: {labels[0]:7s} ({conf[0]:.2f}) | Rechts: {labels[1]:7s} ({conf[1]:.2f})")
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
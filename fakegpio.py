@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Test-Double für `RPi.GPIO`, damit Sensor-Logik ohne Raspberry Pi läuft.
+
+Bildet die benutzte Teilmenge der RPi.GPIO-API nach (setmode, setup,
+input/output, PWM, add_event_detect, ...) und hat eine virtuelle Uhr in
+Nanosekunden. Flankenwechsel werden über `set_input()` eingespeist und
+rufen registrierte Callbacks synchron auf, so dass Timing-Logik
+deterministisch geprüft werden kann. Mit `call_at_ns()` vorgemerkte
+Flanken (z.B. `attach_hcsr04_scheduled`) feuern, sobald die Uhr ihren
+Zeitpunkt erreicht; `wait()` ersetzt dafür `threading.Event.wait`.
+
+Verwendung:
+    import fakegpio
+    fakegpio.install()      # vor `import sensor` / `import main`
+    import sensor
+    sensor._clock_ns = fakegpio.clock_ns
+    sensor._wait = fakegpio.wait       # Uhr und Warten immer gemeinsam tauschen
+"""
+import heapq
+import itertools
+import math
+import sys
+import types
+
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+_mode = None
+_now_ns = 0
+_levels = {}
+_directions = {}
+_events = {}        # pin -> (edge, callback)
+_output_hooks = {}  # pin -> [hook(pin, level)]
+_timers = []        # Heap (t_ns, nr, fn), siehe call_at_ns()
+_timer_ids = itertools.count()
+pwms = {}           # pin -> PWM
+
+
+# --- virtuelle Uhr ---
+
+def clock_ns():
+    """Aktuelle virtuelle Zeit in ns (Ersatz für time.monotonic_ns)."""
+    return _now_ns
+
+def advance_ns(delta_ns):
+    """Virtuelle Uhr um `delta_ns` vorstellen; vorgemerkte Aktionen laufen
+    dabei der Reihe nach, jede mit der Uhr auf ihrem Zeitpunkt."""
+    global _now_ns
+    target = _now_ns + int(delta_ns)
+    while _timers and _timers[0][0] <= target:
+        t_ns, _, fn = heapq.heappop(_timers)
+        _now_ns = max(_now_ns, t_ns)
+        fn()
+    _now_ns = max(_now_ns, target)
+
+def call_at_ns(t_ns, fn):
+    """Merkt `fn()` für die virtuelle Zeit `t_ns` vor (läuft in advance_ns)."""
+    heapq.heappush(_timers, (int(t_ns), next(_timer_ids), fn))
+
+def wait(event, timeout=None):
+    """`threading.Event.wait` auf der virtuellen Uhr.
+
+    Stellt die Uhr von Aktion zu Aktion vor, bis `event` gesetzt ist oder
+    `timeout` abgelaufen ist. Ohne vorgemerkte Aktionen und ohne Timeout
+    kehrt es sofort zurück, statt ewig zu blockieren.
+    """
+    global _now_ns
+    # wie beim echten Warten vergeht auch bei timeout=0 etwas Zeit (1 ns)
+    deadline = None if timeout is None else _now_ns + max(1, math.ceil(timeout * 1e9))
+    while not event.is_set():
+        if _timers and (deadline is None or _timers[0][0] <= deadline):
+            advance_ns(_timers[0][0] - _now_ns)
+            continue
+        if deadline is not None:
+            _now_ns = max(_now_ns, deadline)
+        return False
+    return True
+
+def reset():
+    """Setzt den kompletten Zustand zurück (Pins, Callbacks, Uhr)."""
+    global _mode, _now_ns
+    _mode = None
+    _now_ns = 0
+    _levels.clear()
+    _directions.clear()
+    _events.clear()
+    _output_hooks.clear()
+    _timers.clear()
+    pwms.clear()
+
+
+# --- RPi.GPIO-API ---
+
+def setmode(mode):
+    global _mode
+    _mode = mode
+
+def getmode():
+    return _mode
+
+def setwarnings(flag):
+    pass
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=None):
+    _directions[channel] = direction
+    if direction == OUT:
+        _levels[channel] = LOW if initial is None else initial
+    elif channel not in _levels:
+        _levels[channel] = HIGH if pull_up_down == PUD_UP else LOW
+
+def input(channel):
+    return _levels.get(channel, LOW)
+
+def output(channel, state):
+    level = HIGH if state else LOW
+    _levels[channel] = level
+    for hook in _output_hooks.get(channel, ()):
+        hook(channel, level)
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    # wie RPi.GPIO: erst setmode(), dann setup() als Eingang
+    if _mode is None:
+        raise RuntimeError("Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or GPIO.setmode(GPIO.BCM)")
+    if _directions.get(channel) != IN:
+        raise RuntimeError("You must setup() the GPIO channel as an input first")
+    if channel in _events:
+        raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+    _events[channel] = (edge, [callback] if callback else [])
+
+def add_event_callback(channel, callback):
+    if channel not in _events:
+        raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+    _events[channel][1].append(callback)
+
+def remove_event_detect(channel):
+    _events.pop(channel, None)
+
+def event_detected(channel):
+    return False
+
+def cleanup(channel=None):
+    if channel is None:
+        _levels.clear()
+        _directions.clear()
+        _events.clear()
+    else:
+        _levels.pop(channel, None)
+        _directions.pop(channel, None)
+        _events.pop(channel, None)
+
+
+class PWM:
+    def __init__(self, channel, frequency):
+        self.channel = channel
+        self.frequency = frequency
+        self.duty = 0
+        self.running = False
+        self.writes = 0
+        pwms[channel] = self
+
+    def start(self, duty):
+        self.duty = duty
+        self.running = True
+        self.writes += 1
+
+    def ChangeDutyCycle(self, duty):
+        self.duty = duty
+        self.writes += 1
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.running = False
+
+
+# --- Stimulus für Tests ---
+
+def set_input(channel, level, at_ns=None):
+    """Setzt den Pegel eines Eingangs und löst ggf. Flanken-Callbacks aus.
+
+    Mit `at_ns` wird die virtuelle Uhr vorher auf diesen Zeitpunkt gestellt.
+    """
+    global _now_ns
+    if at_ns is not None:
+        _now_ns = int(at_ns)
+    level = HIGH if level else LOW
+    old = _levels.get(channel, LOW)
+    _levels[channel] = level
+    if old == level or channel not in _events:
+        return
+    edge, callbacks = _events[channel]
+    if edge == BOTH or (edge == RISING and level == HIGH) or (edge == FALLING and level == LOW):
+        for cb in list(callbacks):
+            cb(channel)
+
+def on_output(channel, hook):
+    """Registriert `hook(channel, level)`, aufgerufen bei jedem output()."""
+    _output_hooks.setdefault(channel, []).append(hook)
+
+def attach_hcsr04(trig, echo, distance_cm, latency_ns=450_000):
+    """Simuliert einen HC-SR04 an `trig`/`echo`.
+
+    Bei fallender Trigger-Flanke wird nach `latency_ns` der Echo-Pin HIGH
+    gesetzt und nach der Laufzeit für `distance_cm()` (Callable oder Zahl,
+    None = kein Echo) wieder LOW. Die virtuelle Uhr läuft dabei mit.
+    """
+    state = {"last": LOW}
+
+    def hook(channel, level):
+        falling = state["last"] == HIGH and level == LOW
+        state["last"] = level
+        if not falling:
+            return
+        d = distance_cm() if callable(distance_cm) else distance_cm
+        if d is None:
+            return
+        advance_ns(latency_ns)
+        set_input(echo, HIGH)
+        advance_ns(d * 2.0 / 34300.0 * 1e9)
+        set_input(echo, LOW)
+
+    on_output(trig, hook)
+
+
+def attach_hcsr04_scheduled(trig, echo, distance_cm, latency_ns=450_000):
+    """Wie `attach_hcsr04`, aber die Echo-Flanken werden nur vorgemerkt
+    (`call_at_ns`) und feuern, wenn die Uhr weiterläuft. So können sich
+    Messungen mehrerer Sensoren überlappen (TriggerScheduler); Wartende
+    nutzen dafür `wait()`.
+    """
+    state = {"last": LOW}
+
+    def hook(channel, level):
+        falling = state["last"] == HIGH and level == LOW
+        state["last"] = level
+        if not falling:
+            return
+        d = distance_cm() if callable(distance_cm) else distance_cm
+        if d is None:
+            return
+        t_rise = _now_ns + latency_ns
+        call_at_ns(t_rise, lambda: set_input(echo, HIGH))
+        call_at_ns(t_rise + d * 2.0 / 34300.0 * 1e9, lambda: set_input(echo, LOW))
+
+    on_output(trig, hook)
+
+
+def install():
+    """Registriert dieses Modul als `RPi.GPIO` in `sys.modules`."""
+    module = sys.modules[__name__]
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = module
+    sys.modules["RPi"] = rpi
+    sys.modules["RPi.GPIO"] = module
+    return module
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Sensorzustand eines Regel-Ticks.
+
+`main.acquire_frame()` liest ESP32-Linie/Grün, Ultraschall (gefiltert)
+und Schalter genau einmal pro Tick und gibt sie als `SensorFrame` mit
+Zeitstempel und laufender Nummer weiter. Alle Entscheidungen eines Ticks
+(Hindernis, Grün, Endzone, Linienregelung, Manöver-Abbruch) sehen so
+dieselben Werte, und der Tick lässt sich als Ganzes loggen.
+
+Die Attribute left/right/gruen/us_front/pressed sind dieselben, die
+maneuver.ManeuverExecutor.tick() erwartet.
+"""
+
+
+class SensorFrame:
+    __slots__ = ("t", "seq", "left", "right", "gruen", "us_front", "us_right", "pressed")
+
+    def __init__(self, t, seq, left, right, gruen, us_front=None, us_right=None, pressed=True):
+        self.t = t                  # time.monotonic() nach dem Lesen der Pins
+        self.seq = seq              # fortlaufend pro acquire_frame()
+        self.left = left            # 0 = weiß, 1 = Linie, None = Lesefehler
+        self.right = right
+        self.gruen = gruen
+        self.us_front = us_front    # cm (gefiltert), None = kein/veralteter Wert
+        self.us_right = us_right
+        self.pressed = pressed
+
+    @property
+    def valid(self):
+        return self.left is not None and self.right is not None
+
+    @property
+    def bits(self):
+        """Wie telemetry: bit0 links, bit1 rechts, bit2 grün, bit3 Schalter."""
+        return (bool(self.left) | bool(self.right) << 1 | bool(self.gruen) << 2
+                | bool(self.pressed) << 3)
+
+    def __repr__(self):
+        return (f"SensorFrame(#{self.seq} t={self.t:.4f} L={self.left} R={self.right} "
+                f"G={self.gruen} USv={self.us_front} USr={self.us_right} S={self.pressed})")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Liest alle GPIO-Pegel der Bank 0 (GPIO0..31) auf einmal.
+
+Statt je Pin ein GPIO.input() liefert `levels()` ein 32-Bit-Wort; `read()`
+zieht die Bits der konfigurierten Pins mit Shift/Maske heraus. Alle Pins
+stammen so aus demselben Lesezugriff, und es gibt nur einen Aufruf pro
+Tick.
+
+    gpiomem   mmap von /dev/gpiomem, Register GPLEV0 (BCM2835/6/7, BCM2711;
+              nicht Pi 5, dort liegen die GPIOs im RP1)
+    pigpio    pi.read_bank_1() über den pigpio-Daemon
+    portable  GPIO.input() je konfiguriertem Pin (überall, z.B. fakegpio)
+
+`open_bank(pins, GPIO)` wählt mit backend="auto" gpiomem, wenn das echte
+RPi.GPIO geladen ist und /dev/gpiomem passt, sonst portable. Ohne Angabe
+gilt die Umgebungsvariable GPIO_BANK.
+
+    bank = open_bank((5, 6, 22), GPIO)
+    links, rechts, gruen = bank.read()      # je 0/1
+
+`python gpiobank.py` misst die Kosten pro Lesevorgang je Backend.
+"""
+import mmap
+import os
+import struct
+
+GPIOMEM = "/dev/gpiomem"
+GPLEV0 = 0x34          # Pegelregister GPIO0..31 (Byte-Offset)
+_BLOCK = 4096
+
+# SoCs mit BCM2835-kompatiblem GPIO-Block
+_SUPPORTED_SOCS = (b"bcm2835", b"bcm2836", b"bcm2837", b"bcm2711")
+
+
+def _check_pins(pins):
+    pins = tuple(pins)
+    for pin in pins:
+        if not 0 <= pin < 32:
+            raise ValueError(f"GPIO{pin} liegt nicht in Bank 0 (GPIO0..31)")
+    return pins
+
+
+def _bits_reader(levels, pins):
+    """read() für Bank-Backends: ein levels()-Aufruf, dann Maskieren."""
+    if len(pins) == 3:
+        # häufigster Fall (ESP32 links/rechts/grün) ohne Schleife
+        a, b, c = pins
+
+        def read():
+            v = levels()
+            return (v >> a) & 1, (v >> b) & 1, (v >> c) & 1
+        return read
+
+    def read():
+        v = levels()
+        return tuple([(v >> pin) & 1 for pin in pins])
+    return read
+
+
+def _soc_supported():
+    try:
+        with open("/proc/device-tree/compatible", "rb") as f:
+            compatible = f.read()
+    except OSError:
+        return False
+    return any(soc in compatible for soc in _SUPPORTED_SOCS)
+
+
+class GpiomemBank:
+    """Pegel aus dem gemappten GPLEV0-Register (ein 32-Bit-Lesezugriff)."""
+    name = "gpiomem"
+
+    def __init__(self, pins, path=GPIOMEM, check_soc=True):
+        self.pins = _check_pins(pins)
+        if check_soc and not _soc_supported():
+            raise RuntimeError("gpiomem: SoC ohne BCM2835-GPIO-Block (z.B. Pi 5)")
+        fd = os.open(path, os.O_RDONLY | os.O_SYNC)
+        try:
+            self._mm = mmap.mmap(fd, _BLOCK, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self._regs = memoryview(self._mm).cast("I")
+        self._lev = GPLEV0 // 4
+        self.path = path
+        self.read = _bits_reader(self.levels, self.pins)
+
+    def levels(self):
+        return self._regs[self._lev]
+
+    def close(self):
+        if self._regs is not None:
+            self._regs.release()
+            self._regs = None
+            self._mm.close()
+
+
+class PigpioBank:
+    """Pegel per pigpio read_bank_1() (ein Daemon-Aufruf)."""
+    name = "pigpio"
+
+    def __init__(self, pins, host="localhost", port=8888):
+        self.pins = _check_pins(pins)
+        try:
+            import pigpio
+        except ImportError as exc:
+            raise RuntimeError("pigpio-Bank braucht das pigpio-Modul (apt install python3-pigpio)") from exc
+        self.pi = pigpio.pi(host, port)
+        if not self.pi.connected:
+            raise RuntimeError("pigpio-Daemon läuft nicht (sudo pigpiod)")
+        self.levels = self.pi.read_bank_1
+        self.read = _bits_reader(self.levels, self.pins)
+
+    def close(self):
+        self.pi.stop()
+
+
+class PortableBank:
+    """GPIO.input() je Pin; levels() setzt daraus ein Bank-Wort zusammen."""
+    name = "portable"
+
+    def __init__(self, pins, GPIO):
+        self.pins = _check_pins(pins)
+        self._input = read = GPIO.input
+        if len(self.pins) == 3:
+            a, b, c = self.pins
+            self.read = lambda: (read(a), read(b), read(c))
+        else:
+            self.read = lambda: tuple([read(pin) for pin in self.pins])
+
+    def levels(self):
+        read = self._input
+        v = 0
+        for pin in self.pins:
+            if read(pin):
+                v |= 1 << pin
+        return v
+
+    def close(self):
+        pass
+
+
+BACKENDS = {
+    "gpiomem": GpiomemBank,
+    "pigpio": PigpioBank,
+    "portable": PortableBank,
+}
+
+
+def open_bank(pins, GPIO, backend=None):
+    """Bank-Leser für `pins` (BCM).
+
+    backend: 'auto' (Standard), 'gpiomem', 'pigpio' oder 'portable'. Ist
+    None, gilt die Umgebungsvariable GPIO_BANK. 'auto' fällt auf portable
+    zurück, wenn gpiomem nicht geht oder GPIO nicht das echte RPi.GPIO ist
+    (fakegpio).
+    """
+    if backend is None:
+        backend = os.environ.get("GPIO_BANK", "auto")
+    if backend == "portable":
+        return PortableBank(pins, GPIO)
+    if backend == "auto":
+        if getattr(GPIO, "__name__", "") == "RPi.GPIO":
+            try:
+                return GpiomemBank(pins)
+            except (OSError, RuntimeError):
+                pass
+        return PortableBank(pins, GPIO)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unbekanntes GPIO-Bank-Backend: {backend}")
+    return BACKENDS[backend](pins)
+
+
+def _bench(n, pins, robot):
+    import tempfile
+    import time
+
+    if robot:
+        import RPi.GPIO as GPIO
+        GPIO.setmode(GPIO.BCM)
+        for pin in pins:
+            GPIO.setup(pin, GPIO.IN)
+    else:
+        import fakegpio
+        GPIO = fakegpio.install()
+        GPIO.setmode(GPIO.BCM)
+        for i, pin in enumerate(pins):
+            GPIO.setup(pin, GPIO.IN)
+            GPIO.set_input(pin, i & 1 == 0)
+
+    input_ = GPIO.input
+    left, right, gruen = pins
+
+    def per_pin():
+        return input_(left), input_(right), input_(gruen)
+
+    cases = [("GPIO.input x3", per_pin)]
+    banks = [PortableBank(pins, GPIO)]
+    tmp = None
+    if robot:
+        for backend in ("gpiomem", "pigpio"):
+            try:
+                banks.append(BACKENDS[backend](pins))
+            except (OSError, RuntimeError) as exc:
+                print(f"{backend}: nicht verfügbar ({exc})")
+    else:
+        # ohne Pi: gleiche Lesepfad-Kosten auf einer Datei mit GPLEV0-Wort
+        tmp = tempfile.NamedTemporaryFile()
+        word = sum(1 << pin for i, pin in enumerate(pins) if i & 1 == 0)
+        tmp.write(bytes(GPLEV0) + struct.pack("<I", word) + bytes(_BLOCK - GPLEV0 - 4))
+        tmp.flush()
+        banks.append(GpiomemBank(pins, tmp.name, check_soc=False))
+
+    for bank in banks:
+        assert bank.read() == per_pin(), bank.name
+        assert bank.levels() & sum(1 << pin for pin in pins) == sum(v << pin for v, pin in zip(per_pin(), pins))
+        cases.append((bank.name, bank.read))
+
+    results = []
+    for name, fn in cases:
+        for _ in range(n // 10):
+            fn()
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            fn()
+        results.append((name, (time.perf_counter_ns() - t0) / n))
+    base = results[0][1]
+    print(f"{n} Lesevorgänge von GPIO{left}/{right}/{gruen} ({'Pi' if robot else 'fakegpio, gpiomem auf Datei'}):")
+    for name, ns in results:
+        print(f"  {name:14s} {ns:8.0f} ns/Lesevorgang | x{base / ns:5.2f}")
+    for bank in banks:
+        bank.close()
+    if tmp is not None:
+        tmp.close()
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Kosten pro Lesevorgang der GPIO-Bank-Backends")
+    ap.add_argument("--robot", action="store_true", help="echte Hardware statt fakegpio")
+    ap.add_argument("-n", type=int, default=200000)
+    ap.add_argument("--pins", type=int, nargs=3, default=(5, 6, 22), metavar=("LINKS", "RECHTS", "GRUEN"))
+    args = ap.parse_args()
+    _bench(args.n, args.pins, args.robot)
+
+
+if __name__ == "__main__":
+    main()
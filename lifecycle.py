@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Lazy Initialisierung der Hardware-Subsysteme.
+
+sensor, motor und main konfigurieren beim Import keine Pins mehr. Jedes
+Subsystem hat ein idempotentes `init()`/`shutdown()`; die öffentlichen
+Funktionen der Module rufen `init()` beim ersten Gebrauch selbst auf, so
+startet nur die Hardware, die auch benutzt wird (z.B. keine Farbsensoren,
+wenn der ESP32 die Farbe erkennt).
+
+Die Dauer jedes `init()` wird gemessen; `report()` gibt sie als Tabelle aus.
+"""
+import threading
+import time
+
+_subsystems = []
+
+
+class Subsystem:
+    """Ein Stück Hardware mit `setup()` und optionalem `teardown()`."""
+
+    def __init__(self, name, setup, teardown=None):
+        self.name = name
+        self._setup = setup
+        self._teardown = teardown
+        self.ready = False
+        self.startup_time = None   # Dauer des letzten init() in s
+        self.inits = 0
+        self._lock = threading.RLock()   # init() eines Subsystems darf andere starten
+        _subsystems.append(self)
+
+    def init(self):
+        if self.ready:
+            return
+        with self._lock:
+            if self.ready:
+                return
+            t0 = time.perf_counter()
+            self._setup()
+            self.startup_time = time.perf_counter() - t0
+            self.inits += 1
+            self.ready = True
+
+    def shutdown(self):
+        with self._lock:
+            if not self.ready:
+                return
+            try:
+                if self._teardown is not None:
+                    self._teardown()
+            finally:
+                self.ready = False
+
+
+def subsystems():
+    return list(_subsystems)
+
+
+def report():
+    """Startzeit pro Subsystem als Text."""
+    used = [s for s in _subsystems if s.startup_time is not None]
+    total = sum(s.startup_time for s in used)
+    lines = [f"Startzeiten ({total * 1e3:.1f} ms gesamt):"]
+    for s in _subsystems:
+        if s.startup_time is None:
+            lines.append(f"  {s.name:14s}       -   nicht gestartet")
+        else:
+            state = "aktiv" if s.ready else "beendet"
+            lines.append(f"  {s.name:14s} {s.startup_time * 1e3:7.2f} ms {state}")
+    return "\n".join(lines)
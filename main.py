@@ -1,12 +1,27 @@
 #!/usr/bin/env python3
+import os
 import sys
 import time
 import traceback
 import random
+from datetime import datetime
 
 import RPi.GPIO as GPIO
+import acquisition
+import gpiobank
+import lifecycle
+import motor
+import profiling
 from motor import *
 import sensor as sensors
+from scheduler import RateScheduler
+from switch import Switch
+import maneuver
+from maneuver import ManeuverExecutor
+from telemetry import Recorder, STATE_CODES
+from pid import BinaryLineError, GainTable, LineController
+from replay import InputLog, InputRecorder
+from frame import SensorFrame
 
 SWITCH_PIN = 25  # Schalter-Pin (BCM)
 SENSOR_LEFT_PIN = 5   # GPIO5 - entspricht Pin 16 (links) am ESP32
@@ -14,16 +29,76 @@ SENSOR_RIGHT_PIN = 6  # GPIO6 - entspricht Pin 17 (rechts) am ESP32
 GRUEN_PIN = 22       # GPIO22 - entspricht Pin 22 (gruen) am ESP32
 LED_PIN = 8          # GPIO8 - LED für Grün-Erkennung
 
-GPIO.setmode(GPIO.BCM)
-GPIO.setwarnings(False)
-GPIO.setup(SWITCH_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-GPIO.setup(SENSOR_LEFT_PIN, GPIO.IN)
-GPIO.setup(SENSOR_RIGHT_PIN, GPIO.IN)
-GPIO.setup(GRUEN_PIN, GPIO.IN)
-GPIO.setup(LED_PIN, GPIO.OUT)
-GPIO.output(LED_PIN, GPIO.LOW)
-
 DEBOUNCE = 0.02
+switch = None   # wird in init() angelegt
+_line_bank = None   # gpiobank-Leser für links/rechts/grün (init())
+
+def _notstopp():
+    """Not-Aus: Motoren sofort stoppen, wenn der Schalter losgelassen wird.
+
+    Der Stopp bleibt bis zum nächsten Drücken verriegelt, damit ein gerade
+    laufender Tick die Motoren nicht wieder anwirft."""
+    motor.halt()
+
+def _init_pins():
+    global switch, _line_bank
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
+    GPIO.setup(SENSOR_LEFT_PIN, GPIO.IN)
+    GPIO.setup(SENSOR_RIGHT_PIN, GPIO.IN)
+    GPIO.setup(GRUEN_PIN, GPIO.IN)
+    GPIO.setup(LED_PIN, GPIO.OUT)
+    GPIO.output(LED_PIN, GPIO.LOW)
+    _line_bank = gpiobank.open_bank((SENSOR_LEFT_PIN, SENSOR_RIGHT_PIN, GRUEN_PIN), GPIO)
+    switch = Switch(SWITCH_PIN, DEBOUNCE)
+    switch.on_release(_notstopp)
+    switch.on_press(motor.resume)
+
+def _shutdown_pins():
+    global switch, _line_bank
+    switch.close()
+    switch = None
+    _line_bank.close()
+    _line_bank = None
+    GPIO.output(LED_PIN, GPIO.LOW)
+
+_hw = lifecycle.Subsystem("main", _init_pins, _shutdown_pins)
+
+ACQUISITION = "thread"   # "process": ESP32 + Ultraschall im Kindprozess (acquisition.py)
+_acq = None
+
+def _start_acquisition():
+    global _acq
+    _acq = acquisition.Acquisition((SENSOR_LEFT_PIN, SENSOR_RIGHT_PIN, GRUEN_PIN),
+                                   max_age=US_MAX_AGE).start()
+    sensors.use_shared(_acq)
+
+def _stop_acquisition():
+    global _acq
+    sensors.use_shared(None)
+    _acq.stop()
+    _acq = None
+
+_acq_hw = lifecycle.Subsystem("acquisition", _start_acquisition, _stop_acquisition)
+
+def init():
+    """Startet alles, was die Linienverfolgung braucht (idempotent):
+    ESP32-Eingänge, LED, Schalter, Motoren und Ultraschall. Die
+    Farbsensoren bleiben aus (Farbe kommt vom ESP32). Mit
+    ACQUISITION = "process" misst ein eigener Prozess."""
+    _hw.init()
+    motor.init()
+    if ACQUISITION == "process":
+        _acq_hw.init()
+    else:
+        sensors.init(color=False, sonar=True)
+
+def shutdown():
+    """Stoppt Sampler und Motoren und gibt alle Pins frei (idempotent)."""
+    _hw.shutdown()
+    _acq_hw.shutdown()
+    sensors.shutdown()
+    motor.shutdown()
 
 # Linienverfolger Konfiguration
 BASE_SPEED = 15        # Grundgeschwindigkeit
@@ -31,177 +106,306 @@ TURN_SPEED = 20 #Geschwindigkeit beim Abbiegen
 QUARTER_TIME = 0.5    # Zeit für eine 90° Drehung (anpassen nach Bedarf)
 HALF_TIME = 1       # Zeit für eine 180° Drehung (anpassen nach Bedarf)
 
+# Regelmodus: "bangbang" (drei feste Zustände) oder "pid" (abgestufter
+# Fehler, siehe pid.py); `python main.py --pid`
+LINE_MODE = "bangbang"
+PID_SPEED = 30          # Grundgeschwindigkeit im PID-Modus
+# (kp, ki, kd) pro Grundgeschwindigkeit; dazwischen wird interpoliert
+PID_GAINS = {
+    15: (25.0, 0.0, 1.0),
+    30: (40.0, 5.0, 2.0),
+    45: (55.0, 10.0, 3.0),
+}
+PID_SLOWDOWN = 0.3      # in Kurven bis zu 30 % langsamer
+
 # Globale Variablen
 _white_start_time = None
+_endzone_turn_until = None   # Endzone: bis wann vor der Wand links gedreht wird
 _last_green_time = None
 GREEN_COOLDOWN = 3.0  # Sekunden Pause nach Grün-Erkennung
+ENDZONE_TIME = 4.0    # so lange beide Sensoren auf Weiß -> Endzone-Fahrt (s)
+ENDZONE_WALL_CM = 3   # Endzone: näher an der Wand wird links gedreht
+ENDZONE_TURN_SPEED = 50
+ENDZONE_TURN_S = (0.3, 1.3)   # zufällige Drehdauer vor der Wand (s)
+US_MAX_AGE = 0.15     # Ultraschallwerte älter als das werden ignoriert (s)
+US_WINDOW = 5         # Medianfenster der Ultraschall-Filter (Messungen)
+OBSTACLE_CM = 10      # ab hier wird ein Hindernis umfahren
+OBSTACLE_LOOKAHEAD = 0.1  # so viele s vor Erreichen von OBSTACLE_CM auslösen (Filterverzug)
+CONTROL_HZ = 200      # Regelrate der Linienverfolgung
+
+TELEMETRY_DIR = "runs"  # Telemetrie + Eingangs-Log; None = nur Ringpuffer, keine Dateien
+_run_stamp = None       # Datei-Stempel der aktuellen Fahrt (_start_run)
+_runs = 0               # Fahrten seit Programmstart
+
+_led_off_at = None
+scheduler = RateScheduler(CONTROL_HZ)
+telemetry = Recorder()
+_MANOEVER = STATE_CODES["Manoever"]
+_ENDZONE = STATE_CODES["Endzone"]
+maneuvers = ManeuverExecutor(speedcontrol)
+line_error = BinaryLineError()
+us_vorne = sensors.SonarFilter(US_WINDOW)
+us_rechts = sensors.SonarFilter(US_WINDOW)
+_us_t = None   # Zeitpunkt der zuletzt gefilterten Messung
+line_pid = LineController(GainTable(PID_GAINS), PID_SPEED, slowdown=PID_SLOWDOWN)
+
+_frame_seq = 0
+
+def line_status(left, right):
+    """Zustand der Linienverfolgung aus den beiden Sensoren (siehe STATES)."""
+    if left and right:
+        return "Geradeaus"         # Beide Sensoren auf Linie -> Geradeaus
+    if left:
+        return "Rechts"            # Nur linker Sensor auf Linie -> Nach rechts korrigieren
+    if right:
+        return "Links"             # Nur rechter Sensor auf Linie -> Nach links korrigieren
+    return "Weiss"
 
-def endzone(left, right, threshold=4.0):
-    """Erkennt, wenn beide Sensoren für eine bestimmte Zeit auf Weiß sind und führt dann eine Drehung aus.
+def bangbang_speeds(status):
+    """Motorwerte (links, rechts) des bang-bang-Modus für `status`."""
+    if status == "Rechts":
+        return -30, 20
+    if status == "Links":
+        return 20, -30
+    return BASE_SPEED, BASE_SPEED
+
+def endzone_wall(us_front):
+    """Zufällige Drehdauer in s, wenn in der Endzone vorne eine Wand ist, sonst None."""
+    if us_front is not None and us_front < ENDZONE_WALL_CM:
+        return random.uniform(*ENDZONE_TURN_S)
+    return None
+
+def endzone(frame, threshold=None):
+    """Erkennt, wenn beide Sensoren für eine bestimmte Zeit auf Weiß sind, und fährt dann
+    pro Tick durch die Endzone: geradeaus, vor einer Wand (< ENDZONE_WALL_CM) zufällig lange
+    links drehen, bis die Linie wieder gefunden ist.
     
     Args:
-        left: Sensor links Wert (0=weiß, 1=schwarz)
-        right: Sensor rechts Wert (0=weiß, 1=schwarz)
-        threshold: Zeit in Sekunden, nach der die Aktion ausgelöst wird (default: 1.0)
+        frame: SensorFrame des aktuellen Ticks
+        threshold: Zeit in Sekunden, nach der die Endzone-Fahrt beginnt (default: ENDZONE_TIME)
+
+    Returns:
+        True, solange die Endzone-Fahrt läuft (Motoren für diesen Tick gesetzt)
     """
-    global _white_start_time
-    
-    if not left and not right:
-        if _white_start_time is None:
-            _white_start_time = time.time()
-        else:
-            elapsed = time.time() - _white_start_time
-            if elapsed >= threshold:
-                USvorne, USrechts = sensors.read_ultrasonics()
-                left, right, gruen = read_sensors()
-                while True:
-                    USvorne, USrechts = sensors.read_ultrasonics()
-                    left, right, gruen = read_sensors()
-                    print(f"ENDZONE | USv: {USvorne} | USr: {USrechts} | L: {left} | R: {right}")
-                    forward(BASE_SPEED)
-                    if USvorne is not None and USvorne < 3:
-                        turn_left(50)
-                        time.sleep(random.uniform(0.3, 1.3))
-                    if left or right or not schalterGedrueckt():
-                        break
-                _white_start_time = None
-    else:
+    global _white_start_time, _endzone_turn_until
+
+    if frame.left or frame.right:
         _white_start_time = None
+        _endzone_turn_until = None
+        return False
+    if _white_start_time is None:
+        _white_start_time = frame.t
+        return False
+    if frame.t - _white_start_time < (ENDZONE_TIME if threshold is None else threshold):
+        return False
+
+    if _endzone_turn_until is not None and frame.t >= _endzone_turn_until:
+        _endzone_turn_until = None
+    if _endzone_turn_until is None:
+        turn = endzone_wall(frame.us_front)
+        if turn is not None:
+            _endzone_turn_until = frame.t + turn
+    if _endzone_turn_until is not None:
+        ml, mr = -ENDZONE_TURN_SPEED, ENDZONE_TURN_SPEED   # wie turn_left()
+    else:
+        ml = mr = BASE_SPEED
+    speedcontrol(ml, mr)
+    telemetry.record(frame.t, frame.left, frame.right, frame.gruen, frame.pressed,
+                     frame.us_front, frame.us_right, ml, mr, _ENDZONE)
+    return True
+
+@profiling.timed("schalterGedrueckt")
 def schalterGedrueckt():
-    state = GPIO.input(SWITCH_PIN)
-    time.sleep(DEBOUNCE)
-    return GPIO.input(SWITCH_PIN) == GPIO.LOW
+    """Entprellter Schalterzustand aus dem Flanken-Callback (blockiert nicht)."""
+    if not _hw.ready:
+        _hw.init()
+    return switch.pressed()
 
+@profiling.timed("read_sensors")
 def read_sensors():
     """Liest die beiden Sensordaten vom ESP32 über GPIO.
     
     Returns:
         tuple: (sensor_left, sensor_right) - 0 für weiß/keine Linie, 1 für schwarz/Linie
     """
+    if _acq is not None:
+        return _acq.line()
+    if not _hw.ready:
+        _hw.init()
     try:
-        sensor_left = GPIO.input(SENSOR_LEFT_PIN)   # 0 = weiß, 1 = schwarz
-        sensor_right = GPIO.input(SENSOR_RIGHT_PIN)  # 0 = weiß, 1 = schwarz
-        gruen = GPIO.input(GRUEN_PIN)  # 1 = gruen
-        return sensor_left, sensor_right, gruen
+        # alle drei Bits aus einem Lesezugriff (gpiobank), 1 = schwarz bzw. grün
+        return _line_bank.read()
     except ValueError:
         return None, None, None
 
-def check_green_and_react(left, right, gruen):
-    """Prüft auf Grün-Erkennung und reagiert entsprechend.
+@profiling.timed("acquire_frame")
+def acquire_frame():
+    """Liest Linie/Grün, Ultraschall (gefiltert) und Schalter genau einmal.
+
+    Returns:
+        SensorFrame mit Zeitstempel (time.monotonic) und laufender Nummer
+    """
+    global _frame_seq
+    left, right, gruen = read_sensors()
+    now = time.monotonic()
+    us_front, us_right = read_ultrasonics_filtered(now)
+    _frame_seq += 1
+    return SensorFrame(now, _frame_seq, left, right, gruen, us_front, us_right, schalterGedrueckt())
+
+def _led_blink(duration=0.1):
+    """LED für `duration` Sekunden an; ausgeschaltet wird im nächsten Tick."""
+    global _led_off_at
+    GPIO.output(LED_PIN, GPIO.HIGH)
+    _led_off_at = time.monotonic() + duration
+
+def _led_update(now):
+    global _led_off_at
+    if _led_off_at is not None and now >= _led_off_at:
+        GPIO.output(LED_PIN, GPIO.LOW)
+        _led_off_at = None
+
+def check_green_and_react(frame):
+    """Prüft auf Grün-Erkennung und startet das passende Abbiege-Manöver.
     
+    Das Manöver läuft nicht-blockierend über `maneuvers` und endet, sobald
+    die Linie wieder unter einem Sensor ist.
+
     Args:
-        left: Sensor links Wert
-        right: Sensor rechts Wert  
-        gruen: Grün-Sensor Wert
+        frame: SensorFrame des aktuellen Ticks
     """
-    if gruen and (right or left):
-        forward(BASE_SPEED)
-        time.sleep(0.01)
-        if gruen and right and not left:
-            GPIO.output(LED_PIN, GPIO.HIGH)
-            time.sleep(0.1)
-            GPIO.output(LED_PIN, GPIO.LOW)
-            turn_right(TURN_SPEED)
-            time.sleep(QUARTER_TIME)  # 90° anpassen nach bedarf
-            time.sleep(0.2)
-            print("Grün erkannt: 90° Drehung Right")
-
-        if gruen and left and not right:
-            GPIO.output(LED_PIN, GPIO.HIGH)
-            time.sleep(0.1)
-            GPIO.output(LED_PIN, GPIO.LOW)
-            turn_left(TURN_SPEED)
-            time.sleep(QUARTER_TIME)  # 90° anpassen nach bedarf
-            print("Grün erkannt: 90° Drehung Left")
-            
-        if gruen and left and right:
-            GPIO.output(LED_PIN, GPIO.HIGH)
-            time.sleep(0.1)
-            GPIO.output(LED_PIN, GPIO.LOW)
-            turn_right(TURN_SPEED)
-            time.sleep(HALF_TIME)  # 180° anpassen nach bedarf
-            print("Grün erkannt: 180° Drehung")
+    if maneuvers.active:
+        return
+    if frame.gruen and (frame.right or frame.left):
+        m = maneuver.green_turn(frame.left, frame.right, TURN_SPEED, BASE_SPEED,
+                                QUARTER_TIME, HALF_TIME, on_enter=_led_blink)
+        maneuvers.start(m, frame.t)
+        print(f"Grün erkannt: {m.name}")
+
+@profiling.timed("line_step")
+def _line_step(sched):
+    """Ein Tick der Linienverfolgung: Frame lesen -> entscheiden -> Motoren."""
+    f = acquire_frame()
+    sched.mark("read")
+    if not f.valid:
+        return  # ungültige Daten, nächster Tick
+
+    left, right, now = f.left, f.right, f.t
+    _led_update(now)
+    if maneuvers.active:
+        with profiling.stage("maneuver"):
+            maneuvers.tick(now, f)
+        line_error.reset()   # nach dem Manöver ohne alten Fehler/I-Anteil weiter
+        line_pid.reset()
+        sched.mark("maneuver")
+        ml, mr = maneuvers.setpoint
+        telemetry.record(now, left, right, f.gruen, f.pressed, f.us_front, f.us_right, ml, mr, _MANOEVER)
+        return
+
+    # in der Endzone keine Hindernis-/Grünprüfung: Wände werden dort per
+    # Drehung umgangen (ENDZONE_WALL_CM), nicht umfahren
+    if endzone(f):
+        line_error.reset()
+        line_pid.reset()
+        sched.mark("decide")
+        return
+
+    check_Hindernis(f)
+    sched.mark("hindernis")
+    if maneuvers.active:
+        return
+
+    # Steuerungslogik
+    status = line_status(left, right)
+    check_green_and_react(f)
+    sched.mark("decide")
+    if maneuvers.active:
+        return
+
+    if LINE_MODE == "pid":
+        ml, mr = line_pid.update(line_error.update(left, right, now), now)
+    else:
+        ml, mr = bangbang_speeds(status)
+    speedcontrol(ml, mr)
+    sched.mark("actuate")
+
+    telemetry.record(now, left, right, f.gruen, f.pressed, f.us_front, f.us_right, ml, mr, STATE_CODES[status])
+
+def _start_run():
+    """Neuer Datei-Stempel: Datum, Uhrzeit mit Millisekunden und laufende
+    Nummer, damit zwei Fahrten in derselben Sekunde sich nicht überschreiben."""
+    global _run_stamp, _runs
+    _runs += 1
+    # Wanduhr über datetime: time.time ist in Simulation/Replay virtuell
+    _run_stamp = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]}-{_runs}"
+
+def _run_path(prefix, ext=".bin"):
+    if TELEMETRY_DIR is None:
+        return None
+    return os.path.join(TELEMETRY_DIR, f"{prefix}-{_run_stamp}{ext}")
 
 def line_follow():
-    """Hauptschleife für Linienverfolgung."""
+    """Hauptschleife für Linienverfolgung mit fester Regelrate (CONTROL_HZ)."""
     print("Linienverfolger aktiv")
-    
-    while schalterGedrueckt():
-        left, right, gruen = read_sensors()
-        
-        while left is None or right is None:
-            continue  # ungültige Daten, nächster Durchlauf
-        
-        # Hinderniserkennung einmal pro Hauptschleife
-        check_Hindernis()
-        
-        # Steuerungslogik
-        if left and right:
-            forward(BASE_SPEED)
-            while left and right:
-                # Beide Sensoren auf Linie -> Geradeaus
-                time.sleep(0.01)
-                status = "Geradeaus"
-                left, right, gruen = read_sensors()
-                check_green_and_react(left, right, gruen)
-                endzone(left, right)
-            
-        if left and not right:
-            speedcontrol(-30, 20)
-            while left and not right:
-                # Nur linker Sensor auf Linie -> Nach rechts korrigieren
-                time.sleep(0.01)
-                status = "Rechts"
-                left, right, gruen = read_sensors()
-                check_green_and_react(left, right, gruen)
-                endzone(left, right)
-            
-        if not left and right:
-            speedcontrol(20, -30)
-            while not left and right:
-                # Nur rechter Sensor auf Linie -> Nach links korrigieren
-                time.sleep(0.01)
-                status = "Links"
-                left, right, gruen = read_sensors()
-                check_green_and_react(left, right, gruen)
-                endzone(left, right)
-                
-
-        # Endzone-Check auch außerhalb der while-Schleifen (für den Fall: beide Sensoren weiß)
-        endzone(left, right)
-        
-        
-        forward(BASE_SPEED)
-        
-        
-        print(f"L: {left:4d} | R: {right:4d} ")
+    scheduler.reset()
+    profiling.reset()
+    _start_run()
+    telemetry.start(_run_path("telemetry"))
+    inputs_path = _run_path("inputs")
+    inputs = InputRecorder(InputLog(inputs_path)).attach(sys.modules[__name__]) if inputs_path else None
+    try:
+        scheduler.run(_line_step, schalterGedrueckt)
+    finally:
+        stop()
+        maneuvers.cancel()
+        telemetry.stop()
+        if inputs is not None:
+            inputs.close()
+    print(scheduler.summary())
+    print(f"PWM-Schreibzugriffe: {stats()}")
+    rates = sensors.ultrasonic_rates()
+    if any(r["samples"] for r in rates.values()):
+        print("Ultraschall: " + " | ".join(f"{name} {r['hz']:.0f} Hz ({r['timeouts']} Timeouts)"
+                                          for name, r in rates.items()))
+    if telemetry.path:
+        print(f"Telemetrie: {telemetry.path} ({telemetry.count} Ticks, verworfen: {telemetry.dropped})")
+    if inputs is not None:
+        print(f"Eingänge: {inputs_path} ({inputs.log.count} Einträge)")
+    if profiling.ENABLED:
+        print(profiling.summary())
+        profile_path = _run_path("profile", ".json")
+        if profile_path:
+            profiling.save(profile_path)
+            print(f"Profil: {profile_path}")
 
-def check_Hindernis():
-    USvorne, USrechts = sensors.read_ultrasonics()
-    left, right, gruen = read_sensors()
-    if USvorne is not None and USvorne < 10:
+def read_ultrasonics_filtered(now):
+    """Gibt neue Messungen des Samplers in die Filter und liefert die
+    gefilterten Entfernungen (vorne, rechts); None, wenn veraltet."""
+    global _us_t
+    d1, d2, age = sensors.latest_ultrasonics()
+    if age is None or age > US_MAX_AGE:
+        return None, None
+    t = now - age
+    if _us_t is None or t - _us_t > 0.001:   # neue Messung
+        _us_t = t
+        us_vorne.update(d1, t)
+        us_rechts.update(d2, t)
+    return us_vorne.distance, us_rechts.distance
+
+def obstacle_ahead(front):
+    """True, wenn `front` (SonarFilter) OBSTACLE_CM erreicht hat oder es
+    bei der aktuellen Annäherung innerhalb von OBSTACLE_LOOKAHEAD tut."""
+    t = front.time_to(OBSTACLE_CM)
+    return t is not None and t <= OBSTACLE_LOOKAHEAD
+
+@profiling.timed("check_Hindernis")
+def check_Hindernis(frame):
+    """Startet das Umfahr-Manöver, wenn vorne ein Hindernis erkannt wird."""
+    if frame.us_front is not None and not maneuvers.active and obstacle_ahead(us_vorne):
         print(f"---Hindernis erkannt!---")
-        turn_left(50)
-        time.sleep(0.3)
-        forward(20)
-        time.sleep(0.8)
-        stop()
-        time.sleep(0.5)
-        speedcontrol(60, 13)
-        while True:
-            left, right, gruen = read_sensors()
-            time.sleep(0.1)
-            if left:
-                turn_left(40)
-                time.sleep(0.5)
-                if right or not schalterGedrueckt():
-                    turn_right(40)
-                    time.sleep(0.1)
-                    break
-
-def checkRot():
-    left, right, gruen = read_sensors()
-    if not left and not right and not gruen:
+        maneuvers.start(maneuver.obstacle_bypass(), frame.t)
+
+def checkRot(frame):
+    if not frame.left and not frame.right and not frame.gruen:
         print("Rot erkannt: Programmabbruch!")
         stop()
         sys.exit(0)
@@ -209,6 +413,10 @@ def checkRot():
 
 def main():
     try:
+        init()
+        if _acq is None:
+            sensors.start_sampler(max_age=US_MAX_AGE)
+        print(lifecycle.report())
         print("Bereit. Schalter drücken zum Starten...")
         
         while True:
@@ -230,7 +438,18 @@ def main():
             stop()
         except:
             pass
-        cleanup()
+        shutdown()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # runtime importiert "main"; ohne Alias würde main.py ein zweites Mal
+    # geladen (eigene Einstellungen, Subsysteme, Recorder)
+    sys.modules.setdefault("main", sys.modules[__name__])
+    if '--pid' in sys.argv:
+        LINE_MODE = "pid"
+    if '--process' in sys.argv:
+        ACQUISITION = "process"
+    if '--async' in sys.argv:
+        import runtime
+        runtime.run(line_mode=LINE_MODE, acquisition=ACQUISITION)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Nicht-blockierende Manöver (Grün-Abbiegen, Hindernis umfahren).
+
+Ein Manöver ist eine Folge von `Step`s. Jeder Step setzt beim Betreten
+die Motoren (links, rechts) und endet, wenn
+  - seine Bedingung `until(state)` erfüllt ist (frühestens nach `min_time`)
+  - oder spätestens nach `duration` Sekunden.
+Mit `shared=True` zählen `duration` und `min_time` ab dem Beginn des
+vorigen Steps: beide teilen sich ein Zeitbudget.
+
+`state` ist ein beliebiges Objekt mit den Attributen left, right, gruen,
+us_front und pressed (z.B. runtime.RobotState oder frame.SensorFrame).
+
+Der `ManeuverExecutor` wird aus der Regelschleife mit `tick(now, state)`
+aufgerufen und blockiert nie; Drehungen enden so, sobald die Linie wieder
+gefunden ist, statt nach der festen Worst-Case-Zeit.
+"""
+
+
+class Step:
+    __slots__ = ("left", "right", "duration", "until", "min_time", "on_enter", "shared")
+
+    def __init__(self, left, right, duration, until=None, min_time=0.0, on_enter=None, shared=False):
+        self.left = left
+        self.right = right
+        self.duration = duration
+        self.until = until
+        self.min_time = min_time
+        self.on_enter = on_enter
+        self.shared = shared
+
+
+class Maneuver:
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = list(steps)
+
+
+class ManeuverExecutor:
+    """Führt immer höchstens ein Manöver aus.
+
+    Args:
+        drive: Funktion (links, rechts), z.B. motor.speedcontrol
+    """
+
+    def __init__(self, drive):
+        self.drive = drive
+        self.maneuver = None
+        self.setpoint = (0, 0)   # zuletzt gesetzte Motorwerte (links, rechts)
+        self._index = 0
+        self._t_step = 0.0
+        self._t_start = 0.0
+        self.completed = 0
+        self.early_exits = 0     # Steps, die per Bedingung vorzeitig endeten
+        self.saved_time = 0.0    # dadurch eingesparte Zeit in s
+
+    @property
+    def active(self):
+        return self.maneuver is not None
+
+    @property
+    def name(self):
+        return self.maneuver.name if self.maneuver is not None else None
+
+    def start(self, maneuver, now):
+        self.maneuver = maneuver
+        self._t_start = now
+        self._enter(0, now)
+
+    def cancel(self):
+        self.maneuver = None
+
+    def _enter(self, index, now):
+        self._index = index
+        step = self.maneuver.steps[index]
+        if not step.shared:
+            self._t_step = now
+        if step.on_enter is not None:
+            step.on_enter()
+        self.setpoint = (step.left, step.right)
+        self.drive(step.left, step.right)
+
+    def tick(self, now, state):
+        """Schaltet ggf. zum nächsten Step; True solange das Manöver läuft."""
+        if self.maneuver is None:
+            return False
+        while True:
+            steps = self.maneuver.steps
+            step = steps[self._index]
+            last = self._index + 1 >= len(steps)
+            elapsed = now - self._t_step
+            if elapsed >= step.duration:
+                pass
+            elif step.until is not None and elapsed >= step.min_time and step.until(state):
+                self.early_exits += 1
+                if last or not steps[self._index + 1].shared:   # geteiltes Budget nur einmal
+                    self.saved_time += step.duration - elapsed
+            else:
+                return True
+            if last:
+                self.maneuver = None
+                self.completed += 1
+                return False
+            # Folgestep beginnt zum tatsächlichen Ende des vorigen
+            self._enter(self._index + 1, min(now, self._t_step + step.duration))
+
+
+# --- Bedingungen ---
+
+def line_found(state):
+    return bool(state.left or state.right)
+
+def line_lost(state):
+    return not line_found(state)
+
+def right_found(state):
+    return bool(state.right)
+
+def left_found(state):
+    return bool(state.left)
+
+def released(state):
+    return not state.pressed
+
+
+# --- Manöver-Fabriken (Parameter wie in main.py) ---
+
+def green_turn(left, right, turn_speed, base_speed, quarter_time, half_time, on_enter=None):
+    """Grün-Abbiegen: drehen, bis die alte Linie unter beiden Sensoren weg
+    ist, dann weiterdrehen, bis die neue Linie unter einem Sensor ist. Beide
+    Stufen zusammen dauern höchstens die alte feste Drehzeit; die 180°-Drehung
+    nimmt erst nach 70 % davon eine Linie an (nicht den Querast einer Kreuzung)."""
+    approach = Step(base_speed, base_speed, 0.01, on_enter=on_enter)
+    if right and not left:
+        name = "Gruen rechts"
+        l, r, limit, min_time = turn_speed, -turn_speed, quarter_time + 0.2, 0.0
+    elif left and not right:
+        name = "Gruen links"
+        l, r, limit, min_time = -turn_speed, turn_speed, quarter_time, 0.0
+    else:
+        name = "Gruen 180"
+        l, r, limit, min_time = turn_speed, -turn_speed, half_time, 0.7 * half_time
+    return Maneuver(name, [approach, Step(l, r, limit, line_lost),
+                           Step(l, r, limit, line_found, min_time=min_time, shared=True)])
+
+
+def obstacle_bypass(max_arc=10.0):
+    """Hindernis links umfahren und zur Linie zurückkehren."""
+    return Maneuver("Hindernis", [
+        Step(-50, 50, 0.3),                       # nach links wegdrehen
+        Step(20, 20, 0.8),                        # vorbei
+        Step(0, 0, 0.5),                          # stehen
+        Step(60, 13, max_arc, left_found),        # Bogen bis Linie links
+        Step(-40, 40, 0.5, right_found, min_time=0.1),  # auf Linie eindrehen
+        Step(40, -40, 0.1),                       # kurz gegenlenken
+    ])
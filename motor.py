@@ -7,47 +7,93 @@ Use `forward(speed)`, `backward(speed)`, `turn_left(speed)`,
 Speeds are in range 0..100 (percent). Negative values work for
 `set_wheel` but the convenience functions accept positive speeds.
 """
+import lifecycle
 from setup import setup_motor
 
-# create controller on import; you can override by calling
-# `setup_motor` yourself with custom pin defaults or pwm_freq.
-controller = setup_motor()
+__all__ = ['WHEELS', 'set_wheel', 'forward', 'backward', 'turn_right', 'turn_left',
+	'speedcontrol', 'stop', 'stats', 'cleanup']
+
+# The controller (and its PWM threads) is created on first use or by an
+# explicit `init()`, which also takes custom pin defaults, pwm_freq or
+# backend. The PWM backend can also be chosen with MOTOR_BACKEND=rpi|pigpio|memory.
+controller = None
+_options = {}
+
+def _setup():
+	global controller
+	controller = setup_motor(**_options)
+
+def _teardown():
+	global controller
+	controller.cleanup()
+	controller = None
+
+_hw = lifecycle.Subsystem('motor', _setup, _teardown)
+
+def init(pwm_freq=None, defaults=None, backend=None):
+	"""Create the controller if needed (idempotent) and return it.
+
+	Options only take effect on the first call after a `shutdown()`.
+	"""
+	if not _hw.ready:
+		if pwm_freq is not None:
+			_options['pwm_freq'] = pwm_freq
+		if defaults is not None:
+			_options['defaults'] = defaults
+		if backend is not None:
+			_options['backend'] = backend
+		_hw.init()
+	return controller
+
+def shutdown():
+	"""Stop the motors and release the PWM backend (idempotent)."""
+	_hw.shutdown()
+
+def _ctrl():
+	return controller if controller is not None else init()
 
 WHEELS = ['VR', 'HR', 'VL', 'HL']
 
 def set_wheel(wheel, speed):
-	controller.set_wheel(wheel, speed)
+	_ctrl().set_wheel(wheel, speed)
 
 def forward(speed=80):
-	for w in WHEELS:
-		controller.set_wheel(w, speed)
+	_ctrl().apply(speed, speed, speed, speed)
 
 def backward(speed=80):
-	for w in WHEELS:
-		controller.set_wheel(w, -speed)
+	_ctrl().apply(-speed, -speed, -speed, -speed)
 
 def turn_right(speed=60):
 	# right side reverse, left side forward -> turn right (clockwise)
-	controller.set_wheel('VR', -speed)
-	controller.set_wheel('HR', -speed)
-	controller.set_wheel('VL', speed)
-	controller.set_wheel('HL', speed)
+	_ctrl().apply(speed, speed, -speed, -speed)
 
 def turn_left(speed=60):
 	# left side reverse, right side forward -> turn left (counter-clockwise)
-	controller.set_wheel('VR', speed)
-	controller.set_wheel('HR', speed)
-	controller.set_wheel('VL', -speed)
-	controller.set_wheel('HL', -speed)
+	_ctrl().apply(-speed, -speed, speed, speed)
 
 def speedcontrol(speedl, speedr):
-	controller.set_wheel('VR', speedr)
-	controller.set_wheel('HR', speedr)
-	controller.set_wheel('VL', speedl)
-	controller.set_wheel('HL', speedl)
+	_ctrl().apply(speedl, speedl, speedr, speedr)
 
 def stop():
-	controller.stop()
+	# nothing to stop if the motors were never started
+	if controller is not None:
+		controller.stop()
+
+def halt():
+	"""Emergency stop that stays in effect until `resume()`; later speed
+	commands are ignored (see MotorController.halt)."""
+	if controller is not None:
+		controller.halt()
+
+def resume():
+	if controller is not None:
+		controller.resume()
+
+def stats():
+	"""PWM writes done / skipped because the duty cycle was unchanged."""
+	if controller is None:
+		return {}
+	return controller.stats()
 
 def cleanup():
-	controller.cleanup()
+	shutdown()
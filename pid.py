@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""PID-Linienregelung mit abgestuftem Fehlersignal.
+
+Statt drei fester Zustände (geradeaus / links / rechts) berechnet ein
+Fehlerschätzer die Lage der Linie als Wert in [-1, 1] (negativ = Linie
+links, positiv = Linie rechts), und ein PID-Regler mit Vorsteuerung macht
+daraus die Motorwerte (links, rechts):
+
+    BinaryLineError   zwei binäre Pins (ESP32): Zeit seit dem letzten
+                      Wechsel macht den Fehler stufenlos
+    AnalogLineError   analoge Werte (ESP32-Reflexion per UART oder die
+                      Klar-Frequenz der Farbsensoren)
+    PID               mit Anti-Windup (Begrenzung + bedingte Integration)
+                      und gefiltertem D-Anteil
+    GainTable         Reglerparameter pro Grundgeschwindigkeit, linear
+                      interpoliert
+    LineController    Grundgeschwindigkeit (Vorsteuerung) + PID-Korrektur
+
+    error = BinaryLineError(ramp=0.15)
+    ctrl = LineController(GainTable({20: (30, 0, 1.5), 40: (45, 2, 2.5)}), 30)
+    left, right = ctrl.update(error.update(l, r, now), now)
+"""
+
+
+def _clamp(value, limit):
+    return limit if value > limit else -limit if value < -limit else value
+
+
+class BinaryLineError:
+    """Abgestufter Fehler aus zwei binären Liniensensoren.
+
+    Beide auf der Linie -> 0. Verlässt ein Sensor die Linie, springt der
+    Fehler auf ±`step` und wächst in `ramp` Sekunden auf ±1: je länger nur
+    ein Sensor die Linie sieht, desto weiter ist der Roboter abgedriftet.
+    Beide weiß nach einseitiger Lage -> ±1 (zur Seite verloren); beide weiß
+    direkt aus der Mitte (Lücke) -> 0, also geradeaus weiter.
+    """
+
+    def __init__(self, step=0.3, ramp=0.15):
+        self.step = step
+        self.ramp = ramp
+        self.reset()
+
+    def reset(self):
+        self.error = 0.0
+        self._side = 0          # -1 Linie links, +1 rechts, 0 mittig/unbekannt
+        self._t_side = 0.0      # seit wann nur ein Sensor auf der Linie ist
+        self._lost = False
+
+    def update(self, left, right, now):
+        if left and right:
+            self._side = 0
+            self._lost = False
+            self.error = 0.0
+        elif left or right:
+            side = -1 if left else 1
+            if side != self._side or self._lost:
+                self._side = side
+                self._t_side = now
+            self._lost = False
+            grow = min(1.0, (now - self._t_side) / self.ramp) if self.ramp > 0 else 1.0
+            self.error = side * (self.step + (1.0 - self.step) * grow)
+        else:
+            self._lost = True
+            self.error = float(self._side)
+        return self.error
+
+
+class AnalogLineError:
+    """Fehler aus zwei analogen Helligkeitswerten.
+
+    `white`/`black` sind die Rohwerte auf Weiß bzw. Schwarz (kalibrieren).
+    Dunkelheit d = (white - v) / (white - black) in [0, 1]; Fehler =
+    (d_rechts - d_links) / (d_links + d_rechts). Sind beide Seiten heller
+    als `lost`, gilt die Linie als verloren (wie bei BinaryLineError).
+    """
+
+    def __init__(self, white, black, lost=0.15):
+        self.white = white
+        self.black = black
+        self.lost = lost
+        self.reset()
+
+    def reset(self):
+        self.error = 0.0
+        self._side = 0.0
+
+    def _darkness(self, value):
+        d = (self.white - value) / (self.white - self.black)
+        return 0.0 if d < 0.0 else 1.0 if d > 1.0 else d
+
+    def update(self, left, right, now=None):
+        dl = self._darkness(left)
+        dr = self._darkness(right)
+        if dl < self.lost and dr < self.lost:
+            self.error = self._side
+            return self.error
+        self.error = (dr - dl) / (dl + dr)
+        # Seite nur merken, wenn die Linie klar außermittig liegt
+        self._side = 0.0 if abs(self.error) < 0.5 else (1.0 if self.error > 0 else -1.0)
+        return self.error
+
+
+class PID:
+    """PID-Regler mit Anti-Windup.
+
+    Der I-Anteil wird als Summe von ki·e·dt geführt (Verstärkungswechsel
+    ändern die Ausgabe nicht sprunghaft), auf ±`i_limit` begrenzt und nur
+    weiter aufintegriert, wenn die Ausgabe nicht schon in derselben
+    Richtung an `limit` anliegt. Der D-Anteil ist mit `d_filter`
+    (0 = ungefiltert, 0.9 = stark) tiefpassgefiltert.
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, limit=100.0, i_limit=None, d_filter=0.5):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.limit = limit
+        self.i_limit = limit if i_limit is None else i_limit
+        self.d_filter = d_filter
+        self.saturated = 0       # Ticks mit begrenzter Ausgabe
+        self.reset()
+
+    def set_gains(self, kp, ki, kd):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+
+    def reset(self):
+        self.integral = 0.0
+        self.output = 0.0
+        self._d = 0.0
+        self._prev = None
+        self._t = None
+
+    def update(self, error, now):
+        dt = 0.0 if self._t is None else now - self._t
+        self._t = now
+        if dt > 0.0 and self._prev is not None:
+            raw = (error - self._prev) / dt
+            self._d = self.d_filter * self._d + (1.0 - self.d_filter) * raw
+        self._prev = error
+
+        integral = _clamp(self.integral + self.ki * error * dt, self.i_limit)
+        out = self.kp * error + integral + self.kd * self._d
+        if -self.limit <= out <= self.limit:
+            self.integral = integral
+        else:
+            # nur integrieren, wenn es aus der Begrenzung herausführt
+            if (out > 0) != (error > 0):
+                self.integral = integral
+            out = _clamp(out, self.limit)
+            self.saturated += 1
+        self.output = out
+        return out
+
+
+class GainTable:
+    """(kp, ki, kd) pro Grundgeschwindigkeit, dazwischen linear interpoliert.
+
+    Args:
+        table: {geschwindigkeit: (kp, ki, kd)}
+    """
+
+    def __init__(self, table):
+        if not table:
+            raise ValueError("Tabelle darf nicht leer sein")
+        self._speeds = sorted(table)
+        self._gains = [tuple(table[s]) for s in self._speeds]
+
+    def __call__(self, speed):
+        speeds = self._speeds
+        if speed <= speeds[0]:
+            return self._gains[0]
+        if speed >= speeds[-1]:
+            return self._gains[-1]
+        i = 1
+        while speeds[i] < speed:
+            i += 1
+        s0, s1 = speeds[i - 1], speeds[i]
+        a = (speed - s0) / (s1 - s0)
+        return tuple(g0 + (g1 - g0) * a for g0, g1 in zip(self._gains[i - 1], self._gains[i]))
+
+
+class LineController:
+    """Grundgeschwindigkeit als Vorsteuerung plus PID-Korrektur.
+
+    links = v + u, rechts = v - u mit u = PID(Fehler) und
+    v = base_speed · (1 - slowdown·|Fehler|) (in Kurven langsamer).
+    Ausgabe sind ganze Prozentwerte, damit der Motor-Cache greift.
+    """
+
+    def __init__(self, gains, base_speed, max_speed=100, slowdown=0.0, i_limit=20.0, d_filter=0.5):
+        self.gains = gains
+        self.max_speed = max_speed
+        self.slowdown = slowdown
+        self.pid = PID(*gains(base_speed), limit=2 * max_speed, i_limit=i_limit, d_filter=d_filter)
+        self.set_speed(base_speed)
+
+    def set_speed(self, base_speed):
+        self.base_speed = base_speed
+        self.pid.set_gains(*self.gains(base_speed))
+
+    def reset(self):
+        self.pid.reset()
+
+    def update(self, error, now):
+        u = self.pid.update(error, now)
+        v = self.base_speed * (1.0 - self.slowdown * abs(error))
+        m = self.max_speed
+        return int(round(_clamp(v + u, m))), int(round(_clamp(v - u, m)))
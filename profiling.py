@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Latenz-Histogramme für die Hot-Paths der Regelschleife.
+
+Eingeschaltet mit der Umgebungsvariable ROBOT_PROFILE=1 (wird beim Import
+gelesen). Ausgeschaltet gibt `timed()` die Funktion unverändert zurück und
+`stage()` einen leeren Kontextmanager, es kostet also nichts bzw. einen
+with-Block.
+
+    @profiling.timed("read_sensors")
+    def read_sensors(): ...
+
+    with profiling.stage("maneuver"):
+        ...
+
+Jede Stufe schreibt in ein vorab angelegtes Histogramm mit logarithmisch-
+linearen Buckets (wie HdrHistogram: 2**(SUB_BITS-1) Buckets pro
+Zweierpotenz, ~3 % Auflösung, 1 ns bis ~18 min); `record()` alloziert
+nichts. `summary()` zeigt p50/p99/max pro Stufe.
+
+    ROBOT_PROFILE=1 python main.py         # Ausgabe nach jeder Fahrt
+    python profiling.py --seconds 20       # feste Simulationsfahrt
+    python profiling.py --cprofile run.prof --stacks run.folded
+    python profiling.py show runs/profile-*.json
+
+`--stacks` schreibt abgetastete Aufrufstapel im "collapsed"-Format für
+flamegraph.pl bzw. speedscope.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+
+ENABLED = os.environ.get("ROBOT_PROFILE", "") not in ("", "0")
+
+SUB_BITS = 6          # 64 Buckets unter 64 ns, danach 32 pro Zweierpotenz
+MAX_BITS = 40         # größter auflösbarer Wert 2**40 ns; darüber letzter Bucket
+
+# echte Uhr auch dann, wenn die Simulation time.* später ersetzt
+_clock = time.perf_counter_ns
+_sleep = time.sleep
+
+_histograms = {}
+
+
+class Histogram:
+    """Log-lineares Latenz-Histogramm (Werte in ns)."""
+
+    def __init__(self, name, sub_bits=SUB_BITS, max_bits=MAX_BITS):
+        self.name = name
+        self._sub_bits = sub_bits
+        self._sub = 1 << sub_bits
+        self._half = self._sub >> 1
+        self._size = self._sub + (max_bits - sub_bits) * self._half
+        self.counts = array("Q", bytes(8 * self._size))
+        self.reset()
+
+    def reset(self):
+        for i in range(self._size):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < self._sub:
+            return value if value > 0 else 0
+        shift = value.bit_length() - self._sub_bits
+        i = self._sub + (shift - 1) * self._half + (value >> shift) - self._half
+        return i if i < self._size else self._size - 1
+
+    def _bounds(self, i):
+        """[untere, obere) Grenze von Bucket i in ns."""
+        if i < self._sub:
+            return i, i + 1
+        shift = (i - self._sub) // self._half + 1
+        low = ((i - self._sub) % self._half + self._half) << shift
+        return low, low + (1 << shift)
+
+    def record(self, value):
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """Wert in ns, unter dem der Anteil `q` der Messungen liegt (Bucketmitte)."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                low, high = self._bounds(i)
+                return min((low + high) // 2, self.max)
+        return self.max
+
+    def report(self):
+        """Statistik in µs."""
+        return {
+            "n": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(0.50) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max / 1e3,
+            "total_ms": self.total / 1e6,
+        }
+
+    def to_dict(self):
+        """Nur belegte Buckets, für JSON."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {i: n for i, n in enumerate(self.counts) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, name, d):
+        h = cls(name)
+        for i, n in d["buckets"].items():
+            h.counts[int(i)] = n
+        h.count = d["count"]
+        h.total = d["total"]
+        h.max = d["max"]
+        return h
+
+
+def histogram(name):
+    """Histogramm der Stufe `name` (wird beim ersten Aufruf angelegt)."""
+    h = _histograms.get(name)
+    if h is None:
+        h = _histograms[name] = Histogram(name)
+    return h
+
+
+def timed(name):
+    """Dekorator: misst jeden Aufruf der Funktion als Stufe `name`."""
+    if not ENABLED:
+        return lambda fn: fn
+
+    record = histogram(name).record
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = _clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(_clock() - t0)
+        return wrapper
+    return decorate
+
+
+class _Stage:
+    __slots__ = ("_record", "_t0")
+
+    def __init__(self, record):
+        self._record = record
+        self._t0 = 0
+
+    def __enter__(self):
+        self._t0 = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        self._record(_clock() - self._t0)
+        return False
+
+
+_NULL = nullcontext()
+
+
+def stage(name):
+    """Kontextmanager: misst den with-Block als Stufe `name`."""
+    if not ENABLED:
+        return _NULL
+    return _Stage(histogram(name).record)
+
+
+def reset():
+    for h in _histograms.values():
+        h.reset()
+
+
+def report(histograms=None):
+    hs = _histograms if histograms is None else histograms
+    return {name: h.report() for name, h in hs.items() if h.count}
+
+
+def summary(histograms=None):
+    r = report(histograms)
+    if not r:
+        return "Profil: keine Messungen" + ("" if ENABLED else " (ROBOT_PROFILE nicht gesetzt)")
+    lines = ["Profil (µs):"]
+    for name, s in sorted(r.items(), key=lambda kv: -kv[1]["total_ms"]):
+        lines.append(f"  {name:18s} n {s['n']:7d} | p50 {s['p50_us']:9.1f} | p99 {s['p99_us']:9.1f} | "
+                     f"max {s['max_us']:9.1f} | gesamt {s['total_ms']:8.1f} ms")
+    return "\n".join(lines)
+
+
+def save(path):
+    with open(path, "w") as f:
+        json.dump({name: h.to_dict() for name, h in _histograms.items() if h.count}, f)
+
+
+def load(path):
+    with open(path) as f:
+        return {name: Histogram.from_dict(name, d) for name, d in json.load(f).items()}
+
+
+class StackSampler:
+    """Tastet den Aufrufstapel eines Threads periodisch ab und zählt die
+    Stapel im "collapsed"-Format (a;b;c n) für Flamegraphs."""
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                key = ";".join(reversed(names))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.samples += 1
+            _sleep(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for key, n in sorted(self.stacks.items()):
+                f.write(f"{key} {n}\n")
+
+
+def _capture(args):
+    """Feste Simulationsfahrt mit eingeschalteten Histogrammen."""
+    if "main" in sys.modules:
+        raise RuntimeError("profiling muss vor main importiert werden")
+    # als Skript ist dieses Modul __main__; main importiert es neu und
+    # liest dabei ROBOT_PROFILE
+    os.environ["ROBOT_PROFILE"] = "1"
+    import profiling
+    from sim.track import oval
+    from sim.world import Simulator
+
+    sim = Simulator(oval(), cpu_scale=args.cpu_scale).install()
+    m = sim.attach()
+    if args.pid:
+        m.LINE_MODE = "pid"
+
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+    sampler = StackSampler().start() if args.stacks else None
+    profiling.reset()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = sim.run(laps=1 << 30, timeout=args.seconds)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+
+    print(f"{result['virtual_s']:.1f} s virtuell in {result['real_s']:.2f} s | "
+          f"{result['control']['ticks']} Ticks | Runden: {result['laps']}")
+    print(profiling.summary())
+    if args.save:
+        profiling.save(args.save)
+        print(f"Histogramme: {args.save}")
+    if profiler is not None:
+        import pstats
+        profiler.dump_stats(args.cprofile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+        print(f"cProfile: {args.cprofile}")
+    if sampler is not None:
+        sampler.write(args.stacks)
+        print(f"Stapel: {args.stacks} ({sampler.samples} Proben) -> flamegraph.pl {args.stacks} > run.svg")
+
+
+def main():
+    import argparse
+
+    if len(sys.argv) > 1 and sys.argv[1] == "show":
+        for path in sys.argv[2:]:
+            print(path)
+            print(summary(load(path)))
+        return
+
+    ap = argparse.ArgumentParser(description="Latenzprofil einer Simulationsfahrt fester Länge "
+                                             "(oder: profiling.py show DATEI.json ...)")
+    ap.add_argument("--seconds", type=float, default=20.0, help="virtuelle Fahrzeit")
+    ap.add_argument("--pid", action="store_true", help="PID-Linienregelung statt bang-bang")
+    ap.add_argument("--cpu-scale", type=float, default=0.0)
+    ap.add_argument("--save", metavar="JSON", help="Histogramme speichern")
+    ap.add_argument("--cprofile", metavar="PROF", help="cProfile-Statistik schreiben")
+    ap.add_argument("--stacks", metavar="FOLDED", help="abgetastete Stapel für Flamegraphs")
+    _capture(ap.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Binäres UART-Protokoll zwischen ESP32 und Pi.
+
+Ersetzt die Textzeilen ("b1 b2\\n") durch Frames fester Länge:
+
+    Offset  Typ        Inhalt
+    0       uint8      SYNC (0xAA)
+    1       uint8      Sequenznummer (0..255, läuft über)
+    2       2×uint16   analoge Reflexion links/rechts
+    6       8×uint16   Farbe links r,g,b,c + rechts r,g,b,c
+    22      uint8      Flags (siehe FLAG_*)
+    23      uint16     CRC-16/CCITT (Init 0xFFFF) über Byte 0..22
+
+Alle Werte little-endian. Der Parser arbeitet auf einem vorab angelegten
+Puffer und aktualisiert ein wiederverwendetes `LineFrame` in place; pro
+Frame werden keine Strings/bytes erzeugt.
+
+Bei 1 kHz Framerate sind 25 kB/s nötig -> mindestens 460800 Baud.
+"""
+import binascii
+import os
+import struct
+import threading
+import time
+
+SYNC = 0xAA
+BAUDRATE = 460800
+
+FLAG_LEFT = 0x01      # Linie unter linkem Sensor
+FLAG_RIGHT = 0x02     # Linie unter rechtem Sensor
+FLAG_GREEN_L = 0x04
+FLAG_GREEN_R = 0x08
+FLAG_RED = 0x10
+
+_BODY = struct.Struct("<BB2H8HB")
+_CRC = struct.Struct("<H")
+FRAME_SIZE = _BODY.size + _CRC.size   # 25 Bytes
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (binascii.crc_hqx läuft in C)."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def encode(seq, reflect=(0, 0), colour=(0,) * 8, flags=0):
+    """Baut einen Frame (Gegenstück zur ESP32-Firmware, für Tests)."""
+    body = _BODY.pack(SYNC, seq & 0xFF, *reflect, *colour, flags)
+    return body + _CRC.pack(crc16(body))
+
+
+class LineFrame:
+    """Zuletzt dekodierter Frame (wird vom Parser in place überschrieben)."""
+    __slots__ = ("seq", "reflect", "colour", "flags", "t_ns")
+
+    def __init__(self):
+        self.seq = 0
+        self.reflect = [0, 0]
+        self.colour = [0] * 8
+        self.flags = 0
+        self.t_ns = 0
+
+    @property
+    def left(self):
+        return 1 if self.flags & FLAG_LEFT else 0
+
+    @property
+    def right(self):
+        return 1 if self.flags & FLAG_RIGHT else 0
+
+    @property
+    def green(self):
+        return 1 if self.flags & (FLAG_GREEN_L | FLAG_GREEN_R) else 0
+
+
+class FrameParser:
+    """Zustandsbehafteter Parser für den Bytestrom vom ESP32.
+
+    Statistik: frames (gültig), crc_errors, discarded (Bytes beim
+    Resynchronisieren verworfen), dropped (per Sequenzlücke verlorene Frames).
+    """
+
+    def __init__(self, bufsize=4096, on_frame=None, clock=time.monotonic_ns):
+        self._buf = bytearray(bufsize)
+        self._mv = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self._clock = clock
+        self.on_frame = on_frame
+        self.frame = LineFrame()
+        self.frames = 0
+        self.crc_errors = 0
+        self.discarded = 0
+        self.dropped = 0
+        self._last_seq = None
+
+    def _compact(self):
+        n = self._end - self._start
+        if self._start:
+            self._buf[0:n] = self._mv[self._start:self._end]
+        self._start = 0
+        self._end = n
+
+    def feed(self, data):
+        """Hängt `data` an und dekodiert alle vollständigen Frames."""
+        n = len(data)
+        if self._end + n > len(self._buf):
+            self._compact()
+            if n > len(self._buf) - self._end:
+                # Puffer übergelaufen: alten Rest verwerfen
+                self.discarded += self._end
+                self._start = self._end = 0
+                data = data[-len(self._buf):]
+                n = len(data)
+        self._mv[self._end:self._end + n] = data
+        self._end += n
+        return self._parse()
+
+    def read_from(self, fd):
+        """Liest direkt per os.readv in den freien Pufferteil (kein Zwischen-bytes)."""
+        if len(self._buf) - self._end < FRAME_SIZE:
+            self._compact()
+        n = os.readv(fd, [self._mv[self._end:]])
+        self._end += n
+        return self._parse()
+
+    def _parse(self):
+        buf = self._buf
+        count = 0
+        while self._end - self._start >= FRAME_SIZE:
+            s = self._start
+            if buf[s] != SYNC:
+                nxt = buf.find(SYNC, s + 1, self._end)
+                if nxt < 0:
+                    nxt = self._end
+                self.discarded += nxt - s
+                self._start = nxt
+                continue
+            body_end = s + _BODY.size
+            if crc16(self._mv[s:body_end]) != _CRC.unpack_from(buf, body_end)[0]:
+                self.crc_errors += 1
+                self.discarded += 1
+                self._start = s + 1
+                continue
+            self._decode(s)
+            self._start = s + FRAME_SIZE
+            count += 1
+        if self._start == self._end:
+            self._start = self._end = 0
+        return count
+
+    def _decode(self, s):
+        v = _BODY.unpack_from(self._buf, s)
+        f = self.frame
+        seq = v[1]
+        if self._last_seq is not None:
+            gap = (seq - self._last_seq - 1) & 0xFF
+            self.dropped += gap
+        self._last_seq = seq
+        f.seq = seq
+        f.reflect[0] = v[2]
+        f.reflect[1] = v[3]
+        f.colour[:] = v[4:12]
+        f.flags = v[12]
+        f.t_ns = self._clock()
+        self.frames += 1
+        if self.on_frame is not None:
+            self.on_frame(f)
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "crc_errors": self.crc_errors,
+            "discarded": self.discarded,
+            "dropped": self.dropped,
+        }
+
+
+def open_serial(port="/dev/serial0", baudrate=BAUDRATE):
+    """Öffnet die UART mit pyserial und gibt das Serial-Objekt zurück."""
+    import serial
+    return serial.Serial(port=port, baudrate=baudrate, timeout=0.01)
+
+
+class Loopback:
+    """pty-Paar als Ersatz für ESP32 + UART zum Testen ohne Hardware.
+
+    Ein Sender-Thread schreibt Frames mit `hz` in den Master; gelesen wird
+    am Slave-fd (`fd`) wie von /dev/serial0. Mit `corrupt_every` wird jeder
+    n-te Frame beschädigt, mit `drop_every` ausgelassen.
+    """
+
+    def __init__(self, hz=1000, make_frame=None, corrupt_every=0, drop_every=0):
+        import tty
+        self.master, self.fd = os.openpty()
+        tty.setraw(self.fd)
+        self.hz = hz
+        self.make_frame = make_frame or (lambda seq: encode(seq, (seq, 1023 - seq % 1024), flags=seq & 0x03))
+        self.corrupt_every = corrupt_every
+        self.drop_every = drop_every
+        self.sent = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="uart-loopback", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        period = 1.0 / self.hz
+        deadline = time.perf_counter()
+        n = 0
+        while not self._stop.is_set():
+            frame = self.make_frame(n & 0xFF)
+            n += 1
+            if self.drop_every and n % self.drop_every == 0:
+                frame = b""
+            elif self.corrupt_every and n % self.corrupt_every == 0:
+                frame = frame[:-1] + bytes([frame[-1] ^ 0xFF])
+            if frame:
+                os.write(self.master, frame)
+                self.sent += 1
+            deadline += period
+            rest = deadline - time.perf_counter()
+            if rest > 0:
+                time.sleep(rest)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+        os.close(self.master)
+        os.close(self.fd)
+
+
+if __name__ == "__main__":
+    import select
+    loop = Loopback(hz=1000, corrupt_every=97, drop_every=113).start()
+    parser = FrameParser()
+    t_end = time.perf_counter() + 2.0
+    while time.perf_counter() < t_end:
+        r, _, _ = select.select([loop.fd], [], [], 0.1)
+        if r:
+            parser.read_from(loop.fd)
+    loop.close()
+    print(f"gesendet: {loop.sent} | {parser.stats()}")
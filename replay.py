@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Aufzeichnen und Wiedergeben der Eingänge der Regelschleife.
+
+Auf dem Roboter hängt `InputRecorder` sich vor die Eingänge von main
+(`read_sensors`, `sensors.latest_ultrasonics`, `schalterGedrueckt`) und
+hinter `motor.controller.apply` und schreibt jede Änderung mit Zeitstempel in
+ein memory-mapped Log (`InputLog`). Das Log ist nach jedem Datensatz
+gültig, auch wenn der Roboter mitten im Lauf abstürzt.
+
+Offline spielt `replay()` ein Log mit virtueller Uhr (sim.clock) und
+fakegpio durch die aktuelle `main.line_follow` ab, so schnell die CPU
+kann: Zu jedem Zeitpunkt liefern die Eingänge den zuletzt aufgezeichneten
+Wert (sample-and-hold). Danach werden die neuen Motorbefehle mit den
+aufgezeichneten verglichen (`diff`). Linienmodus und Geschwindigkeiten
+stehen im CONFIG-Satz am Anfang des Logs und werden vor der Wiedergabe
+gesetzt; `--pid`/`--speed` überschreiben sie (ältere Logs ohne CONFIG).
+
+    python replay.py runs/inputs-20260101-120000-042-1.bin [--verbose] [--json]
+
+Dateiformat (Little Endian):
+    Header  b"RCIN" | uint16 Version | uint16 Satzgröße | uint64 Anzahl
+    Sätze   float64 t | float32 f1, f2, f3 | uint8 kind, a, b, c
+            LINE   a,b,c = links, rechts, grün (255 = None)
+            SONAR  f1,f2 = vorne, rechts in cm (NaN = None), f3 = Alter in s
+            SWITCH a = gedrückt
+            MOTOR  f1,f2 = Sollwert links, rechts
+            END    Ende der Aufzeichnung
+            CONFIG a = Linienmodus (0 bang-bang, 1 PID),
+                   f1,f2 = BASE_SPEED, PID-Grundgeschwindigkeit
+"""
+import argparse
+import bisect
+import contextlib
+import io
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+import time
+
+MAGIC = b"RCIN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQ")
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = 8
+_REC = struct.Struct("<dfffBBBB")
+
+END, LINE, SONAR, SWITCH, MOTOR, CONFIG = range(6)
+KINDS = ("END", "LINE", "SONAR", "SWITCH", "MOTOR", "CONFIG")
+LINE_MODES = ("bangbang", "pid")
+
+NONE = 255
+NAN = float("nan")
+
+
+def _u8(value):
+    return NONE if value is None else int(value)
+
+def _opt(value):
+    return None if value == NONE else value
+
+def _optf(value):
+    return None if value != value else value
+
+
+class InputLog:
+    """Memory-mapped Log mit festen 24-Byte-Sätzen; wächst bei Bedarf."""
+
+    def __init__(self, path, capacity=1 << 16):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "x+b")   # nie eine frühere Fahrt überschreiben
+        self._file.truncate(_HEADER.size + capacity * _REC.size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, _REC.size, 0)
+
+    def _put(self, t, kind, f1=NAN, f2=NAN, f3=NAN, a=0, b=0, c=0):
+        with self._lock:
+            if self._mm is None:
+                return
+            if self.count == self.capacity:
+                self.capacity *= 2
+                self._mm.resize(_HEADER.size + self.capacity * _REC.size)
+            _REC.pack_into(self._mm, _HEADER.size + self.count * _REC.size, t, f1, f2, f3, kind, a, b, c)
+            self.count += 1
+            _COUNT.pack_into(self._mm, _COUNT_OFFSET, self.count)
+
+    def line(self, t, left, right, gruen):
+        self._put(t, LINE, a=_u8(left), b=_u8(right), c=_u8(gruen))
+
+    def sonar(self, t, front, right, age):
+        self._put(t, SONAR, NAN if front is None else front, NAN if right is None else right, age)
+
+    def switch(self, t, pressed):
+        self._put(t, SWITCH, a=1 if pressed else 0)
+
+    def motor(self, t, left, right):
+        self._put(t, MOTOR, left, right)
+
+    def config(self, t, line_mode, base_speed, pid_speed):
+        self._put(t, CONFIG, base_speed, pid_speed, a=LINE_MODES.index(line_mode))
+
+    def close(self, t=None):
+        """Schreibt den END-Satz und kürzt die Datei auf die belegte Länge."""
+        if self._mm is None:
+            return
+        self._put(time.monotonic() if t is None else t, END)
+        with self._lock:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+            self._file.truncate(_HEADER.size + self.count * _REC.size)
+            self._file.close()
+
+
+def load(path):
+    """Liest ein Log als NumPy-Record-Array (Felder t, f1, f2, f3, kind, a, b, c)."""
+    import numpy as np
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, size, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: kein Eingangs-Log")
+    if version != VERSION or size != _REC.size:
+        raise ValueError(f"{path}: Version {version} / Satzgröße {size} nicht unterstützt")
+    dtype = np.dtype([("t", "<f8"), ("f1", "<f4"), ("f2", "<f4"), ("f3", "<f4"),
+                      ("kind", "u1"), ("a", "u1"), ("b", "u1"), ("c", "u1")])
+    count = min(count, (len(data) - _HEADER.size) // size)
+    return np.frombuffer(data, dtype=dtype, count=count, offset=_HEADER.size)
+
+
+# --- Anschluss an main ---
+
+class _Hooks:
+    """Ersetzt Eingänge/Ausgang von main und stellt sie wieder her."""
+
+    def __init__(self):
+        self._robot = None
+        self._saved = None
+        self._controller = None
+
+    def _install(self, robot, read_sensors, latest_ultrasonics, schalter, apply):
+        import motor
+        self._robot = robot
+        self._controller = motor.init()
+        self._saved = (robot.read_sensors, robot.sensors.latest_ultrasonics, robot.schalterGedrueckt)
+        robot.read_sensors = read_sensors
+        robot.sensors.latest_ultrasonics = latest_ultrasonics
+        robot.schalterGedrueckt = schalter
+        self._controller.apply = apply
+
+    def detach(self):
+        robot = self._robot
+        if robot is None:
+            return
+        robot.read_sensors, robot.sensors.latest_ultrasonics, robot.schalterGedrueckt = self._saved
+        del self._controller.apply   # Instanz-Attribut -> wieder die Methode
+        self._robot = None
+
+
+class InputRecorder(_Hooks):
+    """Schreibt alle Eingänge und Motorbefehle von main in ein `InputLog`
+    (nur Änderungen; Ultraschall bei neuem Messwert)."""
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    def attach(self, robot):
+        import motor
+        log = self.log
+        clock = time.monotonic
+        read, latest, schalter = robot.read_sensors, robot.sensors.latest_ultrasonics, robot.schalterGedrueckt
+        apply = motor.init().apply
+        last = {"line": None, "sonar": None, "switch": None, "motor": None}
+        log.config(clock(), robot.LINE_MODE, robot.BASE_SPEED, robot.line_pid.base_speed)
+
+        def read_sensors():
+            value = read()
+            if value != last["line"]:
+                last["line"] = value
+                log.line(clock(), *value)
+            return value
+
+        def latest_ultrasonics():
+            front, right, age = value = latest()
+            prev = last["sonar"]
+            if prev is None or (front, right) != prev[:2] or age < prev[2]:
+                log.sonar(clock(), front, right, age)
+            last["sonar"] = value
+            return value
+
+        def schalterGedrueckt():
+            pressed = schalter()
+            if pressed != last["switch"]:
+                last["switch"] = pressed
+                log.switch(clock(), pressed)
+            return pressed
+
+        def apply_(VL, HL, VR, HR):
+            if (VL, VR) != last["motor"]:
+                last["motor"] = (VL, VR)
+                log.motor(clock(), VL, VR)
+            return apply(VL, HL, VR, HR)
+
+        self._install(robot, read_sensors, latest_ultrasonics, schalterGedrueckt, apply_)
+        return self
+
+    def close(self):
+        self.detach()
+        self.log.close()
+
+
+class Player(_Hooks):
+    """Liefert die Eingänge eines Logs zur (virtuellen) Zeit time.monotonic()
+    und sammelt die neuen Motorbefehle in `commands`."""
+
+    def __init__(self, records):
+        super().__init__()
+        kind = records["kind"]
+        t = records["t"]
+
+        def rows(k):
+            sel = records[kind == k]
+            return sel["t"].tolist(), sel
+
+        self._line_t, line = rows(LINE)
+        self._line = [(_opt(a), _opt(b), _opt(c)) for a, b, c in zip(line["a"].tolist(), line["b"].tolist(), line["c"].tolist())]
+        self._sonar_t, sonar = rows(SONAR)
+        self._sonar = [(_optf(f1), _optf(f2), t0 - age)
+                       for f1, f2, age, t0 in zip(sonar["f1"].tolist(), sonar["f2"].tolist(),
+                                                  sonar["f3"].tolist(), self._sonar_t)]
+        self._switch_t, sw = rows(SWITCH)
+        self._switch = [bool(a) for a in sw["a"].tolist()]
+        motor_t, motor = rows(MOTOR)
+        self.recorded = list(zip(motor_t, motor["f1"].tolist(), motor["f2"].tolist()))
+        _, config = rows(CONFIG)
+        self.config = None
+        if len(config):
+            c = config[0]
+            self.config = {"line_mode": LINE_MODES[int(c["a"])],
+                           "base_speed": int(c["f1"]), "pid_speed": int(c["f2"])}
+        self.t_start = float(t[0]) if len(t) else 0.0
+        self.t_end = float(t[-1]) if len(t) else 0.0
+        self.commands = []
+
+    @staticmethod
+    def _at(times, values, now, default):
+        i = bisect.bisect_right(times, now) - 1
+        return values[i] if i >= 0 else default
+
+    def attach(self, robot):
+        clock = time.monotonic
+        commands = self.commands
+
+        def read_sensors():
+            return self._at(self._line_t, self._line, clock(), (None, None, None))
+
+        def latest_ultrasonics():
+            now = clock()
+            front, right, t_meas = self._at(self._sonar_t, self._sonar, now, (None, None, now))
+            return front, right, now - t_meas
+
+        def schalterGedrueckt():
+            now = clock()
+            return now < self.t_end and self._at(self._switch_t, self._switch, now, False)
+
+        def apply(VL, HL, VR, HR):
+            if not commands or commands[-1][1:] != (VL, VR):
+                commands.append((clock(), VL, VR))
+
+        self._install(robot, read_sensors, latest_ultrasonics, schalterGedrueckt, apply)
+        return self
+
+
+# --- Vergleich ---
+
+def diff(recorded, replayed, t_end, tolerance=0.02):
+    """Vergleicht zwei Folgen von Motorbefehlen (t, links, rechts).
+
+    Abweichungen kürzer als `tolerance` Sekunden (Tick-Phase) zählen nicht
+    als Divergenz, gehen aber in `mismatch_s` ein.
+    """
+    if not recorded:
+        return {"recorded": 0, "replayed": len(replayed), "mismatch_s": 0.0,
+                "mismatch_share": 0.0, "divergences": 0, "first": None}
+    t_start = recorded[0][0]
+    events = sorted([(t, 0, l, r) for t, l, r in recorded] + [(t, 1, l, r) for t, l, r in replayed])
+    current = [None, None]
+    mismatch = 0.0
+    divergences = 0
+    first = None
+    since = None          # Beginn der aktuellen Abweichung
+    prev_t = t_start
+    for t, src, l, r in events + [(t_end, None, None, None)]:
+        t = min(max(t, t_start), t_end)
+        if since is not None:
+            mismatch += t - prev_t
+        prev_t = t
+        if src is None:
+            break
+        current[src] = (l, r)
+        differs = current[0] != current[1]
+        if differs and since is None:
+            since = t
+        elif not differs and since is not None:
+            if t - since >= tolerance:
+                divergences += 1
+                if first is None:
+                    first = (since - t_start, t - since)
+            since = None
+    if since is not None and t_end - since >= tolerance:
+        divergences += 1
+        if first is None:
+            first = (since - t_start, t_end - since)
+    duration = t_end - t_start
+    return {
+        "recorded": len(recorded),
+        "replayed": len(replayed),
+        "duration_s": duration,
+        "mismatch_s": mismatch,
+        "mismatch_share": mismatch / duration if duration > 0 else 0.0,
+        "divergences": divergences,
+        "first": first,       # (Start relativ zum Log, Dauer) in s
+    }
+
+
+# --- Wiedergabe ---
+
+def replay(path, quiet=True, tolerance=0.02, seed=0, line_mode=None, speed=None):
+    """Spielt ein Log durch main.line_follow (virtuelle Zeit) und vergleicht.
+
+    Linienmodus und Geschwindigkeit kommen aus dem CONFIG-Satz des Logs;
+    `line_mode` ('bangbang'/'pid') und `speed` (Grundgeschwindigkeit des
+    Modus) überschreiben ihn.
+
+    main darf vorher nicht importiert sein: Scheduler und Schalter binden
+    die Zeitfunktionen beim Import.
+    """
+    import fakegpio
+    from sim.clock import VirtualClock, real_perf_counter
+
+    if "main" in sys.modules:
+        raise RuntimeError("replay() muss vor dem Import von main aufgerufen werden")
+    records = load(path)
+    player = Player(records)
+    fakegpio.reset()
+    fakegpio.install()
+    os.environ["MOTOR_BACKEND"] = "memory"
+    clock = VirtualClock(start_ns=int(player.t_start * 1e9)).install()
+    random.seed(seed)
+    import main
+    main.TELEMETRY_DIR = None
+    config = player.config or {}
+    main.LINE_MODE = line_mode or config.get("line_mode", main.LINE_MODE)
+    main.BASE_SPEED = config.get("base_speed", main.BASE_SPEED)
+    main.line_pid.set_speed(config.get("pid_speed", main.line_pid.base_speed))
+    if speed is not None:
+        if main.LINE_MODE == "pid":
+            main.line_pid.set_speed(speed)
+        else:
+            main.BASE_SPEED = speed
+    player.attach(main)
+    out = io.StringIO()
+    real0 = real_perf_counter()
+    try:
+        with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+            main.line_follow()
+    finally:
+        player.detach()
+        clock.uninstall()
+    real = real_perf_counter() - real0
+    result = diff(player.recorded, player.commands, player.t_end, tolerance)
+    result["real_s"] = real
+    result["speedup"] = result["duration_s"] / real if real > 0 and result["recorded"] else 0.0
+    result["line_mode"] = main.LINE_MODE
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Eingangs-Log durch die aktuelle Regelung abspielen")
+    ap.add_argument("log")
+    ap.add_argument("--tolerance", type=float, default=0.02, help="kürzere Abweichungen ignorieren (s)")
+    ap.add_argument("--verbose", action="store_true", help="Ausgaben von main anzeigen")
+    ap.add_argument("--pid", action="store_true", help="PID-Linienregelung (statt Modus aus dem Log)")
+    ap.add_argument("--speed", type=int, help="Grundgeschwindigkeit (PID_SPEED bzw. BASE_SPEED)")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    result = replay(args.log, quiet=not args.verbose, tolerance=args.tolerance,
+                    line_mode="pid" if args.pid else None, speed=args.speed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{args.log}: {result['duration_s']:.2f} s in {result['real_s']:.2f} s "
+          f"-> {result['speedup']:.0f}x Echtzeit | Modus: {result['line_mode']}")
+    print(f"Motorbefehle: aufgezeichnet {result['recorded']} | neu {result['replayed']}")
+    print(f"Abweichung: {result['mismatch_s']:.3f} s ({result['mismatch_share'] * 100:.2f} %) | "
+          f"Divergenzen > {args.tolerance * 1e3:.0f} ms: {result['divergences']}")
+    if result["first"] is not None:
+        start, length = result["first"]
+        print(f"erste Divergenz bei {start:.3f} s für {length:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Asyncio-Laufzeit für den Linienverfolger.
+
+Statt einer blockierenden Schleife laufen Sensorik, Schalter, Telemetrie
+und Regelung als getrennte asyncio-Tasks, die sich ein `RobotState` teilen:
+
+    sonar_task      Ultraschall (Messung im Worker-Thread, SonarFilter)
+    line_task       ESP32-Linie/Grün per GPIO oder UART-Frames
+    switch_task     Schalter; beim Loslassen Manöver abbrechen + Stopp
+    telemetry_task  Statuszeile mit TELEMETRY_HZ
+    control_task    Regelung mit CONTROL_HZ, startet Manöver
+
+Manöver (Grün-Abbiegen, Hindernis, Endzone) sind Coroutinen und laufen als
+eigener Task; während einer 500-ms-Drehung laufen die Sensor-Tasks weiter.
+Grün-Abbiegen und Hindernis nutzen die Step-Folgen aus maneuver.py und
+enden vorzeitig, sobald die Linie wieder gefunden ist.
+
+Start: `python main.py --async` oder `python runtime.py [--uart /dev/serial0]`.
+"""
+import asyncio
+import sys
+import time
+
+import RPi.GPIO as GPIO
+
+import main as robot
+import maneuver
+import sensor as sensors
+from maneuver import ManeuverExecutor
+from pid import AnalogLineError, BinaryLineError, GainTable, LineController
+from motor import forward, speedcontrol, stop, turn_left
+
+CONTROL_HZ = robot.CONTROL_HZ
+LINE_HZ = 1000
+SWITCH_HZ = 200
+SONAR_PERIOD = 0.01
+TELEMETRY_HZ = 5
+
+# Rohwerte der ESP32-Reflexion auf Weiß/Schwarz (für den PID-Modus per UART)
+REFLECT_WHITE = 3500
+REFLECT_BLACK = 400
+
+
+class RobotState:
+    """Gemeinsamer Zustand aller Tasks (nur aus dem Event-Loop geschrieben)."""
+    __slots__ = ("left", "right", "gruen", "t_line", "us_front", "us_right",
+                 "t_us", "pressed", "status", "maneuver", "ticks", "late_max",
+                 "white_since", "reflect")
+
+    def __init__(self):
+        self.left = None
+        self.right = None
+        self.gruen = 0
+        self.t_line = 0.0
+        self.us_front = None
+        self.us_right = None
+        self.t_us = 0.0
+        self.pressed = False
+        self.status = "Warten"
+        self.maneuver = None      # laufender Manöver-Task
+        self.ticks = 0
+        self.late_max = 0.0       # größte Verspätung eines Regel-Ticks (s)
+        self.white_since = None
+        self.reflect = None       # (links, rechts) analog, nur per UART
+
+    def us_valid(self, now):
+        return now - self.t_us <= robot.US_MAX_AGE
+
+
+async def _periodic(hz, step):
+    """Ruft `step(verspaetung_s)` mit `hz` und absoluten Deadlines auf."""
+    loop = asyncio.get_running_loop()
+    period = 1.0 / hz
+    deadline = loop.time()
+    while True:
+        late = loop.time() - deadline
+        step(late)
+        deadline += period
+        now = loop.time()
+        if now > deadline:
+            deadline = now   # nicht nachholen
+        await asyncio.sleep(deadline - now)
+
+
+# --- Sensor-Tasks ---
+
+_sonar_front = sensors.SonarFilter(robot.US_WINDOW)
+_sonar_right = sensors.SonarFilter(robot.US_WINDOW)
+
+
+async def sonar_task(state):
+    while True:
+        t0 = time.monotonic()
+        if robot._acq is not None:   # misst der Erfassungsprozess, nur abholen
+            d1, d2, age = robot._acq.ultrasonics()
+            t = t0 - (age or 0.0)
+            if age is None or t - state.t_us <= 0.001:   # keine neue Messung
+                await asyncio.sleep(SONAR_PERIOD / 2)
+                continue
+        else:
+            d1, d2 = await asyncio.to_thread(sensors.read_ultrasonics)
+            t = time.monotonic()
+        state.us_front = _sonar_front.update(d1, t)
+        state.us_right = _sonar_right.update(d2, t)
+        state.t_us = t
+        rest = SONAR_PERIOD - (time.monotonic() - t0)
+        await asyncio.sleep(max(0.0, rest))
+
+
+async def line_task(state):
+    def step(late):
+        left, right, gruen = robot.read_sensors()
+        if left is not None:
+            state.left, state.right, state.gruen = left, right, gruen
+            state.t_line = time.monotonic()
+    await _periodic(LINE_HZ, step)
+
+
+async def line_task_uart(state, port):
+    """ESP32-Frames per UART; der Event-Loop liest nur, wenn Daten da sind."""
+    from protocol import FrameParser, open_serial
+    ser = open_serial(port)
+    parser = FrameParser()
+
+    def on_readable():
+        if parser.read_from(ser.fileno()):
+            f = parser.frame
+            state.left, state.right, state.gruen = f.left, f.right, f.green
+            state.reflect = (f.reflect[0], f.reflect[1])
+            state.t_line = time.monotonic()
+
+    loop = asyncio.get_running_loop()
+    loop.add_reader(ser.fileno(), on_readable)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        loop.remove_reader(ser.fileno())
+        ser.close()
+
+
+async def switch_task(state):
+    def step(late):
+        pressed = robot.schalterGedrueckt()
+        if state.pressed and not pressed:
+            _cancel_maneuver(state)
+            stop()
+            state.status = "Warten"
+        state.pressed = pressed
+    await _periodic(SWITCH_HZ, step)
+
+
+async def telemetry_task(state):
+    while True:
+        await asyncio.sleep(1.0 / TELEMETRY_HZ)
+        print(f"{state.status:10s} | L: {state.left} R: {state.right} G: {state.gruen} | "
+              f"USv: {state.us_front} USr: {state.us_right} TTC: {_sonar_front.time_to_contact} | "
+              f"Ticks: {state.ticks} | max. Verspätung: {state.late_max * 1e3:.2f} ms")
+
+
+# --- Manöver ---
+
+def _cancel_maneuver(state):
+    if state.maneuver is not None and not state.maneuver.done():
+        state.maneuver.cancel()
+    state.maneuver = None
+
+
+async def _blink():
+    GPIO.output(robot.LED_PIN, GPIO.HIGH)
+    await asyncio.sleep(0.1)
+    GPIO.output(robot.LED_PIN, GPIO.LOW)
+
+
+async def run_maneuver(state, m):
+    """Führt ein Manöver aus maneuver.py als Awaitable aus."""
+    executor = ManeuverExecutor(speedcontrol)
+    loop = asyncio.get_running_loop()
+    executor.start(m, loop.time())
+    period = 1.0 / CONTROL_HZ
+    while executor.tick(loop.time(), state):
+        await asyncio.sleep(period)
+
+
+async def green_turn(state, left, right):
+    m = maneuver.green_turn(left, right, robot.TURN_SPEED, robot.BASE_SPEED,
+                            robot.QUARTER_TIME, robot.HALF_TIME,
+                            on_enter=lambda: asyncio.create_task(_blink()))
+    await run_maneuver(state, m)
+    print(f"Grün erkannt: {m.name}")
+
+
+async def obstacle_bypass(state):
+    print("---Hindernis erkannt!---")
+    await run_maneuver(state, maneuver.obstacle_bypass())
+
+
+async def endzone_run(state):
+    period = 1.0 / CONTROL_HZ
+    while True:
+        forward(robot.BASE_SPEED)
+        turn = robot.endzone_wall(state.us_front) if state.us_valid(time.monotonic()) else None
+        if turn is not None:
+            turn_left(robot.ENDZONE_TURN_SPEED)
+            await asyncio.sleep(turn)
+        if state.left or state.right or not state.pressed:
+            break
+        await asyncio.sleep(period)
+
+
+def _start_maneuver(state, name, coro):
+    state.status = name
+    state.maneuver = asyncio.create_task(coro)
+
+
+# --- Regelung ---
+
+_binary_error = BinaryLineError()
+_analog_error = AnalogLineError(REFLECT_WHITE, REFLECT_BLACK)
+_line_pid = LineController(GainTable(robot.PID_GAINS), robot.PID_SPEED, slowdown=robot.PID_SLOWDOWN)
+
+
+def _pid_step(state, now):
+    """PID-Modus: analoger Fehler, wenn der ESP32 Reflexionswerte schickt."""
+    if state.reflect is not None:
+        error = _analog_error.update(state.reflect[0], state.reflect[1], now)
+    else:
+        error = _binary_error.update(state.left, state.right, now)
+    speedcontrol(*_line_pid.update(error, now))
+
+
+def _reset_pid():
+    _binary_error.reset()
+    _analog_error.reset()
+    _line_pid.reset()
+
+
+def _policy(state, now):
+    """Eine Regelentscheidung; startet ggf. ein Manöver statt zu blockieren."""
+    left, right, gruen = state.left, state.right, state.gruen
+    if left is None:
+        return
+
+    if state.us_front is not None and state.us_valid(now) and robot.obstacle_ahead(_sonar_front):
+        _start_maneuver(state, "Hindernis", obstacle_bypass(state))
+        return
+
+    if gruen and (left or right):
+        _start_maneuver(state, "Gruen", green_turn(state, left, right))
+        return
+
+    if not left and not right:
+        if state.white_since is None:
+            state.white_since = now
+        elif now - state.white_since >= robot.ENDZONE_TIME:
+            state.white_since = None
+            _start_maneuver(state, "Endzone", endzone_run(state))
+            return
+    else:
+        state.white_since = None
+
+    state.status = robot.line_status(left, right)
+    if robot.LINE_MODE == "pid":
+        _pid_step(state, now)
+    else:
+        speedcontrol(*robot.bangbang_speeds(state.status))
+
+
+async def control_task(state):
+    def step(late):
+        if late > state.late_max:
+            state.late_max = late
+        state.ticks += 1
+        if not state.pressed:
+            return
+        if state.maneuver is not None:
+            if not state.maneuver.done():
+                return
+            state.maneuver = None
+            _reset_pid()
+        _policy(state, time.monotonic())
+    await _periodic(CONTROL_HZ, step)
+
+
+async def run_async(uart_port=None):
+    state = RobotState()
+    line = line_task_uart(state, uart_port) if uart_port else line_task(state)
+    tasks = [
+        asyncio.create_task(sonar_task(state), name="sonar"),
+        asyncio.create_task(line, name="line"),
+        asyncio.create_task(switch_task(state), name="switch"),
+        asyncio.create_task(telemetry_task(state), name="telemetry"),
+        asyncio.create_task(control_task(state), name="control"),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        _cancel_maneuver(state)
+        for task in tasks:
+            task.cancel()
+        stop()
+
+
+def run(uart_port=None, line_mode=None, acquisition=None):
+    """Startet die asyncio-Laufzeit; `line_mode` und `acquisition`
+    ("thread"/"process") überschreiben robot.LINE_MODE bzw. robot.ACQUISITION."""
+    if line_mode is not None:
+        robot.LINE_MODE = line_mode
+    if acquisition is not None:
+        robot.ACQUISITION = acquisition
+    robot.init()
+    print("Bereit (asyncio). Schalter drücken zum Starten...")
+    try:
+        asyncio.run(run_async(uart_port))
+    except KeyboardInterrupt:
+        print("\nBeendet durch Benutzer (STRG+C).")
+    finally:
+        try:
+            stop()
+        except Exception:
+            pass
+        robot.shutdown()
+
+
+if __name__ == "__main__":
+    port = sys.argv[sys.argv.index("--uart") + 1] if "--uart" in sys.argv else None
+    run(port, line_mode="pid" if "--pid" in sys.argv else None,
+        acquisition="process" if "--process" in sys.argv else None)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Periodischer Scheduler für die Regelschleife.
+
+Ruft eine Schritt-Funktion mit fester Frequenz auf. Die Deadlines sind
+absolut (perf_counter), d.h. Laufzeitschwankungen eines Schritts
+verschieben nicht die folgenden Ticks. Gezählt werden Ticks, verpasste
+Deadlines (Overruns), Start-Jitter und die Zeit pro Stufe eines Ticks.
+
+Beispiel:
+    sched = RateScheduler(200)
+    def step(s):
+        werte = read_sensors(); s.mark("read")
+        ...;                    s.mark("decide")
+        ...;                    s.mark("actuate")
+    sched.run(step, schalterGedrueckt)
+    print(sched.summary())
+"""
+import time
+
+
+class RateScheduler:
+    def __init__(self, hz, clock=time.perf_counter, sleep=time.sleep):
+        if hz <= 0:
+            raise ValueError("hz muss > 0 sein")
+        self.hz = hz
+        self.period = 1.0 / hz
+        self._clock = clock
+        self._sleep = sleep
+        self.reset()
+
+    def reset(self):
+        """Setzt alle Zähler und Stufen-Statistiken zurück."""
+        self.ticks = 0
+        self.overruns = 0          # Ticks, deren Schritt die Deadline gerissen hat
+        self.skipped = 0           # ausgelassene Slots nach Overruns
+        self.jitter_max = 0.0      # größte Startverspätung in s
+        self.jitter_sum = 0.0
+        self.busy_sum = 0.0        # Summe der Schrittlaufzeiten in s
+        self.stages = {}           # name -> [anzahl, summe_s, max_s]
+        self._last_mark = None
+
+    def mark(self, name):
+        """Schließt die Stufe `name` ab (Zeit seit Tick-Start bzw. letztem mark)."""
+        now = self._clock()
+        dt = now - self._last_mark
+        self._last_mark = now
+        stat = self.stages.get(name)
+        if stat is None:
+            self.stages[name] = [1, dt, dt]
+        else:
+            stat[0] += 1
+            stat[1] += dt
+            if dt > stat[2]:
+                stat[2] = dt
+
+    def run(self, step, keep_running=lambda: True, max_ticks=None):
+        """Ruft `step(self)` mit `hz` auf, solange `keep_running()` wahr ist."""
+        clock = self._clock
+        period = self.period
+        deadline = clock()
+        n = 0
+        while keep_running():
+            start = clock()
+            late = start - deadline
+            if late > 0:
+                self.jitter_sum += late
+                if late > self.jitter_max:
+                    self.jitter_max = late
+            self._last_mark = start
+            step(self)
+            end = clock()
+            self.busy_sum += end - start
+            self.ticks += 1
+            n += 1
+            if max_ticks is not None and n >= max_ticks:
+                break
+
+            deadline += period
+            if end > deadline:
+                # Deadline verpasst: nicht nachholen, sondern auf den
+                # nächsten freien Slot ausrichten
+                self.overruns += 1
+                missed = int((end - deadline) / period) + 1
+                self.skipped += missed - 1
+                deadline += missed * period
+            rest = deadline - clock()
+            if rest > 0:
+                self._sleep(rest)
+
+    def report(self):
+        """Statistik als Dict (Zeiten in ms)."""
+        ticks = self.ticks or 1
+        return {
+            "hz": self.hz,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_mean_ms": self.jitter_sum / ticks * 1e3,
+            "jitter_max_ms": self.jitter_max * 1e3,
+            "load": self.busy_sum / (ticks * self.period),
+            "stages": {
+                name: {"mean_ms": s[1] / s[0] * 1e3, "max_ms": s[2] * 1e3}
+                for name, s in self.stages.items()
+            },
+        }
+
+    def summary(self):
+        r = self.report()
+        lines = [
+            f"{r['ticks']} Ticks @ {r['hz']} Hz | Overruns: {r['overruns']} "
+            f"(übersprungen: {r['skipped']}) | Jitter mean/max: "
+            f"{r['jitter_mean_ms']:.3f}/{r['jitter_max_ms']:.3f} ms | Last: {r['load'] * 100:.0f} %"
+        ]
+        for name, s in r["stages"].items():
+            lines.append(f"  {name:10s} mean {s['mean_ms']:.3f} ms | max {s['max_ms']:.3f} ms")
+        return "\n".join(lines)
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import RPi.GPIO as GPIO
+import bisect
+import threading
 import time
 
+import lifecycle
+
 OUT_A = 22  # Ausgang Sensor links
 OUT_B = 27  # Ausgang Sensor rechts
 
@@ -14,6 +18,14 @@ RIGHT_PINS = {"S0": 8, "S1": 9, "S2": 10, "S3": 11}
 
 WINDOW = 0.002   # kürzeres Messfenster für schnellere Abtastrate
 
+# Periodenmessung: Zeitstempel aufeinanderfolgender steigender Flanken,
+# Frequenz = Anzahl Perioden / Zeitspanne. Die Messung endet, sobald die
+# Zeitspanne für PRECISION (relativ) reicht, spätestens nach MAX_WINDOW.
+MEASURE_MODE = "period"       # "period" oder "window"
+PRECISION = 0.02              # Ziel: 2 % relative Unsicherheit
+TIMESTAMP_RES_NS = 20_000     # angenommene Zeitstempel-Unsicherheit (Callback-Latenz)
+MAX_WINDOW = 0.01             # längste Messdauer (dunkle Flächen)
+
 # Frequenz-Scaling-Kombinationen für S0/S1:
 # HIGH/HIGH = 100 %, HIGH/LOW = 20 %, LOW/HIGH = 2 %, LOW/LOW = Power-Down
 SCALING = {
@@ -22,6 +34,17 @@ SCALING = {
     "2": (GPIO.LOW, GPIO.HIGH),
     "off": (GPIO.LOW, GPIO.LOW),
 }
+SCALE_FACTORS = {"100": 1.0, "20": 0.2, "2": 0.02}
+AUTO_ORDER = ("2", "20", "100")   # aufsteigende Ausgangsfrequenz
+
+# Auto-Scaling: hält die Flankenrate pro Sensor unter EDGE_BUDGET_HZ
+# (sonst wird der GPIO-Event-Thread geflutet) und schaltet hoch, wenn die
+# Frequenz unter MIN_FREQ_HZ fällt (zu langsame/ungenaue Messung).
+# Hochgeschaltet wird nur, wenn die erwartete Rate danach um HYSTERESIS
+# unter dem Budget liegt, damit das Scaling nicht hin- und herspringt.
+EDGE_BUDGET_HZ = 20000.0
+MIN_FREQ_HZ = 2000.0
+HYSTERESIS = 0.25
 
 # Farbfilter-Kombinationen für S2/S3:
 # S2 LOW,  S3 LOW  -> Rot
@@ -35,31 +58,101 @@ COLOR_FILTERS = {
     "c": (GPIO.HIGH, GPIO.LOW),
 }
 
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(OUT_A, GPIO.IN)
-GPIO.setup(OUT_B, GPIO.IN)
-
 def _setup_control_pins(mapping):
     for pin in mapping.values():
         if pin is not None:
             GPIO.setup(pin, GPIO.OUT, initial=GPIO.LOW)
 
-_setup_control_pins(LEFT_PINS)
-_setup_control_pins(RIGHT_PINS)
+# --- Flanken-Verteiler ---
+# RPi.GPIO erlaubt nur ein add_event_detect pro Pin. GPIO27 ist aber sowohl
+# OUT_B (Farbsensor rechts) als auch US2_ECHO, deshalb laufen alle Flanken
+# über einen gemeinsamen Verteiler, der Zeitstempel und Pegel mitliefert.
+_clock_ns = time.monotonic_ns   # austauschbar, z.B. fakegpio.clock_ns
+_wait = threading.Event.wait    # Warten auf Echo-Flanken; austauschbar, z.B. fakegpio.wait
+
+def _seconds():
+    return _clock_ns() * 1e-9
+
+_edge_handlers = {}  # pin -> [callback(channel, level, t_ns)]
+_edge_modes = {}     # pin -> GPIO.RISING / GPIO.FALLING / GPIO.BOTH
+
+def _on_edge(channel):
+    t_ns = _clock_ns()
+    mode = _edge_modes.get(channel)
+    if mode == GPIO.BOTH:
+        level = GPIO.input(channel)
+    else:
+        level = GPIO.HIGH if mode == GPIO.RISING else GPIO.LOW
+    for handler in _edge_handlers.get(channel, ()):
+        handler(channel, level, t_ns)
+
+def add_edge_handler(pin, handler, edge=GPIO.RISING):
+    """Registriert `handler(channel, level, t_ns)` für Flanken an `pin`.
+
+    Brauchen mehrere Handler verschiedene Flanken, wird der Pin auf
+    GPIO.BOTH umgestellt; jeder Handler filtert dann selbst nach `level`.
+    """
+    _edge_handlers.setdefault(pin, []).append(handler)
+    mode = _edge_modes.get(pin)
+    if mode is None:
+        GPIO.add_event_detect(pin, edge, callback=_on_edge)
+        _edge_modes[pin] = edge
+    elif mode != edge and mode != GPIO.BOTH:
+        GPIO.remove_event_detect(pin)
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=_on_edge)
+        _edge_modes[pin] = GPIO.BOTH
+
+def remove_edge_handler(pin, handler):
+    """Entfernt `handler`; ohne verbleibende Handler wird der Pin freigegeben."""
+    handlers = _edge_handlers.get(pin)
+    if not handlers or handler not in handlers:
+        return
+    handlers.remove(handler)
+    if not handlers:
+        del _edge_handlers[pin]
+        del _edge_modes[pin]
+        GPIO.remove_event_detect(pin)
 
 edges_a = 0
 edges_b = 0
 
-def cb_a(channel):
-    global edges_a 
-    edges_a += 1
+def cb_a(channel, level=GPIO.HIGH, t_ns=0):
+    global edges_a
+    if level:
+        edges_a += 1
 
-def cb_b(channel):
+def cb_b(channel, level=GPIO.HIGH, t_ns=0):
     global edges_b
-    edges_b += 1
-
-GPIO.add_event_detect(OUT_A, GPIO.RISING, callback=cb_a)
-GPIO.add_event_detect(OUT_B, GPIO.RISING, callback=cb_b)
+    if level:
+        edges_b += 1
+
+# --- Lebenszyklus Farbsensoren ---
+
+def _init_color():
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(OUT_A, GPIO.IN)
+    GPIO.setup(OUT_B, GPIO.IN)
+    _setup_control_pins(LEFT_PINS)
+    _setup_control_pins(RIGHT_PINS)
+    add_edge_handler(OUT_A, cb_a, GPIO.RISING)
+    add_edge_handler(OUT_B, cb_b, GPIO.RISING)
+    add_edge_handler(OUT_A, _period_a.on_edge, GPIO.RISING)
+    add_edge_handler(OUT_B, _period_b.on_edge, GPIO.RISING)
+
+def _shutdown_color():
+    global _scale, _filter, _auto_scaling
+    remove_edge_handler(OUT_A, cb_a)
+    remove_edge_handler(OUT_B, cb_b)
+    remove_edge_handler(OUT_A, _period_a.on_edge)
+    remove_edge_handler(OUT_B, _period_b.on_edge)
+    _setup_control_pins(LEFT_PINS)    # alles LOW = Power-Down
+    _setup_control_pins(RIGHT_PINS)
+    # Scaling und Filter sind mit der Hardware aus; nach init() neu setzen
+    _scale = None
+    _auto_scaling = False
+    _filter = None
+
+_color_hw = lifecycle.Subsystem("sensor.color", _init_color, _shutdown_color)
 
 def _measure_window():
     """Misst beide Sensor-Ausgänge parallel im vorgegebenen Zeitfenster."""
@@ -69,25 +162,134 @@ def _measure_window():
     start = time.perf_counter()
     time.sleep(WINDOW)
     dt = time.perf_counter() - start
-    freq_left = edges_a / (2.0 * dt)
-    freq_right = edges_b / (2.0 * dt)
+    # gezählt werden nur steigende Flanken = eine pro Periode
+    freq_left = edges_a / dt
+    freq_right = edges_b / dt
     return freq_left, freq_right
 
+class _PeriodCounter:
+    """Stempelt steigende Flanken eines Sensor-Ausgangs während einer Messung."""
+    __slots__ = ("armed", "first", "last", "periods", "min_span_ns", "done")
+
+    def __init__(self):
+        self.armed = False
+        self.first = None
+        self.last = None
+        self.periods = 0
+        self.min_span_ns = 0
+        self.done = threading.Event()
+
+    def arm(self, min_span_ns):
+        self.first = None
+        self.last = None
+        self.periods = 0
+        self.min_span_ns = min_span_ns
+        self.done.clear()
+        self.armed = True
+
+    def on_edge(self, channel, level, t_ns):
+        if not self.armed or not level:
+            return
+        if self.first is None:
+            self.first = t_ns
+            return
+        self.last = t_ns
+        self.periods += 1
+        if t_ns - self.first >= self.min_span_ns:
+            self.armed = False
+            self.done.set()
+
+    def frequency(self):
+        if self.periods == 0:
+            return 0.0
+        return self.periods * 1e9 / (self.last - self.first)
+
+_period_a = _PeriodCounter()
+_period_b = _PeriodCounter()
+
+def _measure_period(precision=None, max_window=None):
+    """Misst beide Sensoren parallel über die Periodendauer.
+
+    Endet adaptiv, sobald die gestempelte Zeitspanne für `precision`
+    reicht (hell = schnell), spätestens nach `max_window` Sekunden.
+    Kommt in der Zeit keine volle Periode zustande, ist das Ergebnis 0.0.
+    """
+    if precision is None:
+        precision = PRECISION
+    if max_window is None:
+        max_window = MAX_WINDOW
+    min_span_ns = int(TIMESTAMP_RES_NS / precision)
+    _period_a.arm(min_span_ns)
+    _period_b.arm(min_span_ns)
+    deadline = time.perf_counter() + max_window
+    for counter in (_period_a, _period_b):
+        rest = deadline - time.perf_counter()
+        if rest > 0:
+            counter.done.wait(rest)
+        counter.armed = False
+    return _period_a.frequency(), _period_b.frequency()
+
+def _measure():
+    if MEASURE_MODE == "period":
+        return _measure_period()
+    return _measure_window()
+
+def set_measure_mode(mode="period"):
+    """Wählt die Frequenzmessung: 'period' (adaptiv) oder 'window' (fest)."""
+    global MEASURE_MODE
+    if mode not in ("period", "window"):
+        raise ValueError("Modus muss 'period' oder 'window' sein")
+    MEASURE_MODE = mode
+
+_scale = None        # aktuell gesetztes Scaling
+_auto_scaling = False
+scale_changes = 0
+
 def _set_scaling(scale="100"):
     """Setzt S0/S1 auf das gewünschte Frequenz-Scaling (beide Sensoren)."""
+    global _scale
     if scale not in SCALING:
         raise ValueError("Scaling muss '100', '20', '2' oder 'off' sein")
+    if not _color_hw.ready:
+        _color_hw.init()
     s0s1 = SCALING[scale]
     for mapping in (LEFT_PINS, RIGHT_PINS):
         if mapping["S0"] is None or mapping["S1"] is None:
             continue
         GPIO.output(mapping["S0"], s0s1[0])
         GPIO.output(mapping["S1"], s0s1[1])
+    _scale = scale
+
+def _auto_range(freq_left, freq_right):
+    """Wählt anhand der Rohfrequenzen das Scaling für die nächste Messung."""
+    global scale_changes
+    peak = max(freq_left, freq_right)
+    idx = AUTO_ORDER.index(_scale)
+    if peak > EDGE_BUDGET_HZ and idx > 0:
+        _set_scaling(AUTO_ORDER[idx - 1])
+        scale_changes += 1
+    elif peak < MIN_FREQ_HZ and idx < len(AUTO_ORDER) - 1:
+        up = AUTO_ORDER[idx + 1]
+        expected = peak * SCALE_FACTORS[up] / SCALE_FACTORS[_scale]
+        if expected < EDGE_BUDGET_HZ * (1.0 - HYSTERESIS):
+            _set_scaling(up)
+            scale_changes += 1
+
+_filter = None       # aktuell gesetzter Farbfilter
 
 def _set_filter(color):
-    """Schaltet S2/S3 auf den gewünschten Filter für beide Sensoren."""
+    """Schaltet S2/S3 auf den gewünschten Filter für beide Sensoren.
+
+    Ist der Filter schon gesetzt, entfallen Umschalten und Settling-Zeit.
+    """
+    global _filter
     if color not in COLOR_FILTERS:
         raise ValueError("Farbe muss 'r', 'g', 'b' oder 'c' sein")
+    if color == _filter:
+        return
+    if not _color_hw.ready:
+        _color_hw.init()
+    _filter = color
     s2_state, s3_state = COLOR_FILTERS[color]
     for mapping in (LEFT_PINS, RIGHT_PINS):
         if mapping["S2"] is None or mapping["S3"] is None:
@@ -104,10 +306,16 @@ def read_color(color):
         color (str): 'r', 'g', 'b' oder 'c' (clear)
 
     Returns:
-        tuple: (freq_links, freq_rechts) in Hz
+        tuple: (freq_links, freq_rechts) in Hz; im Auto-Scaling-Modus
+        immer auf 100 % Scaling normiert
     """
     _set_filter(color)
-    return _measure_window()
+    freq_left, freq_right = _measure()
+    if not _auto_scaling:
+        return freq_left, freq_right
+    factor = SCALE_FACTORS[_scale]
+    _auto_range(freq_left, freq_right)
+    return freq_left / factor, freq_right / factor
 
 def read_all_colors(order=("r", "g", "b", "c")):
     """
@@ -121,24 +329,165 @@ def read_all_colors(order=("r", "g", "b", "c")):
         results[color] = read_color(color)
     return results
 
+class FilterScheduler:
+    """Liest pro Tick nur die Farbkanäle, die gerade fällig sind.
+
+    `rates` gibt pro Kanal an, jeden wievielten Tick er gemessen wird,
+    z.B. {"c": 1, "g": 2, "r": 10}: Klar jeden Tick, Grün jeden 2., Rot
+    jeden 10. Die Kanäle werden phasenversetzt eingeplant, damit nicht alle
+    im selben Tick fällig sind, und der noch gesetzte Filter wird zuerst
+    gelesen (kein Umschalten). Ergebnisse landen mit Zeitstempel im Cache.
+    """
+
+    def __init__(self, rates=None):
+        if rates is None:
+            rates = {"c": 1, "g": 2, "r": 10}
+        for color, every in rates.items():
+            if color not in COLOR_FILTERS:
+                raise ValueError("Farbe muss 'r', 'g', 'b' oder 'c' sein")
+            if every < 1:
+                raise ValueError("Rate muss >= 1 sein")
+        self.rates = dict(rates)
+        self._phase = {color: i for i, color in enumerate(self.rates)}
+        self.ticks = 0
+        self.reads = {color: 0 for color in self.rates}
+        self.cache = {}  # color -> (freq_links, freq_rechts, t_ns)
+
+    def due(self):
+        """Kanäle, die im aktuellen Tick gemessen werden."""
+        n = self.ticks
+        due = [c for c, every in self.rates.items() if (n + self._phase[c]) % every == 0]
+        if _filter in due and due[0] != _filter:
+            due.remove(_filter)
+            due.insert(0, _filter)
+        return due
+
+    def tick(self):
+        """Misst alle fälligen Kanäle und gibt den Cache zurück."""
+        for color in self.due():
+            freq_left, freq_right = read_color(color)
+            self.cache[color] = (freq_left, freq_right, _clock_ns())
+            self.reads[color] += 1
+        self.ticks += 1
+        return self.cache
+
+    def latest(self, color, max_age=None):
+        """(freq_links, freq_rechts) aus dem Cache oder None (fehlt/zu alt)."""
+        entry = self.cache.get(color)
+        if entry is None:
+            return None
+        if max_age is not None and (_clock_ns() - entry[2]) * 1e-9 > max_age:
+            return None
+        return entry[0], entry[1]
+
 def set_scaling(scale="100"):
-    """Öffentliche API, um S0/S1-Scaling einzustellen."""
+    """Öffentliche API, um S0/S1-Scaling einzustellen.
+
+    'auto' aktiviert das automatische Umschalten zwischen '100'/'20'/'2'.
+    """
+    global _auto_scaling
+    if scale == "auto":
+        _auto_scaling = True
+        if _scale not in AUTO_ORDER:
+            _set_scaling("20")
+        return
+    _auto_scaling = False
     _set_scaling(scale)
 
+def get_scaling():
+    """Aktuelles Scaling als (scale, auto)."""
+    return _scale, _auto_scaling
+
 # --- Ultraschall (HC-SR04) Unterstützung ---
-# Pins (BCM) wie vom Benutzer angegeben
-US1_TRIG = 23
-US1_ECHO = 24
-US2_TRIG = 17
-US2_ECHO = 27
-
-# Setup der Ultraschall-Pins
-GPIO.setup(US1_TRIG, GPIO.OUT)
-GPIO.setup(US1_ECHO, GPIO.IN)
-GPIO.setup(US2_TRIG, GPIO.OUT)
-GPIO.setup(US2_ECHO, GPIO.IN)
-GPIO.output(US1_TRIG, GPIO.LOW)
-GPIO.output(US2_TRIG, GPIO.LOW)
+# Sonar-Tabelle (Pins BCM). heading = Blickrichtung in Grad (0 = vorne,
+# -90 = rechts); weitere Sensoren einfach anhängen. Alle Einträge liefern
+# read_distances()/latest_distances() als {name: cm}; read_ultrasonics()/
+# latest_ultrasonics() und damit main (SensorFrame.us_front/us_right) sowie
+# der Erfassungsprozess (acquisition.py) tragen nur "vorne" und "rechts".
+SONARS = [
+    {"name": "vorne", "trig": 23, "echo": 24, "heading": 0},
+    {"name": "rechts", "trig": 17, "echo": 27, "heading": -90},
+]
+US1_TRIG = SONARS[0]["trig"]
+US1_ECHO = SONARS[0]["echo"]
+US2_TRIG = SONARS[1]["trig"]
+US2_ECHO = SONARS[1]["echo"]
+
+# Übersprech-Regeln für den Trigger-Scheduler:
+# Sensoren, deren Blickrichtungen weniger als SONAR_MIN_SEPARATION Grad
+# auseinander liegen, messen nie gleichzeitig; alle anderen dürfen sich
+# überlappen, werden aber um SONAR_STAGGER versetzt getriggert. Nach dem
+# Echo-Ende (oder Timeout) wartet ein Sensor und seine Nachbarn noch
+# SONAR_GUARD (Nachschwingen), statt eine feste Pause einzulegen.
+SONAR_MIN_SEPARATION = 60.0
+SONAR_STAGGER = 0.002
+SONAR_GUARD = 0.002
+SONAR_TIMEOUT = 0.02          # längstes gültiges Echo (~343 cm)
+
+SPEED_OF_SOUND = 34300.0   # cm/s
+
+class _Echo:
+    """Zustand einer laufenden Messung an einem Echo-Pin.
+
+    Steigende und fallende Flanke werden im Callback mit `_clock_ns()`
+    gestempelt; der Aufrufer wartet auf `done` statt den Pin zu pollen.
+    """
+    __slots__ = ("armed", "t_rise", "t_fall", "done", "wake")
+
+    def __init__(self):
+        self.armed = False
+        self.t_rise = None
+        self.t_fall = None
+        self.done = threading.Event()
+        self.wake = None    # optionales gemeinsames Event (Scheduler)
+
+    def arm(self):
+        self.t_rise = None
+        self.t_fall = None
+        self.done.clear()
+        self.armed = True
+
+    def on_edge(self, channel, level, t_ns):
+        if not self.armed:
+            return
+        if level:
+            self.t_rise = t_ns
+        elif self.t_rise is not None:
+            self.t_fall = t_ns
+            self.armed = False
+            self.done.set()
+            if self.wake is not None:
+                self.wake.set()
+
+_echoes = {}
+
+def _echo_for(echo_pin):
+    echo = _echoes.get(echo_pin)
+    if echo is None:
+        echo = _Echo()
+        _echoes[echo_pin] = echo
+        add_edge_handler(echo_pin, echo.on_edge, GPIO.BOTH)
+    return echo
+
+# --- Lebenszyklus Ultraschall ---
+
+def _init_sonar():
+    GPIO.setmode(GPIO.BCM)
+    for sonar in SONARS:
+        GPIO.setup(sonar["trig"], GPIO.OUT)
+        GPIO.setup(sonar["echo"], GPIO.IN)
+        GPIO.output(sonar["trig"], GPIO.LOW)
+        _echo_for(sonar["echo"])
+
+def _shutdown_sonar():
+    global _trigger_scheduler
+    stop_sampler()
+    _trigger_scheduler = None
+    for pin, echo in list(_echoes.items()):
+        remove_edge_handler(pin, echo.on_edge)
+    _echoes.clear()
+
+_sonar_hw = lifecycle.Subsystem("sensor.sonar", _init_sonar, _shutdown_sonar)
 
 def _pulse_high(pin, duration=0.00001):
     """Sendet einen kurzen HIGH-Puls auf `pin` (Trigger)."""
@@ -146,46 +495,465 @@ def _pulse_high(pin, duration=0.00001):
     time.sleep(duration)
     GPIO.output(pin, GPIO.LOW)
 
+def _echo_to_cm(t_rise, t_fall):
+    # Schallgeschwindigkeit ~34300 cm/s; Strecke hin+zurück => /2
+    return (t_fall - t_rise) * 1e-9 * SPEED_OF_SOUND / 2.0
+
 def _measure_distance(trigger_pin, echo_pin, timeout=0.02):
     """Misst die Entfernung in cm für einen einzelnen HC-SR04.
 
-    Gibt `None` zurück, wenn kein Echo innerhalb des Timeouts empfangen wird.
+    Die Echo-Flanken werden per Interrupt gestempelt, der Aufrufer
+    blockiert nur in `Event.wait` (kein Busy-Wait). Gibt `None` zurück,
+    wenn kein vollständiges Echo innerhalb von 2×`timeout` empfangen wird.
     """
-    # Trigger senden
+    if not _sonar_hw.ready:
+        _sonar_hw.init()
+    echo = _echo_for(echo_pin)
+    echo.arm()
     _pulse_high(trigger_pin)
+    if not _wait(echo.done, 2 * timeout):
+        echo.armed = False
+        return None
+    if echo.t_fall - echo.t_rise > timeout * 1e9:
+        return None
+    return _echo_to_cm(echo.t_rise, echo.t_fall)
+
+class _Sonar:
+    __slots__ = ("name", "trig", "echo", "heading", "conflicts", "t_ready",
+                 "samples", "timeouts", "t_first", "t_last")
+
+    def __init__(self, name, trig, echo, heading=0.0):
+        self.name = name
+        self.trig = trig
+        self.echo = echo
+        self.heading = heading
+        self.conflicts = ()
+        self.t_ready = 0.0
+        self.samples = 0
+        self.timeouts = 0
+        self.t_first = None
+        self.t_last = None
+
+def _separation(a, b):
+    d = abs(a - b) % 360.0
+    return min(d, 360.0 - d)
+
+class TriggerScheduler:
+    """Triggert mehrere HC-SR04 versetzt statt streng nacheinander.
+
+    Eine Runde misst jeden Sensor der Tabelle einmal. Ein Sensor feuert,
+    sobald (a) seine eigene und die Nachschwingzeit seiner Nachbarn vorbei
+    ist, (b) kein Nachbar (Blickrichtung < `min_separation`) gerade misst
+    und (c) seit dem letzten Trigger `stagger` vergangen ist. Das Ende eines
+    Echos gibt den Sensor nach `guard` wieder frei; nur ohne Echo wird bis
+    zum Timeout gewartet.
 
-    start_time = time.time()
-    # Warte auf steigende Flanke (Echo beginnt)
-    while GPIO.input(echo_pin) == 0:
-        if time.time() - start_time > timeout:
-            return None
-    t_start = time.time()
-
-    # Warte auf fallende Flanke (Echo endet)
-    while GPIO.input(echo_pin) == 1:
-        if time.time() - t_start > timeout:
-            return None
-    t_end = time.time()
+    Args:
+        sonars: Tabelle wie SONARS (name, trig, echo, heading)
+        clock: Uhr in s (Standard: _clock_ns)
+        wait: wait(event, timeout) (Standard: _wait)
+    """
 
-    dt = t_end - t_start
-    # Schallgeschwindigkeit ~34300 cm/s; Strecke hin+zurück => /2
-    distance_cm = (dt * 34300.0) / 2.0
-    return distance_cm
+    def __init__(self, sonars=None, min_separation=None, stagger=None, guard=None,
+                 timeout=None, clock=None, wait=None):
+        self.min_separation = SONAR_MIN_SEPARATION if min_separation is None else min_separation
+        self.stagger = SONAR_STAGGER if stagger is None else stagger
+        self.guard = SONAR_GUARD if guard is None else guard
+        self.timeout = SONAR_TIMEOUT if timeout is None else timeout
+        self._clock = clock
+        self._wait = wait
+        self._wake = threading.Event()
+        self._lock = threading.Lock()    # eine Runde zur Zeit (Sampler + direkte Aufrufe)
+        self._t_trigger = 0.0
+        self.rounds = 0
+        self.sonars = [_Sonar(e["name"], e["trig"], e["echo"], e.get("heading", 0.0))
+                       for e in (SONARS if sonars is None else sonars)]
+        for s in self.sonars:
+            s.conflicts = tuple(j for j, o in enumerate(self.sonars)
+                                if o is not s and _separation(s.heading, o.heading) < self.min_separation)
+        self.index = {s.name: i for i, s in enumerate(self.sonars)}
+
+    def read_round(self):
+        """Misst jeden Sensor einmal; Entfernungen (cm/None) in Tabellenreihenfolge."""
+        if not _sonar_hw.ready:
+            _sonar_hw.init()
+        with self._lock:
+            return self._round()
+
+    def _round(self):
+        clock = self._clock or _seconds
+        wait = self._wait or _wait
+        wake = self._wake
+        sonars = self.sonars
+        results = [None] * len(sonars)
+        pending = list(range(len(sonars)))
+        active = {}   # index -> (echo, t_trigger)
+        limit = 2 * self.timeout
+        while pending or active:
+            wake.clear()
+            now = clock()
+            for i, (echo, t0) in list(active.items()):
+                s = sonars[i]
+                if echo.done.is_set():
+                    if echo.t_fall - echo.t_rise <= self.timeout * 1e9:
+                        results[i] = _echo_to_cm(echo.t_rise, echo.t_fall)
+                    else:
+                        s.timeouts += 1
+                elif now - t0 > limit:
+                    echo.armed = False
+                    s.timeouts += 1
+                else:
+                    continue
+                del active[i]
+                echo.wake = None
+                s.t_ready = now + self.guard
+                s.samples += 1
+                if s.t_first is None:
+                    s.t_first = now
+                s.t_last = now
+
+            deadline = None
+            for i in pending:
+                s = sonars[i]
+                if any(j in active for j in s.conflicts):
+                    continue
+                t = max(s.t_ready, self._t_trigger + self.stagger,
+                        *(sonars[j].t_ready for j in s.conflicts))
+                if t <= now:
+                    echo = _echo_for(s.echo)
+                    echo.arm()
+                    echo.wake = wake
+                    self._t_trigger = now
+                    _pulse_high(s.trig)
+                    active[i] = (echo, now)
+                    pending.remove(i)
+                    deadline = now      # gleich weiter prüfen (Stagger)
+                    break
+                if deadline is None or t < deadline:
+                    deadline = t
+            if deadline is not None and deadline <= now:
+                continue
+            for echo, t0 in active.values():
+                if deadline is None or t0 + limit < deadline:
+                    deadline = t0 + limit
+            if deadline is not None:
+                wait(wake, max(0.0, deadline - clock()))
+        self.rounds += 1
+        return results
+
+    def read(self):
+        """Eine Runde als dict {name: cm/None}."""
+        return dict(zip((s.name for s in self.sonars), self.read_round()))
+
+    def stats(self):
+        """Erreichte Messrate pro Sensor."""
+        out = {}
+        for s in self.sonars:
+            span = (s.t_last - s.t_first) if s.t_first is not None else 0.0
+            out[s.name] = {
+                "hz": (s.samples - 1) / span if span > 0 else 0.0,
+                "samples": s.samples,
+                "timeouts": s.timeouts,
+            }
+        return out
+
+_trigger_scheduler = None
+
+def trigger_scheduler():
+    """Gemeinsamer TriggerScheduler für die Tabelle SONARS."""
+    global _trigger_scheduler
+    if _trigger_scheduler is None:
+        _trigger_scheduler = TriggerScheduler()
+    return _trigger_scheduler
+
+def read_distances():
+    """Misst alle Sensoren aus SONARS (versetzt getriggert) als {name: cm/None}."""
+    return trigger_scheduler().read()
 
 def read_ultrasonics():
-    """Liest beide Ultraschall-Sensoren und gibt ein Tupel (d1, d2) zurück.
+    """Misst alle Sensoren aus SONARS (versetzt getriggert) und gibt
+    (vorne, rechts) zurück.
 
     Werte sind in cm oder `None` bei Timeouts.
     """
-    d1 = _measure_distance(US1_TRIG, US1_ECHO)
-    time.sleep(0.01)
-    d2 = _measure_distance(US2_TRIG, US2_ECHO)
-    return d1, d2
+    sched = trigger_scheduler()
+    results = sched.read_round()
+    return results[sched.index["vorne"]], results[sched.index["rechts"]]
+
+def ultrasonic_rates():
+    """Erreichte Messrate pro Sensor (siehe TriggerScheduler.stats)."""
+    return trigger_scheduler().stats()
+
+class SonarFilter:
+    """Streaming-Filter für einen Ultraschall-Sensor.
+
+    Pro Messung:
+      1. Ausreißer-Gate: Springt die Messung weiter vom gefilterten Wert weg,
+         als `gate` + `max_speed`·dt erlaubt, wird sie verworfen. Kommen
+         `max_rejects` solche Werte in Folge (z.B. neues Objekt), beginnt
+         der Verlauf mit ihnen neu.
+      2. Gleitender Median über die letzten `window` gültigen Werte.
+      3. Exponentielle Glättung mit `alpha`.
+    Aus der Änderung des geglätteten Werts folgt die Annäherungs-
+    geschwindigkeit (cm/s, positiv = kommt näher, geglättet mit
+    `speed_alpha`, begrenzt auf ±`max_speed`) und daraus die Zeit bis zum
+    Kontakt.
+
+    Aufwand pro Messung O(window), bei festem Fenster also O(1).
+    `None`-Messungen (Timeout) zählen als Aussetzer; nach `max_dropouts`
+    Aussetzern in Folge wird der Verlauf verworfen (Ausgabe `None`). Einen
+    Wert gibt es erst ab `min_samples` gültigen Messungen.
+    """
+
+    def __init__(self, window=5, alpha=0.5, speed_alpha=0.3, max_speed=100.0, gate=5.0,
+                 min_samples=None, max_dropouts=None, max_rejects=3):
+        if window < 1:
+            raise ValueError("window muss >= 1 sein")
+        self.window = window
+        self.alpha = alpha
+        self.speed_alpha = speed_alpha
+        self.max_speed = max_speed
+        self.gate = gate
+        self.min_samples = window // 2 + 1 if min_samples is None else min_samples
+        self.max_dropouts = window // 2 + 1 if max_dropouts is None else max_dropouts
+        self.max_rejects = max_rejects
+        self.samples = 0
+        self.dropouts = 0
+        self.outliers = 0
+        self.dropout_rate = 0.0   # gleitend über etwa `window` Messungen
+        self.reset()
+
+    def reset(self):
+        """Verwirft den Verlauf (Zähler bleiben)."""
+        self._ring = [0.0] * self.window
+        self._next = 0
+        self._count = 0
+        self._sorted = []
+        self._run = 0
+        self._rejected = []
+        self.distance = None
+        self.speed = 0.0
+        self.t = None
+
+    def _push(self, d):
+        ring = self._ring
+        srt = self._sorted
+        if self._count == self.window:
+            del srt[bisect.bisect_left(srt, ring[self._next])]
+        else:
+            self._count += 1
+        ring[self._next] = d
+        self._next = (self._next + 1) % self.window
+        bisect.insort(srt, d)
+
+    def update(self, d, t):
+        """Neue Messung `d` (cm oder None) zur Zeit `t` (s); gibt die
+        gefilterte Entfernung zurück."""
+        self.samples += 1
+        if d is None:
+            self.dropouts += 1
+            self.dropout_rate += (1.0 - self.dropout_rate) / self.window
+            self._run += 1
+            if self._run >= self.max_dropouts:
+                self.reset()
+            return self.distance
+        self._run = 0
+        self.dropout_rate -= self.dropout_rate / self.window
+
+        if self.distance is not None and abs(d - self.distance) > self.gate + self.max_speed * (t - self.t):
+            self.outliers += 1
+            self._rejected.append(d)
+            if len(self._rejected) < self.max_rejects:
+                return self.distance
+            rejected = self._rejected
+            self.reset()
+            for r in rejected[:-1]:
+                self._push(r)
+        elif self._rejected:
+            self._rejected = []
+        self._push(d)
+        if self._count < self.min_samples:
+            return self.distance
+
+        median = self._sorted[self._count // 2]
+        prev, t_prev = self.distance, self.t
+        if prev is None:
+            self.distance = median
+        else:
+            self.distance = prev + self.alpha * (median - prev)
+            if t > t_prev:
+                v = (prev - self.distance) / (t - t_prev)
+                self.speed += self.speed_alpha * (v - self.speed)
+                if self.speed > self.max_speed:
+                    self.speed = self.max_speed
+                elif self.speed < -self.max_speed:
+                    self.speed = -self.max_speed
+        self.t = t
+        return self.distance
+
+    def time_to(self, distance):
+        """Sekunden bis `distance` erreicht ist (0 = schon erreicht, None =
+        kein Wert oder keine Annäherung)."""
+        if self.distance is None:
+            return None
+        if self.distance <= distance:
+            return 0.0
+        if self.speed <= 1.0:     # < 1 cm/s gilt als Stillstand
+            return None
+        return (self.distance - distance) / self.speed
+
+    @property
+    def time_to_contact(self):
+        return self.time_to(0.0)
+
+class UltrasonicSampler:
+    """Misst die Ultraschall-Sensoren dauerhaft in einem Hintergrund-Thread
+    (Runden des TriggerSchedulers).
+
+    Der letzte Messzyklus wird als Tupel (vorne, rechts, t_ns, {name: cm})
+    veröffentlicht und kann von der Regelschleife in O(1) mit `latest()`
+    bzw. für alle Sensoren der Tabelle mit `distances()` gelesen werden.
+
+    Args:
+        period: Mindestabstand zwischen zwei Messzyklen in Sekunden
+        max_age: Werte älter als das gelten als veraltet (-> None)
+    """
+
+    def __init__(self, period=0.01, max_age=0.15):
+        self.period = period
+        self.max_age = max_age
+        self.cycles = 0
+        self._snapshot = (None, None, None, {})
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ultrasonic", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            values = read_distances()
+            # Tupel-Zuweisung ist atomar -> Leser sehen nie halbe Werte
+            self._snapshot = (values.get("vorne"), values.get("rechts"), _clock_ns(), values)
+            self.cycles += 1
+            rest = self.period - (time.perf_counter() - t0)
+            if rest > 0:
+                self._stop.wait(rest)
+
+    def snapshot(self):
+        """Letzter Messzyklus als (vorne, rechts, t_ns), ohne Altersprüfung."""
+        d1, d2, t_ns, _ = self._snapshot
+        return d1, d2, t_ns
+
+    def latest(self):
+        """Gibt (vorne, rechts, alter_s) zurück.
+
+        Ist noch kein Wert da oder der Wert älter als `max_age`, sind
+        vorne/rechts `None`; `alter_s` ist dann ggf. ebenfalls `None`.
+        """
+        d1, d2, t_ns, _ = self._snapshot
+        if t_ns is None:
+            return None, None, None
+        age = (_clock_ns() - t_ns) * 1e-9
+        if age > self.max_age:
+            return None, None, age
+        return d1, d2, age
+
+    def distances(self):
+        """Gibt ({name: cm}, alter_s) für alle Sensoren der Tabelle zurück;
+        veraltet oder noch ohne Wert ist das dict leer."""
+        _, _, t_ns, values = self._snapshot
+        if t_ns is None:
+            return {}, None
+        age = (_clock_ns() - t_ns) * 1e-9
+        if age > self.max_age:
+            return {}, age
+        return values, age
+
+_sampler = None
+_shared = None   # acquisition.Acquisition, wenn ein anderer Prozess misst
+
+def use_shared(acquisition):
+    """Lässt latest_ultrasonics() aus der Erfassung im Kindprozess lesen
+    (None = wieder selbst messen)."""
+    global _shared
+    _shared = acquisition
+
+def start_sampler(period=0.01, max_age=0.15):
+    """Startet (einmalig) den Hintergrund-Sampler für die Ultraschall-Sensoren."""
+    global _sampler
+    if _sampler is None:
+        _sampler = UltrasonicSampler(period, max_age)
+    _sampler.max_age = max_age
+    return _sampler.start()
+
+def stop_sampler():
+    global _sampler
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
+
+def latest_ultrasonics():
+    """Letzter Ultraschall-Snapshot (vorne, rechts, alter_s).
+
+    Läuft kein Sampler, wird synchron gemessen (alter_s = 0.0).
+    """
+    if _shared is not None:
+        return _shared.ultrasonics()
+    if _sampler is not None and _sampler.running:
+        return _sampler.latest()
+    d1, d2 = read_ultrasonics()
+    return d1, d2, 0.0
+
+def latest_distances():
+    """Letzter Messzyklus aller Sensoren als ({name: cm}, alter_s).
+
+    Misst der Erfassungsprozess, gibt es nur "vorne" und "rechts"; läuft
+    kein Sampler, wird synchron gemessen (alter_s = 0.0).
+    """
+    if _shared is not None:
+        d1, d2, age = _shared.ultrasonics()
+        return {"vorne": d1, "rechts": d2}, age
+    if _sampler is not None and _sampler.running:
+        return _sampler.distances()
+    return read_distances(), 0.0
+
+def init(color=True, sonar=True):
+    """Konfiguriert die gewünschten Sensoren (idempotent).
+
+    Ohne Aufruf passiert das beim ersten Lesen automatisch.
+    """
+    if color:
+        _color_hw.init()
+    if sonar:
+        _sonar_hw.init()
+
+def shutdown():
+    """Stoppt den Sampler, gibt die Flanken-Callbacks frei und schaltet die
+    Farbsensoren ab (idempotent)."""
+    _sonar_hw.shutdown()
+    _color_hw.shutdown()
 
 # Beispiel für die Verwendung:
 if __name__ == "__main__":
     try:
-        _set_scaling("100")  # 100 % Output-Scaling; nach Bedarf anpassen
+        set_scaling("auto")  # Auto-Scaling; Werte sind auf 100 % normiert
         while True:
             all_values = read_all_colors()
             print(
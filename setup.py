@@ -1,8 +1,113 @@
 #!/usr/bin/env python3
+import os
+import threading
+import time
+
 import RPi.GPIO as GPIO
 
+import profiling
+
+class RPiGPIOBackend:
+	"""Software PWM via RPi.GPIO (one background thread per pin)."""
+	name = 'rpi'
+
+	def __init__(self):
+		self.pwms = {}
+
+	def setup(self, pins, pwm_freq):
+		GPIO.setmode(GPIO.BCM)
+		GPIO.setwarnings(False)
+		for p in pins:
+			GPIO.setup(p, GPIO.OUT)
+			GPIO.output(p, GPIO.LOW)
+		for pin in pins:
+			pwm = GPIO.PWM(pin, pwm_freq)
+			pwm.start(0)
+			self.pwms[pin] = pwm
+
+	@property
+	def threads(self):
+		return len(self.pwms)
+
+	def write(self, pin, duty):
+		self.pwms[pin].ChangeDutyCycle(duty)
+
+	def close(self):
+		for pwm in self.pwms.values():
+			pwm.stop()
+		GPIO.cleanup()
+
+
+class PigpioBackend:
+	"""DMA/hardware-timed PWM through the pigpio daemon (no Python threads).
+
+	Requires the `pigpio` module and a running `pigpiod`.
+	"""
+	name = 'pigpio'
+	threads = 0
+
+	def __init__(self, host='localhost', port=8888):
+		try:
+			import pigpio
+		except ImportError as exc:
+			raise RuntimeError('pigpio backend needs the pigpio module (apt install python3-pigpio)') from exc
+		self._pigpio = pigpio
+		self.pi = pigpio.pi(host, port)
+		if not self.pi.connected:
+			raise RuntimeError('pigpio daemon not running (sudo pigpiod)')
+		self.pins = []
+
+	def setup(self, pins, pwm_freq):
+		for pin in pins:
+			self.pi.set_mode(pin, self._pigpio.OUTPUT)
+			self.pi.set_PWM_frequency(pin, pwm_freq)
+			self.pi.set_PWM_range(pin, 100)  # duty 0..100 like RPi.GPIO
+			self.pi.set_PWM_dutycycle(pin, 0)
+		self.pins = list(pins)
+
+	def write(self, pin, duty):
+		self.pi.set_PWM_dutycycle(pin, duty)
+
+	def close(self):
+		for pin in self.pins:
+			self.pi.set_PWM_dutycycle(pin, 0)
+		self.pi.stop()
+
+
+class RecordingBackend:
+	"""In-memory backend for tests: keeps current duty per pin and a log."""
+	name = 'memory'
+	threads = 0
+
+	def __init__(self, clock=None):
+		self.duty = {}
+		self.log = []  # (t, pin, duty)
+		self.freq = None
+		self.closed = False
+		self._clock = clock
+
+	def setup(self, pins, pwm_freq):
+		self.freq = pwm_freq
+		for pin in pins:
+			self.duty[pin] = 0
+
+	def write(self, pin, duty):
+		self.duty[pin] = duty
+		self.log.append((self._clock() if self._clock else None, pin, duty))
+
+	def close(self):
+		self.closed = True
+
+
+BACKENDS = {
+	'rpi': RPiGPIOBackend,
+	'pigpio': PigpioBackend,
+	'memory': RecordingBackend,
+}
+
+
 class MotorController:
-	def __init__(self, pwm_freq=1000, defaults=None):
+	def __init__(self, pwm_freq=1000, defaults=None, backend=None):
 		if defaults is None:
 			defaults = {
 				'HR_IN1': 16,
@@ -15,20 +120,28 @@ class MotorController:
 				'HL_IN2': 19,
 			}
 		self.defaults = defaults
-		GPIO.setmode(GPIO.BCM)
-		GPIO.setwarnings(False)
+		if backend is None:
+			backend = 'rpi'
+		if isinstance(backend, str):
+			if backend not in BACKENDS:
+				raise ValueError(f'Unknown motor backend: {backend}')
+			backend = BACKENDS[backend]()
+		self.backend = backend
 
 		# unique motor pins
 		motor_pins = list({v for v in self.defaults.values()})
-		for p in motor_pins:
-			GPIO.setup(p, GPIO.OUT)
-			GPIO.output(p, GPIO.LOW)
+		self.backend.setup(motor_pins, pwm_freq)
+		self._duty = {pin: 0 for pin in motor_pins}
 
-		self.pwms = {}
-		for pin in motor_pins:
-			pwm = GPIO.PWM(pin, pwm_freq)
-			pwm.start(0)
-			self.pwms[pin] = pwm
+		# write-through cache statistics; the lock keeps apply()/stop()
+		# atomic against the emergency stop from the switch callback
+		self._lock = threading.Lock()
+		# set by halt(): speed commands are ignored until resume(), so a
+		# control tick still in flight cannot restart the motors
+		self.halted = False
+		self.writes = 0
+		self.skipped_writes = 0
+		self.write_time = 0.0  # seconds spent inside backend.write
 
 		self.WHEELS = {
 			'VR': (self.defaults['VR_IN1'], self.defaults['VR_IN2']),
@@ -37,37 +150,95 @@ class MotorController:
 			'HL': (self.defaults['HL_IN1'], self.defaults['HL_IN2']),
 		}
 
+	def _write(self, pin, duty):
+		"""Apply a duty cycle to a pin unless it already has that value."""
+		if self._duty[pin] == duty:
+			self.skipped_writes += 1
+			return
+		t0 = time.perf_counter()
+		self.backend.write(pin, duty)
+		self.write_time += time.perf_counter() - t0
+		self._duty[pin] = duty
+		self.writes += 1
+
+	@profiling.timed('set_wheel')
 	def set_wheel(self, wheel, speed):
 		"""Set a single wheel speed.
 
 		speed: -100..100 (negative = reverse)
 		"""
+		with self._lock:
+			if not self.halted:
+				self._set_wheel(wheel, speed)
+
+	def _set_wheel(self, wheel, speed):
 		if wheel not in self.WHEELS:
 			raise ValueError(f'Unknown wheel: {wheel}')
 		p1, p2 = self.WHEELS[wheel]
 		speed = int(max(-100, min(100, speed)))
 		if speed > 0:
-			self.pwms[p1].ChangeDutyCycle(speed)
-			self.pwms[p2].ChangeDutyCycle(0)
+			self._write(p1, speed)
+			self._write(p2, 0)
 		elif speed < 0:
-			self.pwms[p1].ChangeDutyCycle(0)
-			self.pwms[p2].ChangeDutyCycle(-speed)
+			self._write(p1, 0)
+			self._write(p2, -speed)
 		else:
-			self.pwms[p1].ChangeDutyCycle(0)
-			self.pwms[p2].ChangeDutyCycle(0)
+			self._write(p1, 0)
+			self._write(p2, 0)
+
+	@profiling.timed('apply')
+	def apply(self, VL, HL, VR, HR):
+		"""Set all four wheels in one call (same semantics as set_wheel)."""
+		with self._lock:
+			if self.halted:
+				return
+			self._set_wheel('VL', VL)
+			self._set_wheel('HL', HL)
+			self._set_wheel('VR', VR)
+			self._set_wheel('HR', HR)
+
+	def stats(self):
+		"""Return hardware writes done, no-op writes avoided by the cache
+		and the CPU cost of the backend."""
+		return {
+			'backend': self.backend.name,
+			'threads': self.backend.threads,
+			'writes': self.writes,
+			'skipped': self.skipped_writes,
+			'write_us': self.write_time / self.writes * 1e6 if self.writes else 0.0,
+			'halted': self.halted,
+		}
 
 	def stop(self):
-		for pwm in self.pwms.values():
-			pwm.ChangeDutyCycle(0)
+		with self._lock:
+			for pin in self._duty:
+				self._write(pin, 0)
+
+	def halt(self):
+		"""Emergency stop: all outputs to 0, ignore set_wheel()/apply()
+		until resume()."""
+		with self._lock:
+			self.halted = True
+			for pin in self._duty:
+				self._write(pin, 0)
+
+	def resume(self):
+		with self._lock:
+			self.halted = False
 
 	def cleanup(self):
-		for pwm in self.pwms.values():
-			pwm.stop()
-		GPIO.cleanup()
+		self.backend.close()
+
 
+def setup_motor(pwm_freq=1000, defaults=None, backend=None):
+	"""Return a pre-configured MotorController instance.
 
-def setup_motor(pwm_freq=1000, defaults=None):
-	"""Return a pre-configured MotorController instance."""
-	return MotorController(pwm_freq, defaults)
+	backend: 'rpi' (default, software PWM), 'pigpio' (hardware-timed),
+	'memory' (recording, for tests) or a backend instance. If None, the
+	MOTOR_BACKEND environment variable is used.
+	"""
+	if backend is None:
+		backend = os.environ.get('MOTOR_BACKEND', 'rpi')
+	return MotorController(pwm_freq, defaults, backend)
 
 
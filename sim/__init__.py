@@ -0,0 +1,14 @@
+"""Headless-Simulation des Linienverfolgers.
+
+Bausteine:
+    clock.VirtualClock  virtuelle Zeit statt time.*
+    track.Track         2D-Strecke (Linie, Grün, Hindernisse, Wände)
+    robot.DiffDrive     Kinematik aus den MotorController-Duty-Cycles
+    world.Simulator     verbindet alles mit fakegpio und main.line_follow
+
+Schnellstart: `python -m sim --laps 2`
+"""
+from .clock import VirtualClock
+from .robot import DiffDrive
+from .track import Track, oval
+from .world import Simulator
@@ -0,0 +1,53 @@
+"""`python -m sim`: line_follow auf einer Ovalstrecke simulieren."""
+import argparse
+import json
+
+from .track import oval
+from .world import Simulator
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Linienverfolger-Simulation")
+    ap.add_argument("--laps", type=int, default=1)
+    ap.add_argument("--timeout", type=float, default=120.0, help="virtuelle Sekunden")
+    ap.add_argument("--cpu-scale", type=float, default=0.0,
+                    help="echte Rechenzeit × Faktor auf die virtuelle Zeit aufschlagen")
+    ap.add_argument("--obstacle", action="store_true", help="Hindernis auf die Gerade setzen")
+    ap.add_argument("--pid", action="store_true", help="PID-Linienregelung statt bang-bang")
+    ap.add_argument("--record", nargs="?", const="runs", metavar="DIR",
+                    help="Telemetrie und Eingangs-Log schreiben (Standard: runs)")
+    ap.add_argument("--speed", type=int, help="Grundgeschwindigkeit (PID_SPEED bzw. BASE_SPEED)")
+    ap.add_argument("--verbose", action="store_true", help="Ausgaben von main anzeigen")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    track = oval()
+    if args.obstacle:
+        x, y, _ = track.start
+        track.add_obstacle(x + 70.0, y, 5.0)
+    sim = Simulator(track, cpu_scale=args.cpu_scale).install()
+    m = sim.attach()
+    if args.record:
+        m.TELEMETRY_DIR = args.record
+    if args.pid:
+        m.LINE_MODE = "pid"
+        if args.speed is not None:
+            m.line_pid.set_speed(args.speed)
+    elif args.speed is not None:
+        m.BASE_SPEED = args.speed
+    result = sim.run(laps=args.laps, timeout=args.timeout, quiet=not args.verbose)
+    result.pop("log")
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"Ende: {result['finished']} | Runden: {result['laps']} | "
+          f"Rundenzeiten: {', '.join(f'{t:.2f} s' for t in result['lap_times'])}")
+    print(f"virtuell {result['virtual_s']:.2f} s in {result['real_s']:.2f} s "
+          f"-> {result['speedup']:.0f}x Echtzeit | neben der Linie: {result['off_line'] * 100:.1f} %")
+    c = result["control"]
+    print(f"Regelung: {c['ticks']} Ticks @ {c['hz']} Hz | Overruns: {c['overruns']} | "
+          f"Jitter max: {c['jitter_max_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Virtuelle Uhr für die Simulation.
+
+Ersetzt time.time/monotonic/perf_counter/sleep (und die *_ns-Varianten)
+durch eine Uhr, die nur vorläuft, wenn jemand schläft. Beim Schlafen wird
+die Welt (`on_advance`) in kleinen Schritten mitgerechnet, so läuft z.B.
+`main.line_follow` deutlich schneller als Echtzeit und trotzdem
+deterministisch.
+
+Mit `cpu_scale > 0` wird zusätzlich die echte Rechenzeit zwischen zwei
+Uhrabfragen (× cpu_scale) auf die virtuelle Zeit aufgeschlagen, damit
+Regel-Latenzen realistisch bleiben (z.B. cpu_scale=10 für einen Pi Zero
+gegenüber einem Laptop). Mit cpu_scale=0 ist die Simulation vollständig
+reproduzierbar.
+"""
+import time
+
+import fakegpio
+
+_REAL = {
+    "time": time.time,
+    "monotonic": time.monotonic,
+    "perf_counter": time.perf_counter,
+    "sleep": time.sleep,
+    "monotonic_ns": time.monotonic_ns,
+    "perf_counter_ns": time.perf_counter_ns,
+    "time_ns": time.time_ns,
+}
+
+real_perf_counter = _REAL["perf_counter"]
+real_perf_counter_ns = _REAL["perf_counter_ns"]
+
+
+class VirtualClock:
+    """Virtuelle Zeit in ns (geteilt mit fakegpio.clock_ns)."""
+
+    def __init__(self, cpu_scale=0.0, start_ns=1_000_000_000):
+        self.cpu_scale = cpu_scale
+        self.on_advance = None      # callback(t_ns_ziel)
+        self._busy = False
+        self._real_mark = real_perf_counter_ns()
+        self.slept_ns = 0
+        self.charged_ns = 0
+        fakegpio.advance_ns(start_ns - fakegpio.clock_ns())
+
+    def _advance_to(self, target_ns):
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            if self.on_advance is not None:
+                self.on_advance(target_ns)
+            if fakegpio.clock_ns() < target_ns:
+                fakegpio.advance_ns(target_ns - fakegpio.clock_ns())
+        finally:
+            self._busy = False
+
+    def _charge(self):
+        if not self.cpu_scale or self._busy:
+            return
+        real = real_perf_counter_ns()
+        delta = int((real - self._real_mark) * self.cpu_scale)
+        self._real_mark = real
+        if delta > 0:
+            self.charged_ns += delta
+            self._advance_to(fakegpio.clock_ns() + delta)
+            # Rechenzeit der Physik selbst nicht mitzählen
+            self._real_mark = real_perf_counter_ns()
+
+    def ns(self):
+        self._charge()
+        return fakegpio.clock_ns()
+
+    def seconds(self):
+        return self.ns() * 1e-9
+
+    def sleep(self, seconds):
+        self._charge()
+        if seconds <= 0:
+            return
+        delta = int(seconds * 1e9)
+        self.slept_ns += delta
+        self._advance_to(fakegpio.clock_ns() + delta)
+        self._real_mark = real_perf_counter_ns()
+
+    def install(self):
+        """Ersetzt die Funktionen im `time`-Modul (vor dem Import von main!)."""
+        time.time = self.seconds
+        time.monotonic = self.seconds
+        time.perf_counter = self.seconds
+        time.sleep = self.sleep
+        time.monotonic_ns = self.ns
+        time.perf_counter_ns = self.ns
+        time.time_ns = self.ns
+        return self
+
+    @staticmethod
+    def uninstall():
+        for name, fn in _REAL.items():
+            setattr(time, name, fn)
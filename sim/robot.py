@@ -0,0 +1,50 @@
+"""Differentialantrieb-Kinematik für die Simulation (cm, s, rad)."""
+import math
+
+
+class DiffDrive:
+    """Vierrad-Roboter als Differentialantrieb.
+
+    Die Radgeschwindigkeit folgt dem PWM-Duty (−100..100) mit einer
+    Totzone (`deadband`, darunter steht der Motor) und einer Zeitkonstante
+    `tau` (Trägheit). Links = Mittel aus VL/HL, rechts = Mittel aus VR/HR.
+    """
+
+    def __init__(self, x=0.0, y=0.0, theta=0.0, max_speed=40.0, track_width=14.0,
+                 tau=0.05, deadband=8.0):
+        self.x = x
+        self.y = y
+        self.theta = theta
+        self.max_speed = max_speed
+        self.track_width = track_width
+        self.tau = tau
+        self.deadband = deadband
+        self.v_left = 0.0
+        self.v_right = 0.0
+        self.distance = 0.0
+        # Sensorpositionen relativ zur Robotermitte (vorne, links)
+        self.line_sensors = ((8.0, 0.7), (8.0, -0.7))
+        self.sonar_front = (6.0, 0.0, 0.0)
+        self.sonar_right = (0.0, -6.0, -math.pi / 2)
+
+    def _target(self, duty):
+        if abs(duty) < self.deadband:
+            return 0.0
+        return duty / 100.0 * self.max_speed
+
+    def step(self, dt, duty_left, duty_right):
+        a = 1.0 - math.exp(-dt / self.tau) if self.tau > 0 else 1.0
+        self.v_left += (self._target(duty_left) - self.v_left) * a
+        self.v_right += (self._target(duty_right) - self.v_right) * a
+        v = (self.v_left + self.v_right) / 2.0
+        w = (self.v_right - self.v_left) / self.track_width
+        mid = self.theta + w * dt / 2.0
+        self.x += v * math.cos(mid) * dt
+        self.y += v * math.sin(mid) * dt
+        self.theta = (self.theta + w * dt + math.pi) % (2 * math.pi) - math.pi
+        self.distance += abs(v) * dt
+
+    def to_world(self, forward, left):
+        c = math.cos(self.theta)
+        s = math.sin(self.theta)
+        return self.x + forward * c - left * s, self.y + forward * s + left * c
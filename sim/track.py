@@ -0,0 +1,140 @@
+"""2D-Streckenmodell für die Simulation (Einheiten: cm, Radiant).
+
+Die Bodenfarbe (weiß/schwarz/grün) wird einmalig in ein Raster
+(`RESOLUTION` cm pro Zelle) gestempelt, damit die Sensorabfrage im
+Physik-Schritt O(1) ist. Hindernisse (Kreise) und Wände (Strecken) werden
+analytisch für die Ultraschall-Strahlen geschnitten.
+"""
+import math
+
+WHITE = 0
+BLACK = 1
+GREEN = 2
+
+RESOLUTION = 0.25    # cm pro Rasterzelle
+LINE_WIDTH = 1.9     # Linienbreite laut Regelwerk
+
+
+class Track:
+    def __init__(self, width, height, resolution=RESOLUTION):
+        self.width = width
+        self.height = height
+        self.res = resolution
+        self.cols = int(math.ceil(width / resolution))
+        self.rows = int(math.ceil(height / resolution))
+        self._grid = bytearray(self.cols * self.rows)
+        self.lines = []        # Liste von Polylinien [(x, y), ...]
+        self.obstacles = []    # (x, y, radius)
+        self.walls = []        # ((x1, y1), (x2, y2))
+        self.start = (0.0, 0.0, 0.0)
+        self.checkpoints = []  # (x, y, radius) in Fahrreihenfolge
+
+    # --- Aufbau ---
+
+    def _stamp_disc(self, x, y, r, value):
+        res = self.res
+        c0 = max(0, int((x - r) / res))
+        c1 = min(self.cols - 1, int((x + r) / res))
+        r0 = max(0, int((y - r) / res))
+        r1 = min(self.rows - 1, int((y + r) / res))
+        rr = r * r
+        grid = self._grid
+        for row in range(r0, r1 + 1):
+            cy = (row + 0.5) * res - y
+            base = row * self.cols
+            for col in range(c0, c1 + 1):
+                cx = (col + 0.5) * res - x
+                if cx * cx + cy * cy <= rr:
+                    grid[base + col] = value
+
+    def add_line(self, points, width=LINE_WIDTH, closed=False):
+        pts = list(points)
+        if closed:
+            pts.append(pts[0])
+        self.lines.append(pts)
+        step = self.res / 2
+        for (x1, y1), (x2, y2) in zip(pts, pts[1:]):
+            length = math.hypot(x2 - x1, y2 - y1)
+            n = max(1, int(length / step))
+            for i in range(n + 1):
+                t = i / n
+                self._stamp_disc(x1 + (x2 - x1) * t, y1 + (y2 - y1) * t, width / 2, BLACK)
+        return self
+
+    def add_green(self, x, y, size=2.5):
+        """Grüne Markierung (Quadrat mit Kantenlänge `size`) um (x, y)."""
+        res = self.res
+        for row in range(max(0, int((y - size / 2) / res)), min(self.rows, int((y + size / 2) / res) + 1)):
+            for col in range(max(0, int((x - size / 2) / res)), min(self.cols, int((x + size / 2) / res) + 1)):
+                self._grid[row * self.cols + col] = GREEN
+        return self
+
+    def add_obstacle(self, x, y, radius):
+        self.obstacles.append((x, y, radius))
+        return self
+
+    def add_wall(self, p1, p2):
+        self.walls.append((p1, p2))
+        return self
+
+    # --- Abfragen ---
+
+    def surface(self, x, y):
+        col = int(x / self.res)
+        row = int(y / self.res)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self._grid[row * self.cols + col]
+        return WHITE
+
+    def ray(self, x, y, heading, max_range=400.0):
+        """Abstand vom Punkt in Blickrichtung bis zum nächsten Hindernis/Wand."""
+        dx = math.cos(heading)
+        dy = math.sin(heading)
+        best = max_range
+        for ox, oy, r in self.obstacles:
+            fx, fy = x - ox, y - oy
+            b = fx * dx + fy * dy
+            c = fx * fx + fy * fy - r * r
+            disc = b * b - c
+            if disc >= 0:
+                t = -b - math.sqrt(disc)
+                if 0 <= t < best:
+                    best = t
+        for (x1, y1), (x2, y2) in self.walls:
+            ex, ey = x2 - x1, y2 - y1
+            den = dx * ey - dy * ex
+            if abs(den) < 1e-12:
+                continue
+            t = ((x1 - x) * ey - (y1 - y) * ex) / den
+            u = ((x1 - x) * dy - (y1 - y) * dx) / den
+            if 0 <= t < best and 0 <= u <= 1:
+                best = t
+        return best
+
+
+def oval(straight=120.0, radius=40.0, margin=30.0, segments=24):
+    """Geschlossene Ovalstrecke; Start unten links in Fahrtrichtung +x."""
+    w = straight + 2 * radius + 2 * margin
+    h = 2 * radius + 2 * margin
+    track = Track(w, h)
+    x0 = margin + radius
+    x1 = x0 + straight
+    yc = margin + radius
+    pts = [(x0, yc - radius), (x1, yc - radius)]
+    for i in range(1, segments):
+        a = -math.pi / 2 + math.pi * i / segments
+        pts.append((x1 + radius * math.cos(a), yc + radius * math.sin(a)))
+    pts += [(x1, yc + radius), (x0, yc + radius)]
+    for i in range(1, segments):
+        a = math.pi / 2 + math.pi * i / segments
+        pts.append((x0 + radius * math.cos(a), yc + radius * math.sin(a)))
+    track.add_line(pts, closed=True)
+    track.start = (x0 + 10.0, yc - radius, 0.0)
+    track.checkpoints = [
+        (x1 + radius, yc, 15.0),
+        (x0 - radius, yc, 15.0),
+        (x0 + 10.0, yc - radius, 10.0),
+    ]
+    for p1, p2 in (((0, 0), (w, 0)), ((w, 0), (w, h)), ((w, h), (0, h)), ((0, h), (0, 0))):
+        track.add_wall(p1, p2)
+    return track
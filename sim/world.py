@@ -0,0 +1,190 @@
+"""Simulator: verbindet virtuelle Uhr, fakegpio, Strecke und Kinematik.
+
+    sim = Simulator(track.oval())
+    sim.install()            # vor dem ersten Import von main!
+    result = sim.run(laps=1)
+
+`install()` registriert fakegpio als RPi.GPIO, wählt das Recording-
+Motor-Backend und ersetzt die Zeitfunktionen. Danach kann `main` ohne Pi
+importiert werden; `run()` hält den Schalter gedrückt, ruft
+`main.line_follow()` auf und lässt ihn nach der gewünschten Rundenzahl
+(oder dem Timeout) wieder los. Telemetrie und Eingangs-Log bleiben im
+Ringpuffer (main.TELEMETRY_DIR = None); `python -m sim --record` schreibt
+sie nach runs/.
+"""
+import contextlib
+import io
+import math
+import os
+import random
+
+import fakegpio
+
+from .clock import VirtualClock, real_perf_counter
+from .robot import DiffDrive
+from . import track as tracks
+
+
+class Simulator:
+    def __init__(self, track=None, dt=0.002, cpu_scale=0.0, sonar_period=0.03, seed=0):
+        self.track = track if track is not None else tracks.oval()
+        self.dt_ns = int(dt * 1e9)
+        self.clock = VirtualClock(cpu_scale)
+        self.sonar_period_ns = int(sonar_period * 1e9)
+        self.seed = seed
+        x, y, theta = self.track.start
+        self.robot = DiffDrive(x, y, theta)
+        self.main = None
+        self._duty = None
+        self._wheels = None
+        self._t_ns = 0
+        self._next_sonar = 0
+        self._us = (None, None, 0)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.steps = 0
+        self.off_line_steps = 0
+        self.laps = 0
+        self.lap_times = []
+        self._checkpoint = 0
+        self._lap_start = None
+        self._target_laps = None
+        self._deadline_ns = None
+        self.finished = None
+
+    # --- Einrichtung ---
+
+    def install(self):
+        fakegpio.reset()
+        fakegpio.install()
+        os.environ["MOTOR_BACKEND"] = "memory"
+        self.clock.install()
+        self.clock.on_advance = self._advance
+        self._t_ns = fakegpio.clock_ns()
+        random.seed(self.seed)
+        return self
+
+    def attach(self):
+        """Importiert main (falls nötig) und hängt die Simulation ein."""
+        if self.main is None:
+            import main
+            import motor
+            import sensor
+            main.init()
+            main.TELEMETRY_DIR = None   # keine Dateien im Arbeitsverzeichnis
+            sensor.latest_ultrasonics = self.latest_ultrasonics
+            main.sensors.latest_ultrasonics = self.latest_ultrasonics
+            controller = motor.controller
+            self._duty = controller.backend.duty
+            self._wheels = controller.WHEELS
+            # erst jetzt rechnet _advance die Physik (init() kann mit
+            # cpu_scale > 0 schon Zeit verbrauchen)
+            self.main = main
+        return self.main
+
+    # --- Physik ---
+
+    def _wheel_duty(self, wheel):
+        p1, p2 = self._wheels[wheel]
+        return self._duty[p1] - self._duty[p2]
+
+    def _advance(self, target_ns):
+        if self.main is None:
+            # main wird gerade importiert/initialisiert: nur die Zeit läuft
+            self._t_ns = target_ns
+            return
+        while self._t_ns + self.dt_ns <= target_ns:
+            self._step(self.dt_ns)
+        rest = target_ns - self._t_ns
+        if rest > 0:
+            self._step(rest)
+
+    def _step(self, dt_ns):
+        self._t_ns += dt_ns
+        fakegpio.advance_ns(self._t_ns - fakegpio.clock_ns())
+        r = self.robot
+        left = (self._wheel_duty("VL") + self._wheel_duty("HL")) / 2.0
+        right = (self._wheel_duty("VR") + self._wheel_duty("HR")) / 2.0
+        r.step(dt_ns * 1e-9, left, right)
+        self.steps += 1
+
+        m = self.main
+        (fl, sl), (fr, sr) = r.line_sensors
+        s_left = self.track.surface(*r.to_world(fl, sl))
+        s_right = self.track.surface(*r.to_world(fr, sr))
+        fakegpio.set_input(m.SENSOR_LEFT_PIN, s_left == tracks.BLACK)
+        fakegpio.set_input(m.SENSOR_RIGHT_PIN, s_right == tracks.BLACK)
+        fakegpio.set_input(m.GRUEN_PIN, s_left == tracks.GREEN or s_right == tracks.GREEN)
+        if s_left == tracks.WHITE and s_right == tracks.WHITE:
+            self.off_line_steps += 1
+
+        if self._t_ns >= self._next_sonar:
+            self._next_sonar = self._t_ns + self.sonar_period_ns
+            self._us = (self._sonar(r.sonar_front), self._sonar(r.sonar_right), self._t_ns)
+
+        self._progress()
+
+    def _sonar(self, mount):
+        fwd, left, heading = mount
+        x, y = self.robot.to_world(fwd, left)
+        d = self.track.ray(x, y, self.robot.theta + heading)
+        return None if d >= 343.0 else d
+
+    def latest_ultrasonics(self):
+        d1, d2, t_ns = self._us
+        return d1, d2, (self._t_ns - t_ns) * 1e-9
+
+    def _progress(self):
+        if self._lap_start is None or self.finished:
+            return
+        cps = self.track.checkpoints
+        if cps:
+            cx, cy, radius = cps[self._checkpoint]
+            if math.hypot(self.robot.x - cx, self.robot.y - cy) <= radius:
+                self._checkpoint += 1
+                if self._checkpoint == len(cps):
+                    self._checkpoint = 0
+                    self.laps += 1
+                    self.lap_times.append((self._t_ns - self._lap_start) * 1e-9)
+                    self._lap_start = self._t_ns
+                    if self._target_laps is not None and self.laps >= self._target_laps:
+                        self._finish("laps")
+        if self._deadline_ns is not None and self._t_ns >= self._deadline_ns:
+            self._finish("timeout")
+
+    def _finish(self, reason):
+        self.finished = reason
+        fakegpio.set_input(self.main.SWITCH_PIN, fakegpio.HIGH)
+
+    # --- Lauf ---
+
+    def run(self, laps=1, timeout=120.0, quiet=True):
+        """Fährt `laps` Runden mit main.line_follow (virtuelle Zeit)."""
+        m = self.attach()
+        self.reset_stats()
+        self._target_laps = laps
+        self._lap_start = self._t_ns
+        self._deadline_ns = self._t_ns + int(timeout * 1e9)
+        t_virtual = self._t_ns
+        fakegpio.set_input(m.SWITCH_PIN, fakegpio.LOW)
+        self.clock.sleep(0.05)   # Entprellzeit
+        real0 = real_perf_counter()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+            m.line_follow()
+        real = real_perf_counter() - real0
+        virtual = (self._t_ns - t_virtual) * 1e-9
+        return {
+            "finished": self.finished,
+            "laps": self.laps,
+            "lap_times": self.lap_times,
+            "virtual_s": virtual,
+            "real_s": real,
+            "speedup": virtual / real if real > 0 else float("inf"),
+            "off_line": self.off_line_steps / self.steps if self.steps else 0.0,
+            "distance_cm": self.robot.distance,
+            "control": m.scheduler.report(),
+            "maneuvers": m.maneuvers.completed,
+            "log": out.getvalue() if quiet else "",
+        }
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Start-Schalter mit Flanken-Callback und zeitbasierter Entprellung.
+
+Statt bei jeder Abfrage `DEBOUNCE` zu schlafen, verfolgt ein Callback den
+Schalterzustand. `pressed()` liest nur den zwischengespeicherten Zustand
+und blockiert nie.
+
+Entprellung: Die erste Flanke nach einer Ruhezeit von `debounce` Sekunden
+wird sofort übernommen (kein Warten), weiteres Prellen innerhalb von
+`debounce` wird ignoriert. Endet das Prellen auf dem anderen Pegel, wird
+dieser beim nächsten `pressed()` übernommen, sobald er `debounce` lang
+stabil war.
+"""
+import time
+
+import RPi.GPIO as GPIO
+
+
+class Switch:
+    def __init__(self, pin, debounce=0.02, active=GPIO.LOW, pull=GPIO.PUD_UP,
+                 clock=time.monotonic_ns):
+        self.pin = pin
+        self.active = active
+        self.debounce_ns = int(debounce * 1e9)
+        self._clock = clock
+        self._release_hooks = []
+        self._press_hooks = []
+        GPIO.setup(pin, GPIO.IN, pull_up_down=pull)
+        now = clock()
+        self._pressed = GPIO.input(pin) == active
+        self._raw = self._pressed
+        self._t_raw = now
+        self._t_change = now - self.debounce_ns
+        self.changes = 0
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._on_edge)
+
+    def on_release(self, hook):
+        """`hook()` wird sofort (im GPIO-Thread) beim Loslassen aufgerufen."""
+        self._release_hooks.append(hook)
+
+    def on_press(self, hook):
+        self._press_hooks.append(hook)
+
+    def _set(self, pressed, t_ns):
+        self._pressed = pressed
+        self._t_change = t_ns
+        self.changes += 1
+        for hook in (self._press_hooks if pressed else self._release_hooks):
+            hook()
+
+    def _on_edge(self, channel):
+        t = self._clock()
+        raw = GPIO.input(channel) == self.active
+        self._raw = raw
+        self._t_raw = t
+        if raw != self._pressed and t - self._t_change >= self.debounce_ns:
+            self._set(raw, t)
+
+    def pressed(self):
+        """Aktueller, entprellter Zustand (True = gedrückt)."""
+        if self._raw != self._pressed:
+            t = self._clock()
+            if t - self._t_raw >= self.debounce_ns:
+                self._set(self._raw, t)
+        return self._pressed
+
+    def close(self):
+        GPIO.remove_event_detect(self.pin)
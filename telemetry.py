@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Telemetrie-Ringpuffer für die Regelschleife (ersetzt print()).
+
+Die Schleife schreibt pro Tick einen Datensatz in vorab angelegte Arrays
+(struct-of-arrays, `array`-Modul); `record()` alloziert nichts. Ein
+Hintergrund-Thread schreibt neue Datensätze blockweise binär auf die
+Karte. Überholt der Schreiber den Flusher (Puffer voll), werden die
+ältesten Datensätze verworfen und in `dropped` gezählt.
+
+Dateiformat:
+    b"RCTL" | uint16 Version | uint32 Länge | JSON [[name, typecode], ...]
+    danach Blöcke: uint32 n | je Feld n Werte (native Bytefolge)
+
+Lesen: `load(path)` -> dict mit NumPy-Arrays; `python telemetry.py run.bin`
+zeigt eine Zusammenfassung.
+"""
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+
+MAGIC = b"RCTL"
+VERSION = 1
+
+# (Name, Typecode)
+FIELDS = (
+    ("t", "d"),          # Zeit in s (time.monotonic)
+    ("bits", "B"),       # bit0 links, bit1 rechts, bit2 grün, bit3 Schalter
+    ("us_front", "f"),   # cm, NaN = kein Wert
+    ("us_right", "f"),
+    ("motor_l", "b"),    # Sollwert links -100..100
+    ("motor_r", "b"),
+    ("state", "B"),      # Index in STATES
+)
+
+STATES = ("Weiss", "Geradeaus", "Rechts", "Links", "Manoever", "Endzone")
+STATE_CODES = {name: i for i, name in enumerate(STATES)}
+
+NAN = float("nan")
+
+# Typecode (native Bytefolge) -> NumPy-dtype
+_NUMPY_TYPES = {"d": "f8", "f": "f4", "B": "u1", "b": "i1", "H": "u2", "h": "i2", "I": "u4", "i": "i4"}
+
+
+class Recorder:
+    def __init__(self, capacity=1 << 16, flush_interval=0.5):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.columns = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in FIELDS}
+        # direkte Referenzen für record()
+        self._t = self.columns["t"]
+        self._bits = self.columns["bits"]
+        self._usf = self.columns["us_front"]
+        self._usr = self.columns["us_right"]
+        self._ml = self.columns["motor_l"]
+        self._mr = self.columns["motor_r"]
+        self._state = self.columns["state"]
+        self.count = 0        # insgesamt geschriebene Datensätze
+        self.flushed = 0      # davon auf Datei geschrieben (oder verworfen)
+        self.dropped = 0
+        self.path = None
+        self._file = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, t, left, right, gruen, pressed, us_front, us_right, motor_l, motor_r, state):
+        i = self.count % self.capacity
+        self._t[i] = t
+        self._bits[i] = (1 if left else 0) | (2 if right else 0) | (4 if gruen else 0) | (8 if pressed else 0)
+        self._usf[i] = NAN if us_front is None else us_front
+        self._usr[i] = NAN if us_right is None else us_right
+        self._ml[i] = motor_l
+        self._mr[i] = motor_r
+        self._state[i] = state
+        self.count += 1
+
+    # --- Datei ---
+
+    def start(self, path):
+        """Öffnet `path` und startet den Flush-Thread (path=None: nur Ringpuffer)."""
+        self.stop()
+        self.count = self.flushed = self.dropped = 0
+        self.path = path
+        if path is None:
+            return self
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "xb")   # nie eine frühere Fahrt überschreiben
+        spec = json.dumps([list(f) for f in FIELDS]).encode()
+        self._file.write(MAGIC + struct.pack("<HI", VERSION, len(spec)) + spec)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        if self._file is None:
+            return
+        end = self.count
+        start = self.flushed
+        if end - start > self.capacity:
+            self.dropped += end - start - self.capacity
+            start = end - self.capacity
+        if end <= start:
+            return
+        # höchstens zwei zusammenhängende Stücke im Ring
+        a = start % self.capacity
+        parts = []
+        n = end - start
+        if a + n <= self.capacity:
+            parts.append((a, a + n))
+        else:
+            parts.append((a, self.capacity))
+            parts.append((0, a + n - self.capacity))
+        f = self._file
+        f.write(struct.pack("<I", n))
+        for name, _ in FIELDS:
+            col = self.columns[name]
+            for lo, hi in parts:
+                f.write(col[lo:hi].tobytes())
+        f.flush()
+        self.flushed = end
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(2.0)
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def load(path):
+    """Liest eine Telemetrie-Datei als dict {feld: np.ndarray}."""
+    import numpy as np
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path}: keine Telemetrie-Datei")
+    version, spec_len = struct.unpack_from("<HI", data, 4)
+    if version != VERSION:
+        raise ValueError(f"{path}: Version {version} nicht unterstützt")
+    pos = 10
+    fields = json.loads(data[pos:pos + spec_len])
+    pos += spec_len
+    chunks = {name: [] for name, _ in fields}
+    while pos + 4 <= len(data):
+        (n,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        for name, code in fields:
+            dtype = np.dtype(_NUMPY_TYPES[code])
+            size = n * dtype.itemsize
+            if pos + size > len(data):
+                raise ValueError(f"{path}: abgeschnittener Block")
+            chunks[name].append(np.frombuffer(data, dtype=dtype, count=n, offset=pos))
+            pos += size
+    return {name: np.concatenate(c) if c else np.array([]) for name, c in chunks.items()}
+
+
+def _summary(path):
+    run = load(path)
+    t = run["t"]
+    if not len(t):
+        print("leer")
+        return
+    dt = t[1:] - t[:-1]
+    print(f"{path}: {len(t)} Ticks über {t[-1] - t[0]:.2f} s")
+    if len(dt):
+        print(f"  Tick-Abstand mean {dt.mean() * 1e3:.2f} ms | max {dt.max() * 1e3:.2f} ms")
+    for i, name in enumerate(STATES):
+        share = (run["state"] == i).mean() * 100
+        if share:
+            print(f"  {name:10s} {share:5.1f} %")
+    front = run["us_front"]
+    valid = front[front == front]   # ohne NaN
+    if len(valid):
+        print(f"  USv min {valid.min():.1f} cm | gültig {len(valid) / len(front) * 100:.0f} %")
+
+
+if __name__ == "__main__":
+    for p in sys.argv[1:]:
+        _summary(p)